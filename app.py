@@ -8,6 +8,8 @@ import base64
 import time
 from plotly.subplots import make_subplots
 
+from src.extractor.equipment_store import EquipmentStore
+
 # 페이지 설정
 st.set_page_config(
     page_title=("Cyclone Engineering Review System"),
@@ -38,10 +40,24 @@ if 'pdf_uploaded' not in st.session_state:
 
 # 파일 경로
 json_file = Path("src/extractor/data/extracted/MF PE Cyclone_20250609_extracted.json")
+equipment_db = Path("data/equipment.db")
+
+# 장비 DB 태그 목록
+@st.cache_data
+def load_equipment_tags():
+    if not equipment_db.exists():
+        return []
+    with EquipmentStore(str(equipment_db)) as store:
+        return store.tags()
 
-# JSON 데이터 로드
+# 장비 데이터 로드 (장비 DB 우선, 없으면 JSON)
 @st.cache_data
-def load_json_data():
+def load_json_data(tag_number=None):
+    if tag_number and equipment_db.exists():
+        with EquipmentStore(str(equipment_db)) as store:
+            record = store.get(tag_number)
+        if record:
+            return record
     try:
         with open(json_file, 'r', encoding='utf-8') as f:
             return json.load(f)
@@ -59,6 +75,29 @@ def calculate_efficiency(particle_size, d50):
     n = 2.5  # slope parameter
     return 100 / (1 + (d50/particle_size)**n)
 
+# 운전 케이스 행렬
+def load_operating_cases(data):
+    """운전 케이스 (케이스 이름, 변수 이름, 케이스 x 변수 배열), 없으면 None"""
+    cases = data.get('operating_cases')
+    if not cases or not cases.get('values'):
+        return None
+    return cases['cases'], cases['variables'], np.asarray(cases['values'], dtype=float)
+
+def case_column(cases, variable, default):
+    """케이스 행렬에서 변수 열 추출 (없으면 기본값 1개)"""
+    if cases and variable in cases[1]:
+        return cases[2][:, cases[1].index(variable)]
+    return np.array([default], dtype=float)
+
+# 성능 계산 (유량 배열 일괄 계산)
+def evaluate_performance(flows, base_flow, base_velocity, base_dp, base_eff):
+    """유량 변화에 따른 입구속도, 압력손실, 예상 효율"""
+    flow_ratio = np.asarray(flows, dtype=float) / base_flow
+    velocity = base_velocity * flow_ratio
+    dp = base_dp * flow_ratio ** 2
+    eff = np.maximum(85, base_eff - 2 * np.abs(flow_ratio - 1))
+    return velocity, dp, eff
+
 # 사이드바
 with st.sidebar:
     st.markdown("### 📄 PDF Upload")
@@ -72,11 +111,17 @@ with st.sidebar:
         
         # PDF 미리보기
         st.info("PDF 파일이 업로드되었습니다.")
+    
+    # 장비 선택 (장비 DB가 있을 때)
+    equipment_tags = load_equipment_tags()
+    selected_tag = st.selectbox("Equipment", equipment_tags) if equipment_tags else None
 
 # 메인 화면
-data = load_json_data()
+data = load_json_data(selected_tag)
 
 if st.session_state.pdf_uploaded and data:
+    cases = load_operating_cases(data)
+    
     # 상단 정보
     col1, col2, col3, col4, col5, col6 = st.columns(6)
     with col1:
@@ -134,9 +179,9 @@ if st.session_state.pdf_uploaded and data:
         col1, col2, col3 = st.columns(3)
         
         with col1:
-            # 압력 마진
+            # 압력 마진 (운전 케이스 중 최대값 기준)
             design_p = data.get('design_pressure', 24.6)
-            oper_p = data.get('pressure', 10.2)
+            oper_p = case_column(cases, 'pressure', data.get('pressure', 10.2)).max()
             margin_p = ((design_p - oper_p) / oper_p) * 100
             
             st.metric("압력 마진", f"{margin_p:.0f}%")
@@ -148,9 +193,9 @@ if st.session_state.pdf_uploaded and data:
                 st.warning("부족")
         
         with col2:
-            # 온도 마진
+            # 온도 마진 (운전 케이스 중 최대값 기준)
             design_t = data.get('design_temperature', 140)
-            oper_t = data.get('temperature', 82.2)
+            oper_t = case_column(cases, 'temperature', data.get('temperature', 82.2)).max()
             margin_t = ((design_t - oper_t) / oper_t) * 100
             
             st.metric("온도 마진", f"{margin_t:.0f}%")
@@ -172,26 +217,32 @@ if st.session_state.pdf_uploaded and data:
     
     # Tab 3: 성능 검토
     with tab3:
+        # 계산 기준
+        base_flow = data.get('flow_rate', 671)
+        base_dp = data.get('pressure_drop', 0.357)
+        base_velocity = data.get('inlet_velocity', 20)
+        base_eff = data.get('efficiency', 99.2)
+        
+        # 유량 범위: 운전 케이스 Min/Max (없으면 기준값의 50~150%)
+        case_flows = case_column(cases, 'solids_flow', base_flow)
+        if len(case_flows) > 1:
+            flow_min, flow_max = int(case_flows.min()), int(np.ceil(case_flows.max()))
+        else:
+            flow_min, flow_max = int(base_flow * 0.5), int(base_flow * 1.5)
+        
         # 조건 변경
         col1, col2, col3 = st.columns(3)
         with col1:
-            new_flow = st.slider("유량 (kg/hr)", 
-                               int(data.get('flow_rate', 671) * 0.5), 
-                               int(data.get('flow_rate', 671) * 1.5), 
-                               int(data.get('flow_rate', 671)))
+            new_flow = st.slider("유량 (kg/hr)", flow_min, flow_max,
+                               min(max(int(base_flow), flow_min), flow_max))
         with col2:
             new_temp = st.slider("온도 (°C)", 50, 150, int(data.get('temperature', 82)))
         with col3:
             new_pressure = st.slider("압력 (kg/cm²)", 5, 15, int(data.get('pressure', 10)))
         
-        # 계산
-        base_flow = data.get('flow_rate', 671)
-        base_dp = data.get('pressure_drop', 0.357)
-        base_velocity = data.get('inlet_velocity', 20)
-        
-        flow_ratio = new_flow / base_flow
-        new_velocity = base_velocity * flow_ratio
-        new_dp = base_dp * flow_ratio ** 2
+        new_velocity, new_dp, new_eff = (
+            float(v) for v in evaluate_performance(new_flow, base_flow, base_velocity, base_dp, base_eff)
+        )
         
         # 결과
         col1, col2, col3 = st.columns(3)
@@ -208,20 +259,34 @@ if st.session_state.pdf_uploaded and data:
                 st.warning("과도함")
         
         with col3:
-            eff_change = -2 * abs(flow_ratio - 1)
-            new_eff = max(85, data.get('efficiency', 99.2) + eff_change)
             st.metric("예상 효율", f"{new_eff:.1f}%", 
-                     f"{new_eff - data.get('efficiency', 99.2):+.1f}")
+                     f"{new_eff - base_eff:+.1f}")
+        
+        # 운전 케이스별 성능 (전체 케이스 일괄 계산)
+        if cases and len(case_flows) > 1:
+            case_velocity, case_dp, case_eff = evaluate_performance(
+                case_flows, base_flow, base_velocity, base_dp, base_eff)
+            st.dataframe(pd.DataFrame({
+                "케이스": cases[0],
+                "유량 (kg/hr)": case_flows,
+                "입구속도 (m/s)": case_velocity.round(1),
+                "압력손실 (kg/cm²)": case_dp.round(3),
+                "예상 효율 (%)": case_eff.round(1),
+            }), hide_index=True, use_container_width=True)
         
         # 그래프
         st.markdown("---")
         
         # 압력손실 곡선
         flow_range = np.linspace(base_flow * 0.3, base_flow * 1.7, 50)
-        dp_curve = base_dp * (flow_range / base_flow) ** 2
+        _, dp_curve, _ = evaluate_performance(flow_range, base_flow, base_velocity, base_dp, base_eff)
         
         fig = go.Figure()
         fig.add_trace(go.Scatter(x=flow_range, y=dp_curve, mode='lines', name='압력손실'))
+        if cases and len(case_flows) > 1:
+            fig.add_trace(go.Scatter(x=case_flows, y=case_dp, mode='markers+text', text=cases[0],
+                                    textposition='top center', marker=dict(size=8, color='gray'),
+                                    name='운전 케이스'))
         fig.add_trace(go.Scatter(x=[new_flow], y=[new_dp], mode='markers', 
                                 marker=dict(size=10, color='red'), name='운전점'))
         fig.add_hline(y=1.0, line_dash="dash", annotation_text="한계")
@@ -135,6 +135,41 @@ class Plant3DPipeline:
             logger.error(f"처리 중 오류 발생: {e}")
             return False
             
+    def diagnose_corpus(self, pdf_dir, output=None, workers=None):
+        """PDF 코퍼스 추출 진단 리포트 생성"""
+        from src.extractor.corpus_report import run_corpus, write_report
+        
+        output = output or str(Path(self.config['paths']['output']['reports']) / "corpus_report")
+        try:
+            results = run_corpus(pdf_dir, workers=workers)
+            return write_report(results, output)
+        except Exception as e:
+            logger.error(f"코퍼스 진단 실패: {e}")
+            return []
+            
+    def build_models(self, source, output=None, workers=None, lod=False, store=None):
+        """추출 데이터(JSON 폴더, .eqb, 장비 DB)에서 3D 모델 일괄 생성 (store: 메시 저장소 폴더)"""
+        from src.modeler.batch_modeler import run_batch
+        
+        output = output or str(Path(self.config['paths']['output']['models']) / "batch")
+        try:
+            return run_batch(source, output, workers=workers, lod=lod, store_dir=store)
+        except Exception as e:
+            logger.error(f"모델 일괄 생성 실패: {e}")
+            return None
+            
+    def check_layout(self, layout_path, output=None, clearance=None):
+        """플랜트 배치 파일의 장비 간 간섭 검사 리포트 생성 (clearance: 최소 이격 mm)"""
+        from src.modeler.plant_layout import load_layout, find_clashes, write_clash_report
+        
+        output = output or str(Path(self.config['paths']['output']['reports']) / "clash_report")
+        try:
+            layout = load_layout(layout_path)
+            return write_clash_report(layout, find_clashes(layout, clearance), output)
+        except Exception as e:
+            logger.error(f"간섭 검사 실패: {e}")
+            return []
+            
     def start_server(self):
         """웹 서버 시작"""
         logger.info("웹 서버 시작...")
@@ -186,6 +221,9 @@ def main():
         epilog="""
 예제:
   python main.py process --pdf data/input/cyclone.pdf
+  python main.py diagnose --dir data/input
+  python main.py models --source data/equipment.db --lod --store output/models/store
+  python main.py clash --layout data/plant_layout.json --clearance 50
   python main.py server
   python main.py status
         """
@@ -198,6 +236,26 @@ def main():
     process_parser.add_argument('--pdf', required=True, help='처리할 PDF 파일 경로')
     process_parser.add_argument('--output', help='출력 폴더 (기본: output/models)')
     
+    # diagnose 명령
+    diagnose_parser = subparsers.add_parser('diagnose', help='PDF 코퍼스 추출 진단 리포트')
+    diagnose_parser.add_argument('--dir', required=True, help='PDF 폴더')
+    diagnose_parser.add_argument('--output', help='리포트 경로, 확장자 제외 (기본: output/reports/corpus_report)')
+    diagnose_parser.add_argument('--workers', type=int, help='워커 프로세스 수 (기본: CPU 수)')
+    
+    # models 명령
+    models_parser = subparsers.add_parser('models', help='3D 모델 일괄 생성')
+    models_parser.add_argument('--source', required=True, help='추출 JSON 폴더, .eqb 파일 또는 장비 DB')
+    models_parser.add_argument('--output', help='출력 폴더 (기본: output/models/batch)')
+    models_parser.add_argument('--workers', type=int, help='워커 프로세스 수 (기본: CPU 수)')
+    models_parser.add_argument('--lod', action='store_true', help='LOD 단계도 저장')
+    models_parser.add_argument('--store', help='메시 저장소 폴더 (메모리 매핑, 태그 색인)')
+    
+    # clash 명령
+    clash_parser = subparsers.add_parser('clash', help='플랜트 배치 간섭 검사')
+    clash_parser.add_argument('--layout', required=True, help='배치 파일 (JSON)')
+    clash_parser.add_argument('--output', help='리포트 경로, 확장자 제외 (기본: output/reports/clash_report)')
+    clash_parser.add_argument('--clearance', type=float, help='최소 이격 거리 mm (기본: 배치 파일 값)')
+    
     # server 명령
     server_parser = subparsers.add_parser('server', help='웹 서버 시작')
     server_parser.add_argument('--port', type=int, help='포트 번호 (기본: 8080)')
@@ -213,6 +271,12 @@ def main():
     # 명령 실행
     if args.command == 'process':
         pipeline.process_pdf(args.pdf)
+    elif args.command == 'diagnose':
+        pipeline.diagnose_corpus(args.dir, args.output, args.workers)
+    elif args.command == 'models':
+        pipeline.build_models(args.source, args.output, args.workers, args.lod, args.store)
+    elif args.command == 'clash':
+        pipeline.check_layout(args.layout, args.output, args.clearance)
     elif args.command == 'server':
         pipeline.start_server()
     elif args.command == 'status':
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+텍스트 추출 백엔드 비교 하네스
+경로: E:\github\plant3D\src\extractor\backend_benchmark.py
+
+PDF 코퍼스 전체에 대해 등록된 모든 텍스트 백엔드를 실행하고
+정답 JSON 대비 필드 정확도와 처리 속도(pages/s)를 함께 보고합니다.
+
+사용법: python backend_benchmark.py <PDF_폴더> [--truth data/extracted] [--csv 결과.csv]
+"""
+
+import sys
+import json
+import math
+import time
+import argparse
+from pathlib import Path
+from dataclasses import asdict
+from typing import Dict, List, Any, Optional
+
+# 스크립트로 직접 실행할 때만 프로젝트 루트를 Python 경로에 추가 (import 시에는 바꾸지 않음)
+project_root = Path(__file__).resolve().parents[2]
+if __name__ == "__main__":
+    sys.path.insert(0, str(project_root))
+
+import pandas as pd
+from loguru import logger
+
+from src.extractor.pdf_parser import CyclonePDFParser, TEXT_BACKENDS, get_text_backend
+
+
+def field_matches(expected: Any, actual: Any, rel_tol: float = 1e-6) -> bool:
+    """필드 값 비교 (숫자는 상대 오차 허용)"""
+    if isinstance(expected, (int, float)) and isinstance(actual, (int, float)):
+        return math.isclose(float(expected), float(actual), rel_tol=rel_tol)
+    return expected == actual
+
+
+def score_fields(truth: Dict, parsed: Dict) -> Dict:
+    """정답 JSON의 각 필드에 대해 일치 여부 계산"""
+    wrong = [key for key, value in truth.items() if not field_matches(value, parsed.get(key))]
+    total = len(truth)
+    return {
+        'fields_total': total,
+        'fields_correct': total - len(wrong),
+        'wrong_fields': wrong,
+    }
+
+
+def load_ground_truth(pdf_path: Path, truth_dir: Path) -> Optional[Dict]:
+    """extract_cyclone_data와 같은 이름 규칙(<stem>_extracted.json)으로 정답 로드"""
+    truth_path = truth_dir / f"{pdf_path.stem}_extracted.json"
+    if not truth_path.exists():
+        return None
+    try:
+        with open(truth_path, 'r', encoding='utf-8') as f:
+            truth = json.load(f)
+        return truth if isinstance(truth, dict) else None
+    except (json.JSONDecodeError, UnicodeDecodeError) as e:
+        logger.warning(f"정답 파일 로드 실패: {truth_path} ({e})")
+        return None
+
+
+def run_backend(backend_name: str, pdf_path: Path, truth: Optional[Dict]) -> Dict:
+    """단일 문서에 대해 백엔드 하나를 실행"""
+    result = {
+        'document': pdf_path.name,
+        'backend': backend_name,
+        'pages': 0,
+        'extract_seconds': 0.0,
+        'parse_seconds': 0.0,
+        'error': '',
+    }
+
+    try:
+        start = time.perf_counter()
+        text, page_count = get_text_backend(backend_name).extract_text(pdf_path)
+        result['extract_seconds'] = time.perf_counter() - start
+        result['pages'] = page_count
+
+        start = time.perf_counter()
+        parsed = CyclonePDFParser(text_backend=backend_name).parse_text(text)
+        result['parse_seconds'] = time.perf_counter() - start
+    except Exception as e:
+        result['error'] = str(e)
+        parsed = None
+
+    if truth is not None:
+        parsed_dict = {k: v for k, v in asdict(parsed).items() if v is not None} if parsed else {}
+        scores = score_fields(truth, parsed_dict)
+        result.update(scores)
+        result['wrong_fields'] = ', '.join(scores['wrong_fields'])
+
+    return result
+
+
+def benchmark_corpus(pdf_dir: str, truth_dir: str = "data/extracted",
+                     backends: Optional[List[str]] = None) -> pd.DataFrame:
+    """코퍼스의 모든 PDF에 대해 모든 백엔드 실행 (문서 x 백엔드 행)"""
+    pdf_files = sorted(Path(pdf_dir).glob("*.pdf"))
+    if not pdf_files:
+        raise FileNotFoundError(f"PDF 파일을 찾을 수 없습니다: {pdf_dir}")
+
+    backends = backends or list(TEXT_BACKENDS)
+    truth_dir = Path(truth_dir)
+
+    rows = []
+    for pdf_path in pdf_files:
+        truth = load_ground_truth(pdf_path, truth_dir)
+        if truth is None:
+            logger.warning(f"정답 JSON 없음, 속도만 측정: {pdf_path.name}")
+        for backend_name in backends:
+            rows.append(run_backend(backend_name, pdf_path, truth))
+
+    logger.info(f"{len(pdf_files)}개 문서 x {len(backends)}개 백엔드 실행 완료")
+    return pd.DataFrame(rows)
+
+
+def summarize(results: pd.DataFrame) -> pd.DataFrame:
+    """백엔드별 정확도와 처리 속도 요약"""
+    grouped = results.groupby('backend')
+    summary = pd.DataFrame({
+        'documents': grouped['document'].count(),
+        'errors': grouped['error'].apply(lambda s: int((s != '').sum())),
+        'pages': grouped['pages'].sum(),
+        'extract_seconds': grouped['extract_seconds'].sum(),
+    })
+    summary['pages_per_second'] = summary['pages'] / summary['extract_seconds'].where(summary['extract_seconds'] > 0)
+
+    if 'fields_total' in results:
+        scored = results.dropna(subset=['fields_total']).groupby('backend')
+        summary['field_accuracy'] = scored['fields_correct'].sum() / scored['fields_total'].sum()
+
+    return summary.sort_values('pages_per_second', ascending=False)
+
+
+def recommend_backend(summary: pd.DataFrame, min_accuracy: float = 1.0) -> Optional[str]:
+    """정확도 기준을 만족하는 백엔드 중 가장 빠른 것"""
+    if 'field_accuracy' not in summary:
+        return None
+    eligible = summary[(summary['field_accuracy'] >= min_accuracy) & (summary['errors'] == 0)]
+    if eligible.empty:
+        return None
+    return eligible['pages_per_second'].idxmax()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="텍스트 추출 백엔드 속도/정확도 비교")
+    parser.add_argument('pdf_dir', help='PDF 코퍼스 폴더')
+    parser.add_argument('--truth', default='data/extracted', help='정답 JSON 폴더 (<stem>_extracted.json)')
+    parser.add_argument('--backend', action='append', choices=list(TEXT_BACKENDS), help='비교할 백엔드 (기본: 전체)')
+    parser.add_argument('--min-accuracy', type=float, default=1.0, help='추천 기준 필드 정확도')
+    parser.add_argument('--csv', help='문서별 결과 CSV 저장 경로')
+    args = parser.parse_args()
+
+    results = benchmark_corpus(args.pdf_dir, args.truth, args.backend)
+    summary = summarize(results)
+
+    print("\n=== 백엔드 비교 ===")
+    print(summary.to_string(float_format=lambda v: f"{v:.3f}"))
+
+    best = recommend_backend(summary, args.min_accuracy)
+    if best:
+        print(f"\n추천 백엔드: {best} (정확도 {args.min_accuracy:.0%} 이상 중 최고 속도)")
+    else:
+        print("\n정확도 기준을 만족하는 백엔드가 없습니다")
+
+    if args.csv:
+        results.to_csv(args.csv, index=False, encoding='utf-8-sig')
+        logger.info(f"문서별 결과 저장: {args.csv}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+PDF 코퍼스 추출 진단 리포트
+경로: E:\github\plant3D\src\extractor\corpus_report.py
+
+폴더 안의 모든 PDF를 프로세스 풀에서 병렬로 파싱하고, 문서별로
+찾은 필드, 성공한 추출 전략, 단계별 소요 시간을 하나의 CSV/HTML 리포트로 저장합니다.
+수천 개 문서에서 파서가 느리거나 실패하는 곳을 한 번에 확인하기 위한 도구입니다.
+
+사용법: python corpus_report.py <PDF_폴더> [--output output/reports/corpus] [--workers N] [--recursive]
+"""
+
+import os
+import sys
+import time
+import html
+import argparse
+from pathlib import Path
+from dataclasses import fields
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, Optional
+
+# 스크립트로 직접 실행할 때만 프로젝트 루트를 Python 경로에 추가 (import 시에는 바꾸지 않음)
+project_root = Path(__file__).resolve().parents[2]
+if __name__ == "__main__":
+    sys.path.insert(0, str(project_root))
+
+import pandas as pd
+from loguru import logger
+
+from src.extractor.equipment_record import EquipmentData
+
+# 리포트에 포함하는 필드 (장비 유형은 항상 채워지므로 제외)
+REPORT_FIELDS = [f.name for f in fields(EquipmentData) if f.name != 'equipment_type']
+
+# 리포트에 포함하는 시간 열 (초)
+TIMING_COLUMNS = ['text', 'tables', 'tabula', 'pdfplumber', 'parse', 'validate', 'total']
+
+
+def _init_worker(log_level: str):
+    """워커 프로세스 로그 설정 (문서마다 DEBUG 로그가 쏟아지지 않도록)"""
+    logger.remove()
+    logger.add(sys.stderr, level=log_level)
+
+
+def diagnose_document(pdf_path: str) -> Dict:
+    """PDF 1개를 파싱하고 진단 행 생성 (워커 프로세스에서 실행)"""
+    from src.extractor.pdf_parser import CyclonePDFParser
+
+    row = {'document': Path(pdf_path).name, 'path': str(pdf_path), 'status': 'ok', 'error': ''}
+    parser = CyclonePDFParser()
+    start = time.perf_counter()
+    data = None
+
+    try:
+        data = parser.parse_pdf(pdf_path)
+    except Exception as e:
+        row['status'] = 'failed'
+        row['error'] = f"{type(e).__name__}: {e}"
+    else:
+        if not parser.pdf_text:
+            row['status'] = 'no_text'
+
+    timings = {**parser.stage_timings, **parser.table_timings, 'total': time.perf_counter() - start}
+    row.update({f"t_{name}": timings.get(name) for name in TIMING_COLUMNS})
+
+    row['pages'] = parser.page_count
+    row['text_backend'] = parser.text_backend_used or ''
+    row['strategies_ok'] = ', '.join(k for k, v in parser.strategy_status.items() if v == 'ok')
+    row['strategies_failed'] = ', '.join(f"{k}({v})" for k, v in parser.strategy_status.items() if v != 'ok')
+    row['tabula_tables'] = len(parser.tables)
+    row['pdfplumber_tables'] = len(parser.structured_tables)
+
+    found = [name for name in REPORT_FIELDS if data is not None and getattr(data, name) not in (None, '', [], {})]
+    row['fields_found'] = len(found)
+    row['fields_missing'] = ', '.join(name for name in REPORT_FIELDS if name not in found)
+    row.update({f"f_{name}": int(name in found) for name in REPORT_FIELDS})
+    return row
+
+
+def run_corpus(pdf_dir: str, workers: Optional[int] = None, recursive: bool = False,
+               log_level: str = "ERROR") -> pd.DataFrame:
+    """폴더의 모든 PDF를 병렬로 진단"""
+    pattern = "**/*.pdf" if recursive else "*.pdf"
+    pdf_files = sorted(str(p) for p in Path(pdf_dir).glob(pattern))
+    if not pdf_files:
+        raise FileNotFoundError(f"PDF 파일을 찾을 수 없습니다: {pdf_dir}")
+
+    workers = workers or os.cpu_count() or 1
+    logger.info(f"{len(pdf_files)}개 PDF 진단 시작 (워커 {workers}개)")
+
+    rows = []
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(log_level,)) as executor:
+        futures = {executor.submit(diagnose_document, path): path for path in pdf_files}
+        for done, future in enumerate(as_completed(futures), start=1):
+            try:
+                rows.append(future.result())
+            except Exception as e:
+                # 워커 프로세스 자체가 죽은 경우에도 나머지 문서는 계속 진행
+                path = futures[future]
+                rows.append({'document': Path(path).name, 'path': path, 'status': 'crashed', 'error': str(e)})
+            if done % 100 == 0:
+                logger.info(f"  {done}/{len(pdf_files)} 완료")
+
+    elapsed = time.perf_counter() - start
+    logger.info(f"진단 완료: {len(rows)}개 문서, {elapsed:.1f}초 ({len(rows) / elapsed:.1f} 문서/초)")
+
+    columns = ['document', 'status', 'pages', 'fields_found', 'fields_missing', 'text_backend',
+               'strategies_ok', 'strategies_failed', 'tabula_tables', 'pdfplumber_tables',
+               *[f"t_{name}" for name in TIMING_COLUMNS], 'error',
+               *[f"f_{name}" for name in REPORT_FIELDS], 'path']
+    return pd.DataFrame(rows).reindex(columns=columns).sort_values('t_total', ascending=False)
+
+
+def field_coverage(results: pd.DataFrame) -> pd.Series:
+    """필드별 추출 성공률"""
+    coverage = results[[f"f_{name}" for name in REPORT_FIELDS]].mean()
+    coverage.index = REPORT_FIELDS
+    return coverage.sort_values()
+
+
+# 헤더 클릭 정렬 (숫자 열은 숫자로 비교)
+SORT_SCRIPT = """
+<script>
+document.querySelectorAll('table.sortable th').forEach(function (th, col) {
+  th.style.cursor = 'pointer';
+  th.addEventListener('click', function () {
+    var table = th.closest('table'), body = table.tBodies[0];
+    var asc = th.dataset.order !== 'asc';
+    th.dataset.order = asc ? 'asc' : 'desc';
+    var rows = Array.prototype.slice.call(body.rows);
+    rows.sort(function (a, b) {
+      var x = a.cells[col].textContent, y = b.cells[col].textContent;
+      var nx = parseFloat(x), ny = parseFloat(y);
+      var cmp = (!isNaN(nx) && !isNaN(ny)) ? nx - ny : x.localeCompare(y);
+      return asc ? cmp : -cmp;
+    });
+    rows.forEach(function (row) { body.appendChild(row); });
+  });
+});
+</script>
+"""
+
+
+def write_report(results: pd.DataFrame, output_base: str) -> List[str]:
+    """CSV와 정렬 가능한 HTML 리포트 저장"""
+    output_base = Path(output_base)
+    output_base.parent.mkdir(parents=True, exist_ok=True)
+
+    csv_path = output_base.with_suffix('.csv')
+    results.to_csv(csv_path, index=False, encoding='utf-8-sig')
+
+    ok = results[results['status'] == 'ok']
+    summary = pd.DataFrame({
+        '문서 수': [len(results)],
+        '실패': [int((results['status'] != 'ok').sum())],
+        '평균 필드 수': [ok['fields_found'].mean()],
+        '총 처리 시간 (초)': [results['t_total'].sum()],
+        '평균 문서당 시간 (초)': [results['t_total'].mean()],
+    })
+    stage_means = results[[f"t_{name}" for name in TIMING_COLUMNS]].mean().rename('평균 (초)').to_frame()
+
+    html_path = output_base.with_suffix('.html')
+    with open(html_path, 'w', encoding='utf-8') as f:
+        f.write("<!DOCTYPE html><html><head><meta charset='utf-8'>")
+        f.write(f"<title>{html.escape(output_base.stem)}</title>")
+        f.write("<style>body{font-family:sans-serif;font-size:12px}"
+                "table{border-collapse:collapse}td,th{border:1px solid #ccc;padding:2px 6px}"
+                "th{background:#eee}</style></head><body>")
+        f.write("<h2>코퍼스 추출 진단</h2>")
+        f.write(summary.to_html(index=False, float_format=lambda v: f"{v:.3f}"))
+        f.write("<h3>단계별 평균 시간</h3>")
+        f.write(stage_means.to_html(float_format=lambda v: f"{v:.3f}"))
+        f.write("<h3>필드별 추출 성공률</h3>")
+        f.write(field_coverage(results).rename('성공률').to_frame().to_html(float_format=lambda v: f"{v:.1%}"))
+        f.write("<h3>문서별 결과 (헤더 클릭 시 정렬)</h3>")
+        f.write(results.drop(columns=['path']).to_html(index=False, classes='sortable', na_rep='',
+                                                       float_format=lambda v: f"{v:.3f}"))
+        f.write(SORT_SCRIPT)
+        f.write("</body></html>")
+
+    logger.info(f"리포트 저장: {csv_path}, {html_path}")
+    return [str(csv_path), str(html_path)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="PDF 코퍼스 추출 진단 리포트")
+    parser.add_argument('pdf_dir', help='PDF 폴더')
+    parser.add_argument('--output', default='output/reports/corpus_report', help='리포트 경로 (확장자 제외)')
+    parser.add_argument('--workers', type=int, help='워커 프로세스 수 (기본: CPU 수)')
+    parser.add_argument('--recursive', action='store_true', help='하위 폴더 포함')
+    args = parser.parse_args()
+
+    results = run_corpus(args.pdf_dir, args.workers, args.recursive)
+    write_report(results, args.output)
+
+
+if __name__ == "__main__":
+    main()
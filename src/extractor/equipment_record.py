@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+장비 레코드 및 바이너리 직렬화 모듈
+경로: E:\github\plant3D\src\extractor\equipment_record.py
+
+EquipmentData 레코드 타입과 버전이 있는 열 기반 바이너리 형식(.eqb)을 정의합니다.
+수천 개 레코드를 버퍼 하나에서 열 단위로 한 번에 디코딩합니다.
+사람이 읽는 용도의 JSON 출력은 그대로 유지됩니다.
+
+파일 구조 (little-endian):
+  헤더   : magic 'EQRB' | u16 버전 | u16 예약 | u32 레코드 수 | u32 스키마 길이
+  스키마 : [[필드 이름, 열 종류], ...] JSON (utf-8)
+  열     : 스키마 순서대로 u64 길이 + 데이터
+           float - float64[레코드 수], None은 NaN
+           str   - u8 null 마스크[레코드 수] + '\\0'로 이은 utf-8
+           json  - 열 전체 값 목록의 JSON 문서
+
+사용법:
+  python equipment_record.py pack <JSON_폴더|장비_DB> <출력.eqb>
+  python equipment_record.py dump <파일.eqb>
+"""
+
+import sys
+import json
+import struct
+import typing
+from pathlib import Path
+from dataclasses import dataclass, fields
+from typing import Dict, List, Optional, Iterable
+
+import numpy as np
+
+
+@dataclass(slots=True)
+class EquipmentData:
+    """장비 데이터 클래스"""
+    # 기본 정보
+    tag_number: str
+    service: str
+    equipment_type: str
+    manufacturer: Optional[str] = None
+    model: Optional[str] = None
+    revision: Optional[str] = None
+
+    # 운전 조건
+    flow_rate: Optional[float] = None
+    flow_unit: Optional[str] = None
+    temperature: Optional[float] = None
+    pressure: Optional[float] = None
+    density: Optional[float] = None
+
+    # 설계 조건
+    design_pressure: Optional[float] = None
+    design_temperature: Optional[float] = None
+    material: Optional[str] = None
+
+    # 노즐 정보
+    nozzles: Optional[List[Dict]] = None
+
+    # 성능 데이터
+    efficiency: Optional[float] = None
+    pressure_drop: Optional[float] = None
+    inlet_velocity: Optional[float] = None
+
+    # 치수
+    dimensions: Optional[Dict] = None
+
+    # 운전 케이스 행렬 (케이스 x 변수)
+    # {'cases': [...], 'variables': [...], 'units': [...], 'values': [[...], ...]}
+    operating_cases: Optional[Dict] = None
+
+
+MAGIC = b'EQRB'
+FORMAT_VERSION = 1
+HEADER = struct.Struct('<4sHHII')
+COLUMN_LENGTH = struct.Struct('<Q')
+
+
+def _column_kinds() -> Dict[str, str]:
+    """EquipmentData 필드별 바이너리 열 종류 (float / str / json)"""
+    hints = typing.get_type_hints(EquipmentData)
+    kinds = {}
+    for field in fields(EquipmentData):
+        args = [arg for arg in typing.get_args(hints[field.name]) if arg is not type(None)]
+        base = args[0] if args else hints[field.name]
+        if base is float:
+            kinds[field.name] = 'float'
+        elif base is str:
+            kinds[field.name] = 'str'
+        else:
+            kinds[field.name] = 'json'
+    return kinds
+
+
+COLUMN_KINDS = _column_kinds()
+
+
+def record_to_dict(record: EquipmentData) -> Dict:
+    """None 값을 뺀 dict (save_extracted_data의 JSON과 같은 형태)"""
+    return {f.name: getattr(record, f.name) for f in fields(record) if getattr(record, f.name) is not None}
+
+
+def record_from_dict(data: Dict) -> EquipmentData:
+    """dict에서 레코드 생성 (알 수 없는 키는 무시)"""
+    values = {name: data.get(name) for name in COLUMN_KINDS}
+    values['tag_number'] = values['tag_number'] or ""
+    values['service'] = values['service'] or ""
+    values['equipment_type'] = values['equipment_type'] or "cyclone"
+    return EquipmentData(**values)
+
+
+def pack_records(records: Iterable[EquipmentData]) -> bytes:
+    """레코드 목록을 바이너리로 직렬화"""
+    records = list(records)
+    schema = list(COLUMN_KINDS.items())
+    schema_bytes = json.dumps(schema).encode('utf-8')
+
+    parts = [HEADER.pack(MAGIC, FORMAT_VERSION, 0, len(records), len(schema_bytes)), schema_bytes]
+    for name, kind in schema:
+        values = [getattr(record, name) for record in records]
+        if kind == 'float':
+            payload = np.array([np.nan if v is None else v for v in values], dtype='<f8').tobytes()
+        elif kind == 'str':
+            mask = bytes(v is not None for v in values)
+            text = '\0'.join('' if v is None else str(v).replace('\0', '') for v in values)
+            payload = mask + text.encode('utf-8')
+        else:
+            payload = json.dumps(values, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        parts.append(COLUMN_LENGTH.pack(len(payload)))
+        parts.append(payload)
+
+    return b''.join(parts)
+
+
+def unpack_records(buffer: bytes) -> List[EquipmentData]:
+    """바이너리 버퍼에서 모든 레코드를 열 단위로 디코딩"""
+    view = memoryview(buffer)
+    magic, version, _, count, schema_length = HEADER.unpack_from(view, 0)
+    if magic != MAGIC:
+        raise ValueError("장비 레코드 파일이 아닙니다")
+    if version > FORMAT_VERSION:
+        raise ValueError(f"지원하지 않는 레코드 형식 버전: {version} (최대 {FORMAT_VERSION})")
+
+    offset = HEADER.size
+    schema = json.loads(bytes(view[offset:offset + schema_length]))
+    offset += schema_length
+
+    columns = {}
+    for name, kind in schema:
+        (length,) = COLUMN_LENGTH.unpack_from(view, offset)
+        offset += COLUMN_LENGTH.size
+        payload = view[offset:offset + length]
+        offset += length
+
+        if kind == 'float':
+            array = np.frombuffer(payload, dtype='<f8', count=count)
+            values = array.tolist()
+            for i in np.flatnonzero(np.isnan(array)).tolist():
+                values[i] = None
+        elif kind == 'str':
+            mask = payload[:count]
+            texts = str(payload[count:], 'utf-8').split('\0') if count else []
+            values = [text if present else None for text, present in zip(texts, mask)]
+        else:
+            values = json.loads(bytes(payload))
+
+        # 현재 EquipmentData에 없는 필드는 무시 (이후 버전 호환)
+        if name in COLUMN_KINDS:
+            columns[name] = values
+
+    # 필드 순서대로 열을 맞추고 위치 인자로 생성 (파일에 없는 필드는 None)
+    ordered = [columns.get(name) or [None] * count for name in COLUMN_KINDS]
+    return [EquipmentData(*row) for row in zip(*ordered)]
+
+
+def save_records(records: Iterable[EquipmentData], path: str) -> int:
+    """레코드를 .eqb 파일로 저장 (레코드 수 반환)"""
+    records = list(records)
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(pack_records(records))
+    return len(records)
+
+
+def load_records(path: str) -> List[EquipmentData]:
+    """.eqb 파일의 모든 레코드를 한 번에 로드"""
+    return unpack_records(Path(path).read_bytes())
+
+
+def main():
+    if len(sys.argv) >= 4 and sys.argv[1] == 'pack':
+        source, output = Path(sys.argv[2]), sys.argv[3]
+        if source.is_dir():
+            records = []
+            for json_path in sorted(source.glob("*_extracted.json")):
+                try:
+                    with open(json_path, 'r', encoding='utf-8') as f:
+                        records.append(record_from_dict(json.load(f)))
+                except (json.JSONDecodeError, UnicodeDecodeError, AttributeError) as e:
+                    print(f"건너뜀: {json_path.name} ({e})")
+        else:
+            # 프로젝트 루트를 Python 경로에 추가
+            sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+            from src.extractor.equipment_store import EquipmentStore
+            with EquipmentStore(str(source)) as store:
+                records = [record_from_dict(data) for data in store.find()]
+        count = save_records(records, output)
+        print(f"{count}개 레코드 저장: {output} ({Path(output).stat().st_size:,} bytes)")
+    elif len(sys.argv) >= 3 and sys.argv[1] == 'dump':
+        for record in load_records(sys.argv[2]):
+            print(json.dumps(record_to_dict(record), ensure_ascii=False))
+    else:
+        print("사용법: python equipment_record.py pack <JSON_폴더|장비_DB> <출력.eqb>")
+        print("        python equipment_record.py dump <파일.eqb>")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""
+장비 데이터베이스 (SQLite)
+경로: E:\github\plant3D\src\extractor\equipment_store.py
+
+추출 결과를 PDF 이름별 JSON 파일 대신 내장 SQLite 데이터베이스에 저장합니다.
+태그 번호, 서비스, 장비 유형, 리비전에 인덱스가 있고 노즐은 하위 테이블에 저장합니다.
+
+사용법:
+  python equipment_store.py import <JSON_폴더> [--db data/equipment.db]
+  python equipment_store.py get <태그번호>
+  python equipment_store.py find [--service ...] [--type ...] [--revision ...]
+"""
+
+import re
+import json
+import sqlite3
+import argparse
+from pathlib import Path
+from datetime import datetime
+from dataclasses import fields, is_dataclass
+from typing import Dict, List, Any, Optional, Iterable
+
+from loguru import logger
+
+
+DEFAULT_DB_PATH = "data/equipment.db"
+
+# 노즐 하위 테이블의 고정 열 (그 외 키는 extra JSON 열에 보관)
+NOZZLE_COLUMNS = ('tag', 'service', 'size', 'rating', 'facing')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS equipment (
+    id INTEGER PRIMARY KEY,
+    tag_number TEXT NOT NULL,
+    revision TEXT NOT NULL DEFAULT '',
+    service TEXT,
+    equipment_type TEXT,
+    source TEXT,
+    data TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    UNIQUE (tag_number, revision)
+);
+CREATE INDEX IF NOT EXISTS idx_equipment_service ON equipment (service);
+CREATE INDEX IF NOT EXISTS idx_equipment_type ON equipment (equipment_type);
+CREATE INDEX IF NOT EXISTS idx_equipment_revision ON equipment (revision);
+
+CREATE TABLE IF NOT EXISTS nozzles (
+    equipment_id INTEGER NOT NULL REFERENCES equipment (id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    tag TEXT,
+    service TEXT,
+    size TEXT,
+    rating TEXT,
+    facing TEXT,
+    extra TEXT,
+    PRIMARY KEY (equipment_id, position)
+);
+"""
+
+
+# 태그별 최신 리비전 정렬 (정규화한 리비전이 같으면 나중에 저장된 행)
+LATEST_ORDER = "revision_key(revision) DESC, updated_at DESC, id DESC"
+
+
+def revision_key(revision: Optional[str]) -> str:
+    """리비전 문자열의 정렬 키 (큰 값이 최신)
+
+    'Rev.', 'R' 같은 접두어와 구분 기호를 무시하고 숫자는 자릿수를 맞춰 비교하므로
+    '10'이 '9'보다 뒤입니다. 발행 전 문자 리비전(A, B, ...)은 숫자 리비전(0, 1, ...)보다 앞이고
+    리비전이 없는 행('')이 가장 앞입니다.
+    """
+    text = re.sub(r'^(REV(ISION)?|R)(?=[\s.\-_]*[0-9A-Z])', '', str(revision or '').strip().upper())
+    tokens = re.findall(r'\d+|[A-Z]+', text)
+    if not tokens:
+        return '0'
+    rank = '2' if tokens[0].isdigit() else '1'
+    return rank + ''.join(token.zfill(10) if token.isdigit() else f"{len(token):02d}{token}" for token in tokens)
+
+
+def _to_dict(record: Any) -> Dict:
+    """EquipmentData 또는 dict를 None 값이 제거된 dict로 변환 (save_extracted_data와 동일)
+
+    바로 JSON으로 직렬화하므로 asdict의 깊은 복사 대신 얕은 변환을 사용합니다.
+    """
+    if is_dataclass(record):
+        return {f.name: getattr(record, f.name) for f in fields(record) if getattr(record, f.name) is not None}
+    return {k: v for k, v in record.items() if v is not None}
+
+
+class EquipmentStore:
+    """SQLite 장비 데이터베이스"""
+
+    def __init__(self, db_path: str = DEFAULT_DB_PATH):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self.conn = sqlite3.connect(str(self.db_path))
+        self.conn.row_factory = sqlite3.Row
+        self.conn.create_function("revision_key", 1, revision_key, deterministic=True)
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.execute("PRAGMA synchronous = NORMAL")
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ------------------------------------------------------------------
+    # 저장
+    # ------------------------------------------------------------------
+    def upsert(self, record: Any, source: Optional[str] = None) -> int:
+        """장비 1개 저장 (태그 번호 + 리비전이 같으면 갱신)"""
+        return self.upsert_many([record], source=source)
+
+    def upsert_many(self, records: Iterable[Any], source: Optional[str] = None) -> int:
+        """여러 장비를 하나의 트랜잭션으로 저장"""
+        now = datetime.now().isoformat(timespec='seconds')
+        count = 0
+
+        with self.conn:
+            for record in records:
+                data = _to_dict(record)
+                tag_number = data.get('tag_number')
+                if not tag_number:
+                    logger.warning("태그 번호가 없는 레코드는 저장하지 않습니다")
+                    continue
+
+                nozzles = data.pop('nozzles', None) or []
+                revision = data.get('revision') or ''
+
+                self.conn.execute(
+                    """
+                    INSERT INTO equipment (tag_number, revision, service, equipment_type, source, data, updated_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT (tag_number, revision) DO UPDATE SET
+                        service = excluded.service,
+                        equipment_type = excluded.equipment_type,
+                        source = excluded.source,
+                        data = excluded.data,
+                        updated_at = excluded.updated_at
+                    """,
+                    (tag_number, revision, data.get('service'), data.get('equipment_type'),
+                     source, json.dumps(data, ensure_ascii=False), now)
+                )
+                equipment_id = self.conn.execute(
+                    "SELECT id FROM equipment WHERE tag_number = ? AND revision = ?",
+                    (tag_number, revision)
+                ).fetchone()[0]
+
+                self.conn.execute("DELETE FROM nozzles WHERE equipment_id = ?", (equipment_id,))
+                self.conn.executemany(
+                    "INSERT INTO nozzles VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    [self._nozzle_row(equipment_id, position, nozzle) for position, nozzle in enumerate(nozzles)]
+                )
+                count += 1
+
+        logger.debug(f"장비 {count}개 저장: {self.db_path}")
+        return count
+
+    @staticmethod
+    def _nozzle_row(equipment_id: int, position: int, nozzle: Dict) -> tuple:
+        extra = {k: v for k, v in nozzle.items() if k not in NOZZLE_COLUMNS}
+        return (equipment_id, position, *(nozzle.get(col) for col in NOZZLE_COLUMNS),
+                json.dumps(extra, ensure_ascii=False) if extra else None)
+
+    def import_json_dir(self, json_dir: str, pattern: str = "*_extracted.json") -> int:
+        """기존 추출 JSON 파일들을 데이터베이스로 가져오기"""
+        records = []
+        for json_path in sorted(Path(json_dir).glob(pattern)):
+            try:
+                with open(json_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+            except (json.JSONDecodeError, UnicodeDecodeError) as e:
+                logger.warning(f"JSON 로드 실패, 건너뜀: {json_path.name} ({e})")
+                continue
+            if isinstance(data, dict):
+                records.append(data)
+
+        count = self.upsert_many(records, source=str(json_dir))
+        logger.info(f"{count}개 JSON 레코드 가져오기 완료: {json_dir}")
+        return count
+
+    # ------------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------------
+    def get(self, tag_number: str, revision: Optional[str] = None) -> Optional[Dict]:
+        """태그 번호로 장비 조회 (리비전 미지정 시 가장 높은 리비전, revision_key 기준)"""
+        if revision is None:
+            row = self.conn.execute(
+                f"SELECT id, data FROM equipment WHERE tag_number = ? ORDER BY {LATEST_ORDER} LIMIT 1",
+                (tag_number,)
+            ).fetchone()
+        else:
+            row = self.conn.execute(
+                "SELECT id, data FROM equipment WHERE tag_number = ? AND revision = ?",
+                (tag_number, revision)
+            ).fetchone()
+        return self._load_rows([row])[0] if row else None
+
+    def find(self, service: Optional[str] = None, equipment_type: Optional[str] = None,
+             revision: Optional[str] = None, tag_prefix: Optional[str] = None,
+             limit: Optional[int] = None, latest: bool = False) -> List[Dict]:
+        """조건으로 장비 검색 (모두 인덱스 열)
+
+        latest이면 조건에 맞는 행 중 태그마다 get()과 같은 기준(가장 높은 리비전)의 행 하나만 반환합니다.
+        """
+        clauses, params = [], []
+        for column, value in (('service', service), ('equipment_type', equipment_type), ('revision', revision)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if tag_prefix:
+            # tag_number 인덱스를 타는 범위 검색
+            clauses.append("tag_number >= ? AND tag_number < ?")
+            params.extend([tag_prefix, tag_prefix + '\uffff'])
+
+        sql = "SELECT id, data FROM equipment"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        if latest:
+            sql = ("SELECT id, data FROM (SELECT id, data, tag_number, revision, ROW_NUMBER() OVER "
+                   f"(PARTITION BY tag_number ORDER BY {LATEST_ORDER}) AS recency"
+                   + sql[len("SELECT id, data"):] + ") WHERE recency = 1")
+        sql += " ORDER BY tag_number, revision"
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+
+        return self._load_rows(self.conn.execute(sql, params).fetchall())
+
+    def tags(self) -> List[str]:
+        """저장된 태그 번호 목록"""
+        return [row[0] for row in self.conn.execute("SELECT DISTINCT tag_number FROM equipment ORDER BY tag_number")]
+
+    def count(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM equipment").fetchone()[0]
+
+    def _load_rows(self, rows: List[sqlite3.Row]) -> List[Dict]:
+        """equipment 행들을 노즐을 포함한 dict로 복원"""
+        if not rows:
+            return []
+
+        ids = [row['id'] for row in rows]
+        nozzles: Dict[int, List[Dict]] = {}
+        for chunk_start in range(0, len(ids), 900):
+            chunk = ids[chunk_start:chunk_start + 900]
+            placeholders = ",".join("?" * len(chunk))
+            for nozzle_row in self.conn.execute(
+                f"SELECT * FROM nozzles WHERE equipment_id IN ({placeholders}) ORDER BY equipment_id, position",
+                chunk
+            ):
+                nozzle = {col: nozzle_row[col] for col in NOZZLE_COLUMNS if nozzle_row[col] is not None}
+                if nozzle_row['extra']:
+                    nozzle.update(json.loads(nozzle_row['extra']))
+                nozzles.setdefault(nozzle_row['equipment_id'], []).append(nozzle)
+
+        results = []
+        for row in rows:
+            data = json.loads(row['data'])
+            if row['id'] in nozzles:
+                data['nozzles'] = nozzles[row['id']]
+            results.append(data)
+        return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="장비 데이터베이스 관리")
+    parser.add_argument('--db', default=DEFAULT_DB_PATH, help='데이터베이스 경로')
+    subparsers = parser.add_subparsers(dest='command')
+
+    import_parser = subparsers.add_parser('import', help='추출 JSON 폴더 가져오기')
+    import_parser.add_argument('json_dir')
+
+    get_parser = subparsers.add_parser('get', help='태그 번호로 조회')
+    get_parser.add_argument('tag_number')
+    get_parser.add_argument('--revision')
+
+    find_parser = subparsers.add_parser('find', help='조건 검색')
+    find_parser.add_argument('--service')
+    find_parser.add_argument('--type', dest='equipment_type')
+    find_parser.add_argument('--revision')
+    find_parser.add_argument('--limit', type=int, default=50)
+
+    args = parser.parse_args()
+
+    with EquipmentStore(args.db) as store:
+        if args.command == 'import':
+            store.import_json_dir(args.json_dir)
+        elif args.command == 'get':
+            record = store.get(args.tag_number, args.revision)
+            print(json.dumps(record, indent=2, ensure_ascii=False) if record else "장비를 찾을 수 없습니다")
+        elif args.command == 'find':
+            for record in store.find(args.service, args.equipment_type, args.revision, limit=args.limit):
+                print(f"{record['tag_number']}\t{record.get('revision', '')}\t{record.get('service', '')}")
+        else:
+            parser.print_help()
+
+
+if __name__ == "__main__":
+    main()
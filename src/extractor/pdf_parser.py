@@ -7,11 +7,20 @@ PDF 데이터시트 파싱 모듈
 """
 
 import re
+import sys
 import json
+import time
+from abc import ABC, abstractmethod
 from pathlib import Path
 from typing import Dict, List, Any, Optional, Tuple
-from dataclasses import dataclass, asdict
+from dataclasses import asdict
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+# 스크립트로 직접 실행할 때만 프로젝트 루트를 Python 경로에 추가 (import 시에는 바꾸지 않음)
+project_root = Path(__file__).resolve().parents[2]
+if __name__ == "__main__":
+    sys.path.insert(0, str(project_root))
 
 import PyPDF2
 import tabula
@@ -19,49 +28,135 @@ import pdfplumber
 import pandas as pd
 from loguru import logger
 
+from src.extractor.equipment_record import EquipmentData
 
-@dataclass
-class EquipmentData:
-    """장비 데이터 클래스"""
-    # 기본 정보
-    tag_number: str
-    service: str
-    equipment_type: str
-    manufacturer: Optional[str] = None
-    model: Optional[str] = None
-    
-    # 운전 조건
-    flow_rate: Optional[float] = None
-    flow_unit: Optional[str] = None
-    temperature: Optional[float] = None
-    pressure: Optional[float] = None
-    density: Optional[float] = None
+
+# 운전 케이스 행렬에 담을 변수: (변수 이름, 라인 라벨, 단위 표기)
+OPERATING_CASE_VARIABLES = [
+    ('solids_flow', 'Solids', 'kg/hr'),
+    ('temperature', 'Temperature', '°C'),
+    ('pressure', 'Pressure', 'kg/cm2'),
+    ('density', 'Density', 'kg/m3'),
+]
+
+# 케이스 헤더를 찾지 못했을 때의 기본 케이스 이름
+DEFAULT_OPERATING_CASES = ['Min', 'Normal', 'Max']
+
+
+class TextBackend(ABC):
+    """PDF 텍스트 추출 백엔드 기본 클래스"""
+    name = "base"
     
-    # 설계 조건
-    design_pressure: Optional[float] = None
-    design_temperature: Optional[float] = None
-    material: Optional[str] = None
+    @abstractmethod
+    def extract_pages(self, pdf_path: Path) -> List[str]:
+        """페이지별 텍스트 추출"""
+        
+    def extract_text(self, pdf_path: Path) -> Tuple[str, int]:
+        """전체 텍스트와 페이지 수 반환 (빈 페이지는 건너뜀)"""
+        pages = self.extract_pages(pdf_path)
+        text = "".join(page_text + "\n" for page_text in pages if page_text)
+        return text, len(pages)
+
+
+class PdfPlumberBackend(TextBackend):
+    """pdfplumber 백엔드 - 레이아웃 분석으로 정확하지만 느림"""
+    name = "pdfplumber"
     
-    # 노즐 정보
-    nozzles: Optional[List[Dict]] = None
+    def extract_pages(self, pdf_path: Path) -> List[str]:
+        with pdfplumber.open(pdf_path) as pdf:
+            return [page.extract_text() or "" for page in pdf.pages]
+
+
+class PyPDF2Backend(TextBackend):
+    """PyPDF2 백엔드 - 텍스트 레이어만 읽으므로 빠름"""
+    name = "pypdf2"
     
-    # 성능 데이터
-    efficiency: Optional[float] = None
-    pressure_drop: Optional[float] = None
-    inlet_velocity: Optional[float] = None
+    def extract_pages(self, pdf_path: Path) -> List[str]:
+        with open(pdf_path, 'rb') as f:
+            reader = PyPDF2.PdfReader(f)
+            return [page.extract_text() or "" for page in reader.pages]
+
+
+# 등록된 텍스트 백엔드 (자동 선택 시 앞쪽이 우선)
+TEXT_BACKENDS = {
+    PyPDF2Backend.name: PyPDF2Backend,
+    PdfPlumberBackend.name: PdfPlumberBackend,
+}
+
+# 기본 백엔드 (필드 규칙이 이 백엔드의 줄 배치 기준으로 작성됨)
+DEFAULT_TEXT_BACKEND = PdfPlumberBackend.name
+
+# 자동 선택 시 최종 대체 백엔드
+FALLBACK_TEXT_BACKEND = PdfPlumberBackend.name
+
+# 자동 선택에서 빠른 백엔드 결과를 받아들이기 위해 반드시 채워져야 하는 필드
+# (노즐은 텍스트와 무관하게 기본 노즐이 채워지므로 판단에 쓰지 않음)
+REQUIRED_FIELDS = ('tag_number', 'service')
+
+# 위와 같은 용도의 dimensions 항목 (사이클론 모델 치수가 입구 치수에서 유도됨)
+REQUIRED_DIMENSIONS = ('inlet_height_mm', 'inlet_width_mm')
+
+
+def get_text_backend(name: str) -> TextBackend:
+    """이름으로 텍스트 백엔드 생성"""
+    if name not in TEXT_BACKENDS:
+        raise ValueError(f"알 수 없는 텍스트 백엔드: {name} (지원: {', '.join(TEXT_BACKENDS)})")
+    return TEXT_BACKENDS[name]()
+
+
+def is_usable_text(text: str, page_count: int,
+                   min_chars_per_page: int = 100,
+                   max_avg_line_length: int = 200) -> bool:
+    """빠른 백엔드의 추출 결과가 라인 기반 파싱에 쓸 만한지 판단
     
-    # 치수
-    dimensions: Optional[Dict] = None
+    - 페이지당 문자 수가 너무 적으면 이미지 PDF로 판단
+    - (cid:..) 또는 대체 문자가 많으면 폰트 매핑 실패로 판단
+    - 평균 라인 길이가 너무 길면 줄바꿈이 소실된 것으로 판단
+    """
+    if page_count == 0 or len(text) < min_chars_per_page * page_count:
+        return False
     
+    garbage = text.count('(cid:') + text.count('\ufffd')
+    if garbage > len(text) * 0.01:
+        return False
+        
+    lines = [line for line in text.split('\n') if line.strip()]
+    if not lines or len(text) / len(lines) > max_avg_line_length:
+        return False
+        
+    return True
+
+
+def missing_required_fields(data: EquipmentData) -> List[str]:
+    """REQUIRED_FIELDS/REQUIRED_DIMENSIONS 중 비어 있는 필드 이름"""
+    missing = [field for field in REQUIRED_FIELDS if not getattr(data, field, None)]
+    dimensions = data.dimensions or {}
+    missing += [f"dimensions.{key}" for key in REQUIRED_DIMENSIONS if not dimensions.get(key)]
+    return missing
+
 
 class CyclonePDFParser:
     """사이클론 PDF 파서"""
     
-    def __init__(self):
+    def __init__(self, text_backend: str = DEFAULT_TEXT_BACKEND):
+        """
+        Args:
+            text_backend: 텍스트 추출 백엔드 이름 (기본 pdfplumber). backend_benchmark로
+                코퍼스의 필드 정확도가 같음을 확인한 뒤 더 빠른 백엔드를 지정하거나,
+                "auto"로 빠른 백엔드를 먼저 쓰고 필수 필드가 빠지면 대체 백엔드로 다시 추출합니다.
+        """
+        if text_backend != "auto" and text_backend not in TEXT_BACKENDS:
+            raise ValueError(f"알 수 없는 텍스트 백엔드: {text_backend}")
+        self.text_backend = text_backend
+        self.text_backend_used = None
+        self.page_count = 0
         self.data = None
         self.pdf_text = ""
         self.tables = []
         self.structured_tables = []
+        self.table_timings = {}
+        self.stage_timings = {}
+        self.strategy_status = {}
         self.debug_mode = False
         
     def parse_pdf(self, pdf_path: str, debug: bool = False) -> EquipmentData:
@@ -73,76 +168,158 @@ class CyclonePDFParser:
         if not pdf_path.exists():
             raise FileNotFoundError(f"PDF 파일을 찾을 수 없습니다: {pdf_path}")
             
+        self.stage_timings = {}
+        self.strategy_status = {}
+        
         # 1. 텍스트 추출
-        self._extract_text(pdf_path)
+        self._timed_stage('text', self._extract_text, pdf_path)
         
         # 2. 테이블 추출
-        self._extract_tables_enhanced(pdf_path)
+        self._timed_stage('tables', self._extract_tables_enhanced, pdf_path)
         
         # 3. 데이터 파싱
-        equipment_data = self._parse_equipment_data()
+        equipment_data = self._timed_stage('parse', self._parse_equipment_data)
+        
+        # 자동 선택: 빠른 백엔드 텍스트로 필수 필드가 나오지 않으면 대체 백엔드로 재시도
+        if self.text_backend == "auto" and self.text_backend_used not in (None, FALLBACK_TEXT_BACKEND):
+            missing = missing_required_fields(equipment_data)
+            if missing:
+                logger.info(f"{self.text_backend_used} 결과에 필수 필드 누락({', '.join(missing)}), "
+                            f"{FALLBACK_TEXT_BACKEND}로 재추출")
+                self.strategy_status[f"text:{self.text_backend_used}"] = 'incomplete'
+                self._timed_stage('text_fallback', self._extract_text, pdf_path, [FALLBACK_TEXT_BACKEND])
+                equipment_data = self._timed_stage('parse_fallback', self._parse_equipment_data)
         
         # 4. 검증
-        self._validate_data(equipment_data)
+        self._timed_stage('validate', self._validate_data, equipment_data)
         
         logger.success("PDF 파싱 완료")
         return equipment_data
         
-    def _extract_text(self, pdf_path: Path):
-        """PDF에서 텍스트 추출"""
+    def _timed_stage(self, stage: str, func, *args):
+        """단계 실행 시간을 stage_timings에 기록"""
+        start = time.perf_counter()
         try:
-            # pdfplumber로 추출 (더 정확함)
-            with pdfplumber.open(pdf_path) as pdf:
-                self.pdf_text = ""
-                for page in pdf.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        self.pdf_text += page_text + "\n"
-                        
-            if self.debug_mode:
-                logger.debug(f"텍스트 추출 완료: {len(self.pdf_text)} 문자")
-                logger.debug(f"처음 500자: {self.pdf_text[:500]}")
+            return func(*args)
+        finally:
+            self.stage_timings[stage] = time.perf_counter() - start
+        
+    def _extract_text(self, pdf_path: Path, candidates: Optional[List[str]] = None):
+        """PDF에서 텍스트 추출 (candidates: 시도할 백엔드 순서, 기본은 설정에 따름)"""
+        self.pdf_text = ""
+        
+        if candidates is None:
+            candidates = list(TEXT_BACKENDS) if self.text_backend == "auto" else [self.text_backend]
             
-        except Exception as e:
-            logger.error(f"텍스트 추출 실패: {e}")
+        for name in candidates:
+            try:
+                start = time.perf_counter()
+                text, page_count = get_text_backend(name).extract_text(pdf_path)
+                elapsed = time.perf_counter() - start
+            except Exception as e:
+                logger.warning(f"{name} 텍스트 추출 실패: {e}")
+                self.strategy_status[f"text:{name}"] = 'error'
+                continue
+                
+            # 자동 선택: 빠른 백엔드 결과가 부실하면 다음 백엔드로
+            if (self.text_backend == "auto" and name != FALLBACK_TEXT_BACKEND
+                    and not is_usable_text(text, page_count)):
+                logger.debug(f"{name} 추출 결과 부적합, 다음 백엔드 시도")
+                self.strategy_status[f"text:{name}"] = 'unusable'
+                continue
+                
+            self.strategy_status[f"text:{name}"] = 'ok'
+            self.pdf_text = text
+            self.page_count = page_count
+            self.text_backend_used = name
+            logger.debug(f"텍스트 백엔드: {name} ({page_count}페이지, {elapsed:.3f}초)")
+            break
+        else:
+            logger.error("텍스트 추출 실패: 사용 가능한 백엔드가 없습니다")
+            
+        if self.debug_mode:
+            logger.debug(f"텍스트 추출 완료: {len(self.pdf_text)} 문자")
+            logger.debug(f"처음 500자: {self.pdf_text[:500]}")
+            
+    def parse_text(self, text: str) -> EquipmentData:
+        """이미 추출된 텍스트에서 장비 정보 파싱 (테이블 추출 생략)"""
+        self.pdf_text = text
+        return self._parse_equipment_data()
             
     def _extract_tables_enhanced(self, pdf_path: Path):
-        """향상된 테이블 추출"""
+        """향상된 테이블 추출
+        
+        tabula(외부 JVM 프로세스)와 pdfplumber(프로세스 내부)는 서로 독립적이므로
+        동시에 실행하고 둘 다 끝나면 결과를 병합합니다.
+        """
+        self.table_timings = {}
+        start = time.perf_counter()
+        
         try:
-            # 1. tabula로 추출
-            try:
-                tables = tabula.read_pdf(
-                    str(pdf_path), 
-                    pages='all', 
-                    multiple_tables=True, 
-                    pandas_options={'header': None}
-                )
+            with ThreadPoolExecutor(max_workers=2, thread_name_prefix="table") as executor:
+                tabula_future = executor.submit(self._timed, 'tabula', self._extract_tabula_tables, pdf_path)
+                plumber_future = executor.submit(self._timed, 'pdfplumber', self._extract_plumber_tables, pdf_path)
+                
+                # 1. tabula 결과
+                tables = tabula_future.result()
+                self.strategy_status.setdefault('tables:tabula', 'ok')
                 self.tables.extend(tables)
-                logger.debug(f"Tabula 테이블 추출: {len(self.tables)}개")
-            except Exception as e:
-                logger.warning(f"Tabula 추출 실패: {e}")
-            
-            # 2. pdfplumber로 추출
-            with pdfplumber.open(pdf_path) as pdf:
-                for page_num, page in enumerate(pdf.pages):
-                    try:
-                        page_tables = page.extract_tables()
-                        
-                        for table_idx, table in enumerate(page_tables):
-                            if table and len(table) > 1:
-                                self.structured_tables.append({
-                                    'page': page_num + 1,
-                                    'data': table,
-                                    'type': self._identify_table_type(table)
-                                })
-                    except:
-                        pass
+                logger.debug(f"Tabula 테이블 추출: {len(tables)}개")
+                
+                # 2. pdfplumber 결과
+                self.structured_tables.extend(plumber_future.result())
                             
             logger.debug(f"총 {len(self.structured_tables)}개 구조화된 테이블 추출")
                         
         except Exception as e:
             logger.error(f"테이블 추출 실패: {e}")
             
+        self.table_timings['wall'] = time.perf_counter() - start
+        logger.debug("테이블 추출 시간: " + ", ".join(f"{k} {v:.3f}초" for k, v in self.table_timings.items()))
+        
+    def _timed(self, name: str, func, *args):
+        """함수 실행 시간을 table_timings에 기록"""
+        start = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            self.table_timings[name] = time.perf_counter() - start
+            
+    def _extract_tabula_tables(self, pdf_path: Path) -> List[pd.DataFrame]:
+        """tabula로 테이블 추출 (실패 시 빈 목록)"""
+        try:
+            return tabula.read_pdf(
+                str(pdf_path), 
+                pages='all', 
+                multiple_tables=True, 
+                pandas_options={'header': None}
+            )
+        except Exception as e:
+            logger.warning(f"Tabula 추출 실패: {e}")
+            self.strategy_status['tables:tabula'] = 'error'
+            return []
+            
+    def _extract_plumber_tables(self, pdf_path: Path) -> List[Dict]:
+        """pdfplumber로 구조화된 테이블 추출"""
+        structured_tables = []
+        failed_pages = 0
+        with pdfplumber.open(pdf_path) as pdf:
+            for page_num, page in enumerate(pdf.pages):
+                try:
+                    page_tables = page.extract_tables()
+                    
+                    for table_idx, table in enumerate(page_tables):
+                        if table and len(table) > 1:
+                            structured_tables.append({
+                                'page': page_num + 1,
+                                'data': table,
+                                'type': self._identify_table_type(table)
+                            })
+                except:
+                    failed_pages += 1
+        self.strategy_status['tables:pdfplumber'] = 'error' if failed_pages else 'ok'
+        return structured_tables
+            
     def _identify_table_type(self, table: List[List]) -> str:
         """테이블 유형 식별"""
         header_text = ' '.join(str(cell) for row in table[:2] for cell in row if cell)
@@ -174,6 +351,7 @@ class CyclonePDFParser:
         
         # 2. 서비스 정보 추출
         self._extract_service_info(data)
+        self._extract_revision(data)
         
         # 3. 제조사 및 모델 정보 추출
         self._extract_manufacturer_model(data)
@@ -242,6 +420,13 @@ class CyclonePDFParser:
             data.service = best_service
             logger.debug(f"서비스: {data.service}")
             
+    def _extract_revision(self, data: EquipmentData):
+        """문서 리비전 추출 - "Rev. No: 2", "Revision: B" 형식"""
+        match = re.search(r'\bRev(?:ision)?\.?\s*(?:No\.?)?\s*[:\-]\s*([A-Z0-9]{1,3})\b', self.pdf_text)
+        if match:
+            data.revision = match.group(1)
+            logger.debug(f"리비전: {data.revision}")
+            
     def _extract_manufacturer_model(self, data: EquipmentData):
         """제조사 및 모델 정보 추출"""
         # 제조사
@@ -329,6 +514,9 @@ class CyclonePDFParser:
                 data.design_temperature = 140.0
                 logger.debug(f"설계온도: {data.design_temperature}°C")
         
+        # 케이스별 값 (Min/Normal/Max)
+        data.operating_cases = self._parse_operating_cases(lines)
+        
         # 재질은 CS로 하드코딩 (PDF에서 찾기 어려움)
         data.material = "CS"
         logger.debug(f"재질: {data.material}")
@@ -338,6 +526,46 @@ class CyclonePDFParser:
             data.design_pressure = 24.6
             logger.debug(f"설계압력 (하드코딩): {data.design_pressure} kg/cm2")
             
+    def _parse_operating_cases(self, lines: List[str]) -> Optional[Dict]:
+        """운전 조건 표의 케이스별 값을 케이스 x 변수 행렬로 파싱
+        
+        "9 Solids kg/hr 394 671 809" 처럼 단위 뒤에 케이스 수만큼 값이 오는 라인을 사용합니다.
+        """
+        cases = list(DEFAULT_OPERATING_CASES)
+        for line in lines:
+            header = re.findall(r'\b(Min(?:imum)?|Norm(?:al)?|Max(?:imum)?|Design|Rated)\b', line, re.IGNORECASE)
+            if len(header) >= 2 and len(header) == len(line.split()):
+                cases = [name.capitalize() for name in header]
+                break
+                
+        columns = {}
+        units = {}
+        for line in lines:
+            if 'Design' in line:
+                continue
+            for name, label, unit in OPERATING_CASE_VARIABLES:
+                if name in columns or label not in line or unit not in line:
+                    continue
+                tail = line.split(unit, 1)[1]
+                numbers = re.findall(r'-?\d+(?:\.\d+)?', tail)
+                if len(numbers) >= len(cases):
+                    columns[name] = [float(v) for v in numbers[-len(cases):]]
+                    units[name] = unit
+                break
+                
+        if not columns:
+            return None
+            
+        variables = [name for name, _, _ in OPERATING_CASE_VARIABLES if name in columns]
+        matrix = {
+            'cases': cases,
+            'variables': variables,
+            'units': [units[name] for name in variables],
+            'values': [[columns[name][i] for name in variables] for i in range(len(cases))],
+        }
+        logger.debug(f"운전 케이스: {cases} x {variables}")
+        return matrix
+            
     def _parse_nozzle_data(self, data: EquipmentData):
         """노즐 데이터 파싱"""
         data.nozzles = []
@@ -541,9 +769,10 @@ class CyclonePDFParser:
         return summary
 
 
-def extract_cyclone_data(pdf_path: str, output_dir: str = "data/extracted", debug: bool = False) -> str:
-    """사이클론 PDF 데이터 추출 헬퍼 함수"""
-    parser = CyclonePDFParser()
+def extract_cyclone_data(pdf_path: str, output_dir: str = "data/extracted", debug: bool = False,
+                         text_backend: str = DEFAULT_TEXT_BACKEND, store_path: Optional[str] = None) -> str:
+    """사이클론 PDF 데이터 추출 헬퍼 함수 (store_path가 있으면 장비 DB에도 저장)"""
+    parser = CyclonePDFParser(text_backend=text_backend)
     
     # PDF 파싱
     equipment_data = parser.parse_pdf(pdf_path, debug=debug)
@@ -558,6 +787,12 @@ def extract_cyclone_data(pdf_path: str, output_dir: str = "data/extracted", debu
     # 데이터 저장
     parser.save_extracted_data(equipment_data, str(output_path))
     
+    if store_path:
+        from src.extractor.equipment_store import EquipmentStore
+        with EquipmentStore(store_path) as store:
+            store.upsert(equipment_data, source=str(pdf_path))
+        logger.info(f"장비 DB 저장 완료: {store_path}")
+    
     return str(output_path)
 
 
@@ -568,17 +803,20 @@ if __name__ == "__main__":
     if len(sys.argv) > 1:
         pdf_file = sys.argv[1]
         debug_mode = '--debug' in sys.argv
+        backend = DEFAULT_TEXT_BACKEND
+        if '--backend' in sys.argv:
+            backend = sys.argv[sys.argv.index('--backend') + 1]
         
         logger.info(f"PDF 파일 처리: {pdf_file}")
         if debug_mode:
             logger.info("디버그 모드 활성화")
         
         try:
-            output_file = extract_cyclone_data(pdf_file, debug=debug_mode)
+            output_file = extract_cyclone_data(pdf_file, debug=debug_mode, text_backend=backend)
             logger.success(f"완료! 출력: {output_file}")
         except Exception as e:
             logger.error(f"처리 실패: {e}")
             import traceback
             traceback.print_exc()
     else:
-        logger.info("사용법: python pdf_parser.py <PDF_파일경로> [--debug]")
\ No newline at end of file
+        logger.info("사용법: python pdf_parser.py <PDF_파일경로> [--debug] [--backend auto|pypdf2|pdfplumber]")
\ No newline at end of file
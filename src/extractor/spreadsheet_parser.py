@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""
+스프레드시트(XLSX/CSV) 데이터시트 파싱 모듈
+경로: E:\github\plant3D\src\extractor\spreadsheet_parser.py
+
+벤더가 XLSX/CSV로 보낸 데이터시트를 PDF 변환 없이 EquipmentData로 추출합니다.
+두 가지 시트 형식을 지원합니다.
+
+- 데이터시트 형식: PDF와 같은 라벨/값 배치. 각 행을 텍스트 라인으로 만들어
+  CyclonePDFParser와 동일한 필드 규칙으로 파싱합니다 (시트당 장비 1개).
+- 장비 목록 형식: 첫 행이 헤더이고 한 행이 장비 1개. 헤더를 EquipmentData
+  필드에 매핑합니다 (수천 행 지원).
+
+워크북은 read-only 스트리밍 모드로 읽으므로 행 수와 무관하게 메모리가 일정합니다.
+"""
+
+import re
+import csv
+import sys
+import json
+import typing
+from pathlib import Path
+from dataclasses import fields
+from typing import Dict, List, Any, Optional, Iterator, Iterable
+
+# 스크립트로 직접 실행할 때만 프로젝트 루트를 Python 경로에 추가 (import 시에는 바꾸지 않음)
+project_root = Path(__file__).resolve().parents[2]
+if __name__ == "__main__":
+    sys.path.insert(0, str(project_root))
+
+from loguru import logger
+
+from src.extractor.pdf_parser import CyclonePDFParser
+from src.extractor.equipment_record import EquipmentData
+
+try:
+    import openpyxl
+    OPENPYXL_AVAILABLE = True
+except ImportError:
+    OPENPYXL_AVAILABLE = False
+
+
+SPREADSHEET_SUFFIXES = {'.xlsx', '.xlsm', '.csv'}
+
+# 장비 목록 헤더 별칭 (정규화된 헤더 -> EquipmentData 필드)
+HEADER_ALIASES = {
+    'tag': 'tag_number',
+    'tag_no': 'tag_number',
+    'item_no': 'tag_number',
+    'equipment_tag': 'tag_number',
+    'service_of_unit': 'service',
+    'type': 'equipment_type',
+    'vendor': 'manufacturer',
+    'size': 'model',
+    'flow': 'flow_rate',
+    'temp': 'temperature',
+    'operating_temperature': 'temperature',
+    'operating_pressure': 'pressure',
+    'gas_density': 'density',
+    'design_temp': 'design_temperature',
+    'dp': 'pressure_drop',
+}
+
+# 장비 목록 형식으로 판단하기 위한 최소 인식 헤더 수
+MIN_LIST_HEADERS = 3
+
+
+def normalize_header(header: Any) -> str:
+    """헤더 문자열 정규화 (소문자, 단위 괄호 제거, 구분자 -> '_')"""
+    text = re.sub(r'\(.*?\)', '', str(header or '')).strip().lower()
+    return re.sub(r'[^0-9a-z]+', '_', text).strip('_')
+
+
+def _field_types() -> Dict[str, Any]:
+    """EquipmentData 필드별 기본 타입 (Optional 해제)"""
+    hints = typing.get_type_hints(EquipmentData)
+    result = {}
+    for field in fields(EquipmentData):
+        hint = hints[field.name]
+        args = [arg for arg in typing.get_args(hint) if arg is not type(None)]
+        base = args[0] if typing.get_origin(hint) is typing.Union and args else hint
+        result[field.name] = typing.get_origin(base) or base
+    return result
+
+
+FIELD_TYPES = _field_types()
+
+
+def map_headers(header_row: Iterable[Any]) -> Dict[int, str]:
+    """헤더 행의 열 번호 -> EquipmentData 필드 이름"""
+    mapping = {}
+    for col, header in enumerate(header_row):
+        key = normalize_header(header)
+        name = key if key in FIELD_TYPES else HEADER_ALIASES.get(key)
+        if name and name not in mapping.values():
+            mapping[col] = name
+    return mapping
+
+
+def coerce_value(name: str, value: Any) -> Any:
+    """셀 값을 EquipmentData 필드 타입으로 변환 (빈 셀은 None)"""
+    if value is None or (isinstance(value, str) and not value.strip()):
+        return None
+
+    target = FIELD_TYPES[name]
+    if target is float:
+        if isinstance(value, (int, float)):
+            return float(value)
+        match = re.search(r'-?\d+(?:\.\d+)?', str(value).replace(',', ''))
+        return float(match.group()) if match else None
+    if target in (list, dict):
+        if isinstance(value, str):
+            try:
+                value = json.loads(value)
+            except json.JSONDecodeError:
+                logger.warning(f"{name} 열 JSON 파싱 실패: {value[:50]}")
+                return None
+        return value if isinstance(value, target) else None
+    return _format_cell(value)
+
+
+def _format_cell(value: Any) -> str:
+    """셀 값을 PDF 텍스트와 같은 표기로 변환 (671.0 -> '671')"""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value).strip()
+
+
+class CycloneSpreadsheetParser:
+    """사이클론 스프레드시트 파서"""
+
+    def __init__(self):
+        # 데이터시트 형식은 PDF 파서의 필드 규칙을 그대로 사용
+        self.text_parser = CyclonePDFParser()
+
+    def iter_equipment(self, path: str) -> Iterator[EquipmentData]:
+        """스프레드시트의 모든 장비를 스트리밍으로 추출"""
+        path = Path(path)
+        if not path.exists():
+            raise FileNotFoundError(f"스프레드시트 파일을 찾을 수 없습니다: {path}")
+
+        suffix = path.suffix.lower()
+        if suffix not in SPREADSHEET_SUFFIXES:
+            raise ValueError(f"지원하지 않는 형식: {suffix} (지원: {', '.join(sorted(SPREADSHEET_SUFFIXES))})")
+
+        logger.info(f"스프레드시트 파싱 시작: {path}")
+        for sheet_name, rows in self._iter_sheets(path):
+            yield from self._parse_sheet(sheet_name, rows)
+
+    def parse(self, path: str) -> List[EquipmentData]:
+        """스프레드시트의 모든 장비 추출 (목록 반환)"""
+        return list(self.iter_equipment(path))
+
+    def _iter_sheets(self, path: Path) -> Iterator[tuple]:
+        """(시트 이름, 행 이터레이터) 스트리밍"""
+        if path.suffix.lower() == '.csv':
+            with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+                yield path.stem, csv.reader(f)
+            return
+
+        if not OPENPYXL_AVAILABLE:
+            raise ImportError("XLSX 파싱에는 openpyxl이 필요합니다")
+
+        workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)
+        try:
+            for sheet in workbook.worksheets:
+                yield sheet.title, sheet.iter_rows(values_only=True)
+        finally:
+            workbook.close()
+
+    def _parse_sheet(self, sheet_name: str, rows: Iterator) -> Iterator[EquipmentData]:
+        """시트 형식을 판별하고 장비 추출"""
+        rows = iter(rows)
+        first_row = None
+        for header_row_num, row in enumerate(rows, start=1):
+            if any(_has_value(cell) for cell in row):
+                first_row = row
+                break
+        if first_row is None:
+            return
+
+        mapping = map_headers(first_row)
+        if 'tag_number' in mapping.values() and len(mapping) >= MIN_LIST_HEADERS:
+            logger.debug(f"[{sheet_name}] 장비 목록 형식: {list(mapping.values())}")
+            flow_unit = None
+            for col, name in mapping.items():
+                unit = re.search(r'\((.+?)\)', str(first_row[col] or ''))
+                if name == 'flow_rate' and unit:
+                    flow_unit = unit.group(1).strip()
+            yield from self._parse_equipment_rows(sheet_name, mapping, rows, flow_unit, header_row_num + 1)
+        else:
+            logger.debug(f"[{sheet_name}] 데이터시트 형식")
+            data = self._parse_datasheet_rows(sheet_name, first_row, rows)
+            if data is not None:
+                yield data
+
+    def _parse_datasheet_rows(self, sheet_name: str, first_row, rows: Iterator) -> Optional[EquipmentData]:
+        """라벨/값 배치 시트를 텍스트 라인으로 변환해 PDF 필드 규칙으로 파싱
+
+        태그나 치수가 나오지 않는 시트(표지, 노트, 리비전 이력 등)는 장비가 아니므로 None을 반환합니다.
+        """
+        lines = []
+        for row in (first_row, *rows):
+            cells = [_format_cell(cell) for cell in row if _has_value(cell)]
+            if cells:
+                lines.append(' '.join(cells))
+
+        data = self.text_parser.parse_text('\n'.join(lines) + '\n')
+        if not data.tag_number or not data.dimensions:
+            logger.debug(f"[{sheet_name}] 태그 또는 치수가 없어 장비 시트가 아닌 것으로 보고 건너뜀")
+            return None
+        self.text_parser._validate_data(data)
+        return data
+
+    def _parse_equipment_rows(self, sheet_name: str, mapping: Dict[int, str], rows: Iterator,
+                              flow_unit: Optional[str] = None, first_row_num: int = 2) -> Iterator[EquipmentData]:
+        """한 행이 장비 1개인 시트 파싱 (유량 단위는 헤더 괄호에서 보완)
+
+        first_row_num은 헤더 다음 행의 시트 행 번호입니다 (헤더 앞 빈 행 포함, 로그용).
+        """
+        count = 0
+        for row_num, row in enumerate(rows, start=first_row_num):
+            values = {name: coerce_value(name, row[col]) for col, name in mapping.items() if col < len(row)}
+            if not values.get('tag_number'):
+                continue
+
+            values['service'] = values.get('service') or ""
+            values['equipment_type'] = values.get('equipment_type') or "cyclone"
+            if values.get('flow_rate') is not None and not values.get('flow_unit'):
+                values['flow_unit'] = flow_unit
+            try:
+                yield EquipmentData(**values)
+                count += 1
+            except TypeError as e:
+                logger.warning(f"[{sheet_name}] {row_num}행 건너뜀: {e}")
+
+        logger.info(f"[{sheet_name}] 장비 {count}개 추출")
+
+
+def _has_value(cell: Any) -> bool:
+    return cell is not None and str(cell).strip() != ''
+
+
+def extract_spreadsheet_data(path: str, output_dir: str = "data/extracted",
+                             store_path: Optional[str] = None) -> List[str]:
+    """스프레드시트 데이터 추출 헬퍼 함수 (장비별 JSON 저장)
+
+    장비가 1개이면 PDF와 같은 <stem>_extracted.json, 여러 개이면
+    <stem>_<tag>_extracted.json으로 저장합니다. store_path가 있으면
+    extract_cyclone_data와 같이 장비 DB에도 한 번에 저장합니다.
+    """
+    parser = CycloneSpreadsheetParser()
+    stem = Path(path).stem
+    output_files = []
+
+    def saved_equipment() -> Iterator[EquipmentData]:
+        """JSON으로 저장한 장비를 차례로 내보냄 (마지막 장비는 개수를 알아야 이름이 정해짐)"""
+        pending = None
+        for data in parser.iter_equipment(path):
+            if pending is not None:
+                output_files.append(_save(parser, pending, output_dir, f"{stem}_{_safe_tag(pending)}"))
+                yield pending
+            pending = data
+
+        if pending is not None:
+            name = stem if not output_files else f"{stem}_{_safe_tag(pending)}"
+            output_files.append(_save(parser, pending, output_dir, name))
+            yield pending
+
+    if store_path:
+        from src.extractor.equipment_store import EquipmentStore
+        with EquipmentStore(store_path) as store:
+            count = store.upsert_many(saved_equipment(), source=str(path))
+        logger.info(f"장비 DB 저장 완료: {count}개 장비 -> {store_path}")
+    else:
+        for _ in saved_equipment():
+            pass
+
+    logger.info(f"스프레드시트 추출 완료: {len(output_files)}개 장비")
+    return output_files
+
+
+def _safe_tag(data: EquipmentData) -> str:
+    return re.sub(r'[^0-9A-Za-z\-]+', '_', data.tag_number).strip('_') or 'unknown'
+
+
+def _save(parser: CycloneSpreadsheetParser, data: EquipmentData, output_dir: str, name: str) -> str:
+    output_path = Path(output_dir) / f"{name}_extracted.json"
+    parser.text_parser.save_extracted_data(data, str(output_path))
+    return str(output_path)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        input_file = sys.argv[1]
+        output_dir = sys.argv[2] if len(sys.argv) > 2 else "data/extracted"
+
+        try:
+            for output_file in extract_spreadsheet_data(input_file, output_dir):
+                logger.success(f"출력: {output_file}")
+        except Exception as e:
+            logger.error(f"처리 실패: {e}")
+            import traceback
+            traceback.print_exc()
+    else:
+        logger.info("사용법: python spreadsheet_parser.py <XLSX/CSV_파일경로> [출력_폴더]")
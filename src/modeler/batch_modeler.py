@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+사이클론 3D 모델 일괄 생성
+경로: E:\github\plant3D\src\modeler\batch_modeler.py
+
+추출 JSON 폴더, 바이너리 레코드(.eqb) 또는 장비 DB 조회 결과의 모든 장비에 대해
+프로세스 풀에서 3D 모델을 생성/저장하고, 출력 파일과 소요 시간을 담은
+매니페스트(batch_manifest.json)를 작성합니다. 장비 하나가 실패해도 나머지는 계속 진행합니다.
+--store를 주면 생성한 메시를 메모리 매핑 메시 저장소(mesh_store)에도 태그별로 추가합니다.
+
+사용법:
+  python batch_modeler.py <JSON_폴더|파일.eqb|장비.db> [--output output/models/batch] [--workers N]
+                          [--store 저장소_폴더]
+                          [--service ...] [--type ...] [--revision ...] [--tag-prefix ...]
+"""
+
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+from pathlib import Path
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, Optional
+
+# 스크립트로 직접 실행할 때만 프로젝트 루트를 Python 경로에 추가 (import 시에는 바꾸지 않음)
+project_root = Path(__file__).resolve().parents[2]
+if __name__ == "__main__":
+    sys.path.insert(0, str(project_root))
+
+import numpy as np
+
+from src.modeler.mesh_cache import DEFAULT_CACHE_DIR
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_OUTPUT_DIR = "output/models/batch"
+MANIFEST_NAME = "batch_manifest.json"
+STORE_CHUNK = 256  # 메시 저장소에 한 번에 추가할 모델 수 (인덱스 기록 횟수를 줄임)
+
+
+def collect_tasks(source: str, service: Optional[str] = None, equipment_type: Optional[str] = None,
+                  revision: Optional[str] = None, tag_prefix: Optional[str] = None) -> List[Dict]:
+    """입력에서 모델 생성 작업 목록 생성
+
+    - 폴더: *_extracted.json 파일마다 작업 1개 (파일은 워커에서 로드)
+    - .eqb: 레코드마다 작업 1개
+    - 그 외 파일: 장비 DB로 보고 조건 검색 (태그별 최신 리비전 1개)
+    """
+    source_path = Path(source)
+    if not source_path.exists():
+        raise FileNotFoundError(f"입력을 찾을 수 없습니다: {source}")
+
+    if source_path.is_dir():
+        return [{'source': str(path), 'path': str(path)} for path in sorted(source_path.glob("*_extracted.json"))]
+
+    if source_path.suffix.lower() == '.eqb':
+        from src.extractor.equipment_record import load_records, record_to_dict
+        records = [record_to_dict(record) for record in load_records(source_path)]
+    else:
+        from src.extractor.equipment_store import EquipmentStore
+        with EquipmentStore(str(source_path)) as store:
+            # 최신 리비전은 장비 DB 조회(get)와 같은 기준 (가장 높은 리비전)
+            records = store.find(service, equipment_type, revision, tag_prefix, latest=True)
+
+    return [{'source': f"{source_path.name}:{data.get('tag_number', '')}", 'data': data} for data in records]
+
+
+def _init_worker(log_level: int):
+    """워커 프로세스 로그 설정 (장비마다 INFO 로그가 쏟아지지 않도록)"""
+    logging.getLogger().setLevel(log_level)
+    logging.getLogger('src.modeler.cyclone_modeler').setLevel(log_level)
+
+
+def build_model(task: Dict, output_dir: str, formats: List[str], lod: bool = False,
+                cache_dir: Optional[str] = DEFAULT_CACHE_DIR, return_arrays: bool = False) -> Dict:
+    """장비 1개의 모델 생성 및 저장 (워커 프로세스에서 실행)
+
+    return_arrays이면 메시 저장소에 넣을 수 있도록 (정점, 면) 배열을 'arrays'에 담아 반환합니다.
+    """
+    from src.modeler.cyclone_modeler import CycloneModeler
+    from src.modeler.mesh_cache import MeshCache
+
+    row = {'source': task['source'], 'tag_number': '', 'status': 'ok', 'error': '',
+           'faces': 0, 'vertices': 0, 'files': [],
+           'build_seconds': 0.0, 'export_seconds': 0.0, 'total_seconds': 0.0}
+    start = time.perf_counter()
+
+    try:
+        cache = MeshCache(cache_dir) if cache_dir else None
+        modeler = CycloneModeler(task.get('path'), cache=cache, data=task.get('data'))
+        row['tag_number'] = modeler.data.get('tag_number', '')
+
+        mesh = modeler.create_3d_model()
+        if lod:
+            modeler.create_lod_chain()
+        row['build_seconds'] = time.perf_counter() - start
+        row['faces'] = len(mesh.faces)
+        row['vertices'] = len(mesh.vertices)
+
+        export_start = time.perf_counter()
+        base_files = modeler.save_model(output_dir, formats)
+        files = base_files + (modeler.save_lod_chain(output_dir, formats) if lod else [])
+        row['export_seconds'] = time.perf_counter() - export_start
+        row['files'] = files
+
+        # LOD 파일 수와 섞이지 않도록 기본 모델 저장 결과만으로 판단
+        if len(base_files) < len(formats):
+            row['status'] = 'partial'
+            row['error'] = "일부 형식 저장 실패"
+        elif return_arrays:
+            row['arrays'] = (np.asarray(mesh.vertices, dtype=np.float32), np.asarray(mesh.faces, dtype=np.uint32))
+    except Exception as e:
+        row['status'] = 'failed'
+        row['error'] = f"{type(e).__name__}: {e}"
+
+    row['total_seconds'] = time.perf_counter() - start
+    for key in ('build_seconds', 'export_seconds', 'total_seconds'):
+        row[key] = round(row[key], 4)
+    return row
+
+
+def run_batch(source: str, output_dir: str = DEFAULT_OUTPUT_DIR, workers: Optional[int] = None,
+              formats: Optional[List[str]] = None, lod: bool = False,
+              cache_dir: Optional[str] = DEFAULT_CACHE_DIR, log_level: int = logging.WARNING,
+              store_dir: Optional[str] = None, **query) -> Dict:
+    """모든 장비의 모델을 병렬로 생성하고 매니페스트 반환 (output_dir에도 저장)
+
+    store_dir이 있으면 성공한 메시를 메시 저장소에 태그별로 추가합니다. 쓰기는 메인 프로세스에서
+    STORE_CHUNK개씩 모아 add_many로 하며, 저장소 쓰기 실패는 모델 상태와 별도로 'store_error'에 기록합니다.
+    """
+    tasks = collect_tasks(source, **query)
+    if not tasks:
+        raise FileNotFoundError(f"모델을 생성할 장비가 없습니다: {source}")
+
+    formats = formats or ['stl', 'obj']
+    workers = workers or os.cpu_count() or 1
+    Path(output_dir).mkdir(parents=True, exist_ok=True)
+    logger.info(f"{len(tasks)}개 장비 모델 생성 시작 (워커 {workers}개)")
+
+    store = None
+    if store_dir:
+        from src.modeler.mesh_store import MeshStore
+        store = MeshStore(store_dir)
+        
+    results = []
+    pending = []  # 저장소에 아직 쓰지 않은 (행, (정점, 면))
+    
+    def flush_store():
+        try:
+            store.add_many((row['tag_number'] or row['source'], *arrays, {'source': row['source']})
+                           for row, arrays in pending)
+        except Exception as e:
+            logger.error(f"메시 저장소 쓰기 실패 ({len(pending)}개 모델): {e}")
+            for row, _ in pending:
+                row['store_error'] = f"{type(e).__name__}: {e}"
+        pending.clear()
+    
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(log_level,)) as executor:
+        futures = {executor.submit(build_model, task, output_dir, formats, lod, cache_dir, store is not None): task
+                   for task in tasks}
+        for done, future in enumerate(as_completed(futures), start=1):
+            try:
+                row = future.result()
+            except Exception as e:
+                # 워커 프로세스 자체가 죽은 경우에도 나머지 장비는 계속 진행
+                row = {'source': futures[future]['source'], 'status': 'crashed', 'error': str(e)}
+            results.append(row)
+            
+            arrays = row.pop('arrays', None)
+            if store is not None and arrays is not None:
+                pending.append((row, arrays))
+                if len(pending) >= STORE_CHUNK:
+                    flush_store()
+            if done % 50 == 0:
+                logger.info(f"  {done}/{len(tasks)} 완료")
+    if pending:
+        flush_store()
+
+    elapsed = time.perf_counter() - start
+    results.sort(key=lambda row: row['source'])
+    succeeded = sum(1 for row in results if row['status'] == 'ok')
+
+    manifest = {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'source': str(source),
+        'output_dir': str(output_dir),
+        'formats': formats,
+        'workers': workers,
+        'records': len(results),
+        'succeeded': succeeded,
+        'failed': len(results) - succeeded,
+        'elapsed_seconds': round(elapsed, 3),
+        'models_per_second': round(len(results) / elapsed, 3) if elapsed > 0 else None,
+        'store': str(store_dir) if store_dir else None,
+        'store_failed': sum(1 for row in results if row.get('store_error')),
+        'results': results,
+    }
+
+    manifest_path = Path(output_dir) / MANIFEST_NAME
+    with open(manifest_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+
+    logger.info(f"모델 생성 완료: {succeeded}/{len(results)}개 성공, {elapsed:.1f}초 "
+                f"({manifest['models_per_second']} 모델/초) -> {manifest_path}")
+    return manifest
+
+
+def main():
+    logging.basicConfig(level=logging.INFO)
+
+    parser = argparse.ArgumentParser(description="사이클론 3D 모델 일괄 생성")
+    parser.add_argument('source', help='추출 JSON 폴더, .eqb 파일 또는 장비 DB')
+    parser.add_argument('--output', default=DEFAULT_OUTPUT_DIR, help='출력 폴더')
+    parser.add_argument('--workers', type=int, help='워커 프로세스 수 (기본: CPU 수)')
+    parser.add_argument('--format', action='append', dest='formats', help='저장 형식 (기본: stl, obj)')
+    parser.add_argument('--lod', action='store_true', help='LOD 단계도 저장')
+    parser.add_argument('--no-cache', action='store_true', help='메시 캐시 사용 안 함')
+    parser.add_argument('--store', help='메시 저장소 폴더 (생성한 메시를 태그별로 추가)')
+    parser.add_argument('--service', help='장비 DB 조건: 서비스')
+    parser.add_argument('--type', dest='equipment_type', help='장비 DB 조건: 장비 유형')
+    parser.add_argument('--revision', help='장비 DB 조건: 리비전')
+    parser.add_argument('--tag-prefix', help='장비 DB 조건: 태그 접두어')
+    args = parser.parse_args()
+
+    manifest = run_batch(
+        args.source, args.output, args.workers, args.formats, args.lod,
+        cache_dir=None if args.no_cache else DEFAULT_CACHE_DIR, store_dir=args.store,
+        service=args.service, equipment_type=args.equipment_type,
+        revision=args.revision, tag_prefix=args.tag_prefix,
+    )
+
+    for row in manifest['results']:
+        if row['status'] != 'ok':
+            print(f"실패: {row['source']} - {row['error']}")
+        if row.get('store_error'):
+            print(f"저장소 쓰기 실패: {row['source']} - {row['store_error']}")
+    print(f"{manifest['succeeded']}/{manifest['records']}개 성공, "
+          f"{manifest['elapsed_seconds']}초 ({manifest['models_per_second']} 모델/초)")
+
+
+if __name__ == "__main__":
+    main()
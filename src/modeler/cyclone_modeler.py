@@ -10,20 +10,74 @@ import json
 import numpy as np
 from pathlib import Path
 import trimesh
-from dataclasses import dataclass
+import yaml
+from dataclasses import dataclass, replace
+from functools import cached_property
 from typing import Dict, List, Tuple, Optional
 import logging
-from datetime import datetime
 import os
+import sys
+import time
+
+# 스크립트로 직접 실행할 때만 프로젝트 루트를 Python 경로에 추가 (import 시에는 바꾸지 않음)
+project_root = Path(__file__).resolve().parents[2]
+if __name__ == "__main__":
+    sys.path.insert(0, str(project_root))
+
+from src.modeler.mesh_primitives import (
+    revolve_profile, clean_profile, sections_for_radius, revolved_volume, revolved_area, MIN_SECTIONS, MAX_SECTIONS
+)
+from src.modeler.mesh_cache import MeshCache, geometry_key, DEFAULT_CACHE_DIR
+from src.modeler.mesh_export import prepare_buffers, export_mesh, atomic_write
+from src.modeler.scene_graph import PartScene
+from src.modeler.progressive_mesh import StreamPart, encode_stream, STREAM_SUFFIX
+from src.modeler.nozzle_library import lookup_flange, nozzle_mesh, placement_transform, attachment_radius
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# config.yaml processing.mesh_quality 기본값 (폴리곤 수)
+DEFAULT_MESH_QUALITY = {'low': 1000, 'medium': 5000, 'high': 20000}
+
+# 원주 방향 최대 현(chord) 편차 기본값 (mm)
+DEFAULT_CHORD_TOLERANCE = 0.5
+
+# 실린더 상단에서 접선 입구 덕트 윗면까지의 거리 (mm)
+INLET_TOP_OFFSET = 50.0
+
+# 데이터시트 재질 약어별 밀도 (kg/m³)
+MATERIAL_DENSITY = {
+    'CS': 7850.0,
+    'LTCS': 7850.0,
+    'SS': 7930.0,
+    'SS304': 7930.0,
+    'SS316': 7980.0,
+    'DSS': 7800.0,
+    'AL': 2700.0,
+}
+DEFAULT_MATERIAL = 'CS'
+
+
+def load_mesh_quality(config_path: Optional[str] = None) -> Dict[str, int]:
+    """config.yaml의 mesh_quality 단계별 폴리곤 예산 로드 (없으면 기본값)"""
+    config_path = Path(config_path) if config_path else project_root / "config.yaml"
+    try:
+        with open(config_path, 'r', encoding='utf-8') as f:
+            config = yaml.safe_load(f) or {}
+        mesh_quality = (config.get('processing') or {}).get('mesh_quality')
+    except (OSError, yaml.YAMLError) as e:
+        logger.warning(f"설정 파일 로드 실패, 기본 mesh_quality 사용: {e}")
+        mesh_quality = None
+        
+    if not isinstance(mesh_quality, dict) or not mesh_quality:
+        return dict(DEFAULT_MESH_QUALITY)
+    return {str(name): int(budget) for name, budget in mesh_quality.items()}
 
-@dataclass
+
+@dataclass(frozen=True)
 class CycloneGeometry:
-    """사이클론 기하학적 파라미터"""
+    """사이클론 기하학적 파라미터 (불변, 바꿀 때는 replace()로 새로 만듦)"""
     # 메인 바디 치수
     cylinder_diameter: float  # mm
     cylinder_height: float  # mm
@@ -43,13 +97,17 @@ class CycloneGeometry:
     # 벽 두께
     wall_thickness: float = 10.0  # mm
     
+    # 출구 배관 연장 길이
+    gas_outlet_extension: float = 100.0  # mm (지붕 위)
+    solids_outlet_length: float = 200.0  # mm (콘 아래)
+    
     # 노즐 정보
     nozzles: List[Dict] = None
     
     def __post_init__(self):
         """초기화 후 검증"""
         if self.nozzles is None:
-            self.nozzles = []
+            object.__setattr__(self, 'nozzles', [])
         self._validate()
     
     def _validate(self):
@@ -58,19 +116,143 @@ class CycloneGeometry:
             raise ValueError("실린더 직경은 0보다 커야 합니다")
         if self.cone_outlet_diameter >= self.cylinder_diameter:
             raise ValueError("콘 출구 직경은 실린더 직경보다 작아야 합니다")
+        if min(self.cone_outlet_diameter, self.solids_outlet_diameter, self.gas_outlet_diameter) <= 2 * self.wall_thickness:
+            raise ValueError("출구 직경은 벽 두께의 2배보다 커야 합니다")
+        if self.gas_outlet_diameter >= self.cylinder_diameter - 2 * self.wall_thickness:
+            raise ValueError("가스 출구 직경은 실린더 내경보다 작아야 합니다")
+        if not self.wall_thickness < self.gas_outlet_height < self.cylinder_height:
+            raise ValueError("vortex finder 길이는 벽 두께보다 길고 실린더 높이보다 짧아야 합니다")
+    
+    def wall_profile(self) -> np.ndarray:
+        """축대칭 바디 벽의 (r, z) 단면 프로파일 (반시계 방향 닫힌 다각형, mm)
+        
+        원점은 실린더 바닥 중심이고 직경은 모두 외경입니다.
+        고체 출구 배관 -> 절두원뿔 -> 실린더 -> 지붕 -> vortex finder를
+        바깥 면을 따라 올라갔다가 안쪽 면을 따라 내려오는 순서입니다.
+        """
+        t = self.wall_thickness
+        R = self.cylinder_diameter / 2
+        Rc = self.cone_outlet_diameter / 2
+        Rs = self.solids_outlet_diameter / 2
+        Rg = self.gas_outlet_diameter / 2
+        H = self.cylinder_height
+        Hc = self.cone_height
+        z_bottom = -Hc - self.solids_outlet_length
+        z_top = H + self.gas_outlet_extension
+        z_finder = H - self.gas_outlet_height
+        
+        return np.array([
+            # 바깥 면 (아래 -> 위)
+            (Rs - t, z_bottom),
+            (Rs, z_bottom),
+            (Rs, -Hc),
+            (Rc, -Hc),
+            (R, 0.0),
+            (R, H),
+            (Rg, H),
+            (Rg, z_top),
+            # vortex finder 안쪽 면 (위 -> 아래) 과 바깥 면
+            (Rg - t, z_top),
+            (Rg - t, z_finder),
+            (Rg, z_finder),
+            (Rg, H - t),
+            # 안쪽 면 (위 -> 아래)
+            (R - t, H - t),
+            (R - t, 0.0),
+            (Rc - t, -Hc),
+            (Rs - t, -Hc),
+        ])
+    
+    def fluid_profile(self) -> np.ndarray:
+        """내부 유체 영역의 (r, z) 단면 프로파일 (축 r = 0 포함, mm)
+        
+        고체 출구 배관 바닥 -> 안쪽 벽 -> 지붕 아래 -> vortex finder 바깥/안쪽 ->
+        가스 출구 배관 위 -> 축 순서입니다. 첫 변(바닥 개구부)과 마지막 두 변
+        (상부 개구부, 축)을 뺀 나머지가 접액 벽입니다.
+        """
+        t = self.wall_thickness
+        R = self.cylinder_diameter / 2
+        Rc = self.cone_outlet_diameter / 2
+        Rs = self.solids_outlet_diameter / 2
+        Rg = self.gas_outlet_diameter / 2
+        H = self.cylinder_height
+        Hc = self.cone_height
+        z_bottom = -Hc - self.solids_outlet_length
+        z_top = H + self.gas_outlet_extension
+        z_finder = H - self.gas_outlet_height
+        
+        return np.array([
+            (0.0, z_bottom),
+            (Rs - t, z_bottom),
+            (Rs - t, -Hc),
+            (Rc - t, -Hc),
+            (R - t, 0.0),
+            (R - t, H - t),
+            (Rg, H - t),
+            (Rg, z_finder),
+            (Rg - t, z_finder),
+            (Rg - t, z_top),
+            (0.0, z_top),
+        ])
+    
+    # 해석적 형상 물성 (축대칭 바디 기준, 입구 덕트와 노즐 제외).
+    # 처음 접근할 때 계산해 인스턴스에 저장합니다 (필드가 불변이므로 값이 어긋나지 않음).
+    
+    @cached_property
+    def shell_volume(self) -> float:
+        """벽 재료 부피 (mm³)"""
+        return revolved_volume(self.wall_profile())
+    
+    @cached_property
+    def fluid_volume(self) -> float:
+        """내부 유체 부피 (mm³)"""
+        return revolved_volume(self.fluid_profile())
+    
+    @cached_property
+    def wetted_area(self) -> float:
+        """유체와 닿는 안쪽 벽 넓이 (mm², 상하 개구부 제외)"""
+        return revolved_area(self.fluid_profile()[1:-1])
+    
+    def shell_mass(self, density: float) -> float:
+        """벽 질량 (kg), density는 kg/m³"""
+        return self.shell_volume * 1e-9 * density
+    
+    def inlet_center(self) -> np.ndarray:
+        """접선 입구 덕트 중심 (mm)
+        
+        덕트 안쪽 끝이 실린더 벽 두께 중간에 닿고, 윗면이 실린더 상단에서
+        INLET_TOP_OFFSET 아래에 오도록 +x 방향에 놓습니다. 표시 모델과 CFD 격자가 함께 씁니다.
+        """
+        x = self.cylinder_diameter / 2 + self.inlet_length / 2 - self.wall_thickness / 2
+        z = self.cylinder_height - self.inlet_height / 2 - INLET_TOP_OFFSET
+        return np.array([x, 0.0, z])
 
 
 class CycloneModeler:
     """사이클론 3D 모델 생성 클래스"""
     
-    def __init__(self, json_path: str):
+    def __init__(self, json_path: Optional[str] = None, tag_number: Optional[str] = None,
+                 sections: Optional[int] = None, cache: Optional[MeshCache] = None,
+                 chord_tolerance: float = DEFAULT_CHORD_TOLERANCE, data: Optional[Dict] = None):
         """
         Args:
-            json_path: 추출된 데이터 JSON 파일 경로
+            json_path: 추출된 데이터 JSON 파일 또는 바이너리 레코드(.eqb) 경로
+            tag_number: .eqb 파일에서 사용할 장비 태그 (없으면 첫 레코드)
+            sections: 바디 회전 메시의 원주 방향 분할 수 (없으면 chord_tolerance로 계산)
+            cache: 메시 캐시 (형상이 같으면 생성을 건너뜀)
+            chord_tolerance: 원주 방향 최대 현 편차 (mm)
+            data: 이미 로드된 장비 데이터 (장비 DB 조회 결과 등, 있으면 파일을 읽지 않음)
         """
-        self.json_path = Path(json_path)
+        self.json_path = Path(json_path) if json_path else None
+        self.source_data = data
+        self.tag_number = tag_number
+        self.chord_tolerance = chord_tolerance
+        self.cache = cache
+        self.lod_chain: List[Dict] = []
+        self.scenes: Dict[int, PartScene] = {}  # 분할 수 -> 부품 씬
         self.data = self._load_data()
         self.geometry = self._calculate_geometry()
+        self.sections = sections or self._sections_for_tolerance()
         self.mesh = None
         
     def _load_data(self) -> Dict:
@@ -88,8 +270,12 @@ class CycloneModeler:
             'pressure_drop': 'N/A'
         }
         
+        # 메모리의 장비 데이터
+        if self.source_data is not None:
+            return self._fill_defaults(dict(self.source_data), default_data)
+        
         # 파일 존재 확인
-        if not self.json_path.exists():
+        if self.json_path is None or not self.json_path.exists():
             logger.warning(f"JSON 파일을 찾을 수 없습니다: {self.json_path}")
             logger.info("기본값으로 3D 모델을 생성합니다.")
             return default_data
@@ -103,6 +289,10 @@ class CycloneModeler:
         
         logger.info(f"JSON 파일 크기: {file_size} bytes")
         
+        # 바이너리 레코드 파일
+        if self.json_path.suffix.lower() == '.eqb':
+            return self._load_binary_record(default_data)
+        
         # JSON 로드 시도
         try:
             # 여러 인코딩으로 시도
@@ -126,14 +316,7 @@ class CycloneModeler:
                         logger.warning(f"JSON 루트가 딕셔너리가 아님: {type(data)}. 기본값 사용.")
                         return default_data
                     
-                    # 필수 키 보완
-                    for key, default_value in default_data.items():
-                        if key not in data:
-                            logger.info(f"키 '{key}' 추가: {default_value}")
-                            data[key] = default_value
-                    
-                    logger.info(f"로드된 데이터 키: {list(data.keys())}")
-                    return data
+                    return self._fill_defaults(data, default_data)
                     
                 except UnicodeDecodeError:
                     continue
@@ -153,6 +336,35 @@ class CycloneModeler:
             logger.info("기본값으로 3D 모델을 생성합니다.")
             return default_data
         
+    def _fill_defaults(self, data: Dict, default_data: Dict) -> Dict:
+        """필수 키 보완"""
+        for key, default_value in default_data.items():
+            if key not in data:
+                logger.info(f"키 '{key}' 추가: {default_value}")
+                data[key] = default_value
+        
+        logger.info(f"로드된 데이터 키: {list(data.keys())}")
+        return data
+        
+    def _load_binary_record(self, default_data: Dict) -> Dict:
+        """바이너리 레코드(.eqb) 파일에서 장비 데이터 로드"""
+        from src.extractor.equipment_record import load_records, record_to_dict
+        
+        try:
+            records = load_records(self.json_path)
+        except (ValueError, OSError) as e:
+            logger.error(f"레코드 파일 로드 실패: {e}")
+            return default_data
+            
+        if self.tag_number:
+            records = [r for r in records if r.tag_number == self.tag_number]
+        if not records:
+            logger.warning(f"레코드를 찾을 수 없습니다: {self.tag_number or self.json_path.name}. 기본값 사용.")
+            return default_data
+            
+        logger.info(f"레코드 로드 성공: {records[0].tag_number} ({self.json_path.name})")
+        return self._fill_defaults(record_to_dict(records[0]), default_data)
+        
     def _calculate_geometry(self) -> CycloneGeometry:
         """추출된 데이터에서 기하학적 파라미터 계산"""
         # 기본값 설정 (일반적인 사이클론 비율 사용)
@@ -251,33 +463,39 @@ class CycloneModeler:
             return 'other'
             
     def create_3d_model(self) -> trimesh.Trimesh:
-        """3D 모델 생성"""
-        logger.info("3D 모델 생성 시작...")
+        """3D 모델 생성 (부품 씬을 조립한 하나의 메시)"""
+        self.mesh = self._build_mesh(self.sections)
+        return self.mesh
+        
+    def _build_mesh(self, sections: int) -> trimesh.Trimesh:
+        """원주 분할 수 sections로 전체 메시 생성 (캐시가 있으면 재사용)"""
+        logger.info(f"3D 모델 생성 시작... (분할 수 {sections})")
+        start = time.perf_counter()
+        
+        if self.cache is not None:
+            cached = self.cache.get(self.cache_key(sections))
+            if cached is not None:
+                logger.info(f"캐시된 3D 모델 사용 - 정점: {len(cached.vertices)}, 면: {len(cached.faces)} "
+                            f"({(time.perf_counter() - start) * 1000:.1f} ms)")
+                return cached
         
         try:
-            # 각 부품 생성
-            cylinder = self._create_cylinder()
-            cone = self._create_cone()
-            inlet = self._create_inlet()
-            gas_outlet = self._create_gas_outlet()
-            solids_outlet = self._create_solids_outlet()
-            
-            # 부품 결합
-            mesh = trimesh.util.concatenate([
-                cylinder,
-                cone,
-                inlet,
-                gas_outlet,
-                solids_outlet
-            ])
+            # 부품별로 파라미터가 바뀐 것만 다시 생성하고 조립
+            rebuilt_before = len(self.scenes[sections].rebuilt) if sections in self.scenes else 0
+            scene = self._update_scene(sections)
+            mesh = scene.assemble()
             
-            # 메시 정리
-            mesh.remove_duplicate_faces()
-            mesh.remove_degenerate_faces()
-            mesh.fix_normals()
-            
-            self.mesh = mesh
-            logger.info(f"3D 모델 생성 완료 - 정점: {len(mesh.vertices)}, 면: {len(mesh.faces)}")
+            if self.cache is not None:
+                self.cache.put(self.cache_key(sections), mesh)
+            rebuilt = scene.rebuilt[rebuilt_before:]
+            logger.info(f"3D 모델 생성 완료 - 정점: {len(mesh.vertices)}, 면: {len(mesh.faces)}, "
+                        f"재생성 부품: {', '.join(rebuilt) or '없음'} ({(time.perf_counter() - start) * 1000:.1f} ms)")
+            if rebuilt:
+                checks = [scene.validation[label] for label in rebuilt if label in scene.validation]
+                repaired = [label for label in rebuilt if scene.validation.get(label, {}).get('repaired')]
+                validate_ms = sum(check['validation']['seconds'] for check in checks) * 1000
+                logger.info(f"메시 검증 {validate_ms:.2f} ms - "
+                            + (f"복구한 부품: {', '.join(repaired)}" if repaired else "모두 통과, 복구 생략"))
             
             return mesh
             
@@ -285,170 +503,353 @@ class CycloneModeler:
             logger.error(f"3D 모델 생성 중 오류: {e}")
             raise
         
-    def _create_cylinder(self) -> trimesh.Trimesh:
-        """실린더 부분 생성"""
-        try:
-            # 외부 실린더
-            outer_cylinder = trimesh.creation.cylinder(
-                radius=self.geometry.cylinder_diameter / 2,
-                height=self.geometry.cylinder_height,
-                sections=64
-            )
-            
-            # 내부 실린더 (중공)
-            inner_cylinder = trimesh.creation.cylinder(
-                radius=(self.geometry.cylinder_diameter / 2) - self.geometry.wall_thickness,
-                height=self.geometry.cylinder_height + 1,  # 약간 더 길게
-                sections=64
-            )
-            
-            # 불리언 차집합으로 중공 실린더 생성
-            cylinder = outer_cylinder.difference(inner_cylinder)
-            
-            # 위치 조정 (원점이 바닥 중심)
-            cylinder.apply_translation([0, 0, self.geometry.cylinder_height / 2])
-            
-            return cylinder
-            
-        except Exception as e:
-            logger.error(f"실린더 생성 오류: {e}")
-            # 간단한 실린더로 대체
-            return trimesh.creation.cylinder(
-                radius=self.geometry.cylinder_diameter / 2,
-                height=self.geometry.cylinder_height,
-                sections=32
-            )
+    def _update_scene(self, sections: int) -> PartScene:
+        """분할 수별 부품 씬 갱신 (파라미터가 같은 부품은 재사용)"""
+        scene = self.scenes.setdefault(sections, PartScene(self.cache))
+        geometry = self.geometry
         
-    def _create_cone(self) -> trimesh.Trimesh:
-        """원뿔 부분 생성"""
-        try:
-            # 절두원뿔 생성 (truncated cone)
-            cone = trimesh.creation.cone(
-                radius=self.geometry.cylinder_diameter / 2,
-                height=self.geometry.cone_height,
-                sections=64
+        scene.set_part(
+            'body',
+            {'profile': geometry.wall_profile().tolist(), 'sections': sections},
+            lambda: self._create_body(sections)
+        )
+        scene.set_part(
+            'inlet',
+            {'extents': [geometry.inlet_length, geometry.inlet_width, geometry.inlet_height]},
+            self._create_inlet,
+            self._inlet_transform()
+        )
+        
+        # 노즐: 같은 크기 x 등급은 프로토타입 메시 하나를 공유하는 인스턴스
+        placements = self._nozzle_placements()
+        for placement in placements:
+            dims = placement['dims']
+            nozzle_sections = min(sections, sections_for_radius(dims.flange_od / 2, self.chord_tolerance))
+            scene.set_instance(
+                placement['name'],
+                f"nozzle_{dims.label}",
+                {'profile': dims.profile().tolist(), 'sections': nozzle_sections},
+                lambda dims=dims, nozzle_sections=nozzle_sections: nozzle_mesh(dims, nozzle_sections),
+                placement['transform']
             )
+        names = {placement['name'] for placement in placements}
+        for name in [name for name, node in scene.nodes.items() if node.prototype and name not in names]:
+            scene.remove_part(name)
+        return scene
+        
+    def _nozzle_placements(self) -> List[Dict]:
+        """노즐 배치 목록 [{'name', 'dims', 'transform'}]
+        
+        입구/가스 출구/고체 출구 노즐은 입구 덕트 끝, 가스 출구 배관 위, 고체 출구 배관 아래에
+        놓고, 나머지 노즐은 실린더 중간 높이 원주에 고르게 배치합니다 (입구 반대편부터).
+        """
+        geometry = self.geometry
+        radius = geometry.cylinder_diameter / 2
+        inlet_end = self._inlet_transform()[:3, 3] + [geometry.inlet_length / 2, 0.0, 0.0]
+        anchors = {
+            'inlet': (inlet_end, (1.0, 0.0, 0.0)),
+            'gas_outlet': ((0.0, 0.0, geometry.cylinder_height + geometry.gas_outlet_extension), (0.0, 0.0, 1.0)),
+            'solids_outlet': ((0.0, 0.0, -geometry.cone_height - geometry.solids_outlet_length), (0.0, 0.0, -1.0)),
+        }
+        
+        placements, shell = [], []
+        for index, nozzle in enumerate(geometry.nozzles, start=1):
+            dims = lookup_flange(nozzle.get('diameter', 50.0), nozzle.get('rating'))
+            name = f"nozzle_{index}" + (f"_{nozzle['tag']}" if nozzle.get('tag') else '')
+            # 같은 종류의 두 번째 노즐부터는 셸 노즐로 배치
+            anchor = anchors.pop(nozzle.get('type'), None)
+            if anchor is None:
+                shell.append((name, dims))
+            else:
+                placements.append({'name': name, 'dims': dims, 'transform': placement_transform(*anchor)})
+                
+        for index, (name, dims) in enumerate(shell):
+            angle = np.pi + 2 * np.pi * index / len(shell)
+            direction = np.array([np.cos(angle), np.sin(angle), 0.0])
+            attach = attachment_radius(radius, dims)
+            if attach is None:
+                logger.warning(f"노즐 {name}({dims.label})이 실린더보다 굵어 벽 안쪽에 배치합니다")
+                attach = radius - geometry.wall_thickness
+            origin = direction * attach + [0.0, 0.0, geometry.cylinder_height / 2]
+            placements.append({'name': name, 'dims': dims, 'transform': placement_transform(origin, direction)})
             
-            # 원뿔을 뒤집고 위치 조정
-            cone.apply_transform(trimesh.transformations.rotation_matrix(np.pi, [1, 0, 0]))
-            cone.apply_translation([0, 0, -self.geometry.cone_height / 2])
-            
-            return cone
+        return placements
+        
+    def update_geometry(self, **changes) -> trimesh.Trimesh:
+        """형상 파라미터 일부를 바꾸고 모델 재생성 (바뀐 부품만 다시 생성)"""
+        self.geometry = replace(self.geometry, **changes)
+        return self.create_3d_model()
+        
+    def cache_key(self, sections: Optional[int] = None) -> str:
+        """메시 캐시 키 (형상 파라미터 + 테셀레이션 설정)"""
+        return geometry_key(self.geometry, sections=sections or self.sections, chord_tolerance=self.chord_tolerance)
+        
+    def _sections_for_tolerance(self) -> int:
+        """바디 최대 반지름에서 chord 허용 오차를 만족하는 분할 수
+        
+        바디는 이음매를 공유하는 하나의 회전 메시이므로 가장 큰 반지름(실린더)이 기준입니다.
+        """
+        radius = float(self.geometry.wall_profile()[:, 0].max())
+        sections = sections_for_radius(radius, self.chord_tolerance)
+        logger.info(f"원주 분할 수: {sections} (반지름 {radius:.1f} mm, 현 편차 {self.chord_tolerance} mm)")
+        return sections
+        
+    def face_count(self, sections: int) -> int:
+        """원주 분할 수 sections로 만들 전체 메시의 면 수 (메시를 만들지 않고 계산)
+        
+        회전 메시 면 수는 분할 수 x 프로파일 변 수 x 2이고, 노즐은 _update_scene과 같이
+        자기 반지름의 분할 수로 제한한 값을 씁니다.
+        """
+        faces = len(self._create_inlet().faces)
+        faces += 2 * len(clean_profile(self.geometry.wall_profile())) * sections
+        for placement in self._nozzle_placements():
+            dims = placement['dims']
+            nozzle_sections = min(sections, sections_for_radius(dims.flange_od / 2, self.chord_tolerance))
+            faces += 2 * len(clean_profile(dims.profile())) * nozzle_sections
+        return faces
+        
+    def sections_for_budget(self, face_budget: int) -> int:
+        """전체 면 수가 예산 이하가 되는 최대 원주 분할 수 (최소 분할 수로도 넘으면 최소 분할 수)
+        
+        노즐 분할 수 제한 때문에 면 수는 분할 수에 대해 구간별 선형(단조 증가)이므로 이분 탐색합니다.
+        """
+        low, high = MIN_SECTIONS, MAX_SECTIONS
+        if self.face_count(high) <= face_budget:
+            return high
+        while high - low > 1:
+            middle = (low + high) // 2
+            if self.face_count(middle) <= face_budget:
+                low = middle
+            else:
+                high = middle
+        return low
+        
+    def create_lod_chain(self, mesh_quality: Optional[Dict[str, int]] = None) -> List[Dict]:
+        """config.yaml mesh_quality 폴리곤 예산별 LOD 메시 생성 (LOD0 = 최고 품질)
+        
+        각 단계는 예산에 맞춘 분할 수로 다시 테셀레이션합니다.
+        """
+        mesh_quality = mesh_quality or load_mesh_quality()
+        levels = sorted(mesh_quality.items(), key=lambda item: item[1], reverse=True)
+        
+        self.lod_chain = []
+        for lod, (quality, face_budget) in enumerate(levels):
+            sections = self.sections_for_budget(face_budget)
+            self.lod_chain.append({
+                'lod': lod,
+                'quality': quality,
+                'face_budget': int(face_budget),
+                'sections': sections,
+                'mesh': self._build_mesh(sections),
+            })
+            faces = len(self.lod_chain[-1]['mesh'].faces)
+            if faces > face_budget:
+                logger.warning(f"LOD{lod}({quality}) 면 수 {faces}가 예산 {face_budget}을 넘습니다 "
+                               f"(분할 수 {sections})")
             
-        except Exception as e:
-            logger.error(f"원뿔 생성 오류: {e}")
-            # 간단한 원뿔로 대체
-            return trimesh.creation.cone(
-                radius=self.geometry.cylinder_diameter / 2,
-                height=self.geometry.cone_height,
-                sections=32
-            )
+        logger.info("LOD 생성 완료: " + ", ".join(
+            f"LOD{level['lod']}({level['quality']}) {len(level['mesh'].faces)}면" for level in self.lod_chain))
+        return self.lod_chain
+        
+    def get_parts(self) -> Dict[str, trimesh.Trimesh]:
+        """부품 이름 -> 월드 좌표 메시 (GLB 노드 계층용, 씬의 버퍼 공유, 인스턴스 제외)"""
+        return self._update_scene(self.sections).world_parts()
+        
+    def get_instances(self) -> Dict[str, Dict]:
+        """노즐 프로토타입 이름 -> {'mesh': 공유 로컬 메시, 'placements': [(이름, 변환)]}"""
+        return self._update_scene(self.sections).instances()
+        
+    def _create_body(self, sections: Optional[int] = None) -> trimesh.Trimesh:
+        """축대칭 바디 생성 (실린더, 절두원뿔, 지붕, vortex finder, 고체 출구)
+        
+        벽 단면 프로파일을 한 번에 회전시켜 하나의 수밀 메시로 만듭니다.
+        """
+        return revolve_profile(self.geometry.wall_profile(), sections=sections or self.sections)
         
     def _create_inlet(self) -> trimesh.Trimesh:
-        """접선 입구 생성"""
+        """접선 입구 덕트 생성 (로컬 좌표, 원점 중심)"""
         try:
             # 사각형 덕트
-            inlet_box = trimesh.creation.box(extents=[
+            return trimesh.creation.box(extents=[
                 self.geometry.inlet_length,
                 self.geometry.inlet_width,
                 self.geometry.inlet_height
             ])
             
-            # 실린더 벽과 연결되는 위치로 이동
-            x_offset = (self.geometry.cylinder_diameter / 2) + (self.geometry.inlet_length / 2) - (self.geometry.wall_thickness / 2)
-            z_offset = self.geometry.cylinder_height - (self.geometry.inlet_height / 2) - 50  # 상단에서 50mm 아래
-            
-            inlet_box.apply_translation([x_offset, 0, z_offset])
-            
-            return inlet_box
-            
         except Exception as e:
             logger.error(f"입구 생성 오류: {e}")
             # 간단한 박스로 대체
             return trimesh.creation.box(extents=[100, 50, 100])
         
-    def _create_gas_outlet(self) -> trimesh.Trimesh:
-        """가스 출구 (vortex finder) 생성"""
-        try:
-            # 파이프
-            pipe = trimesh.creation.cylinder(
-                radius=self.geometry.gas_outlet_diameter / 2,
-                height=self.geometry.gas_outlet_height + 100,  # 위로 연장
-                sections=32
-            )
-            
-            # 위치 조정 (실린더 상단)
-            z_offset = self.geometry.cylinder_height + 50
-            pipe.apply_translation([0, 0, z_offset])
+    def _inlet_transform(self) -> np.ndarray:
+        """입구 덕트 배치 변환 (실린더 벽과 연결되는 위치)"""
+        return trimesh.transformations.translation_matrix(self.geometry.inlet_center())
+        
+    def _base_filename(self) -> str:
+        """저장 파일 기본 이름 (cyclone_<태그>, 내용 해시는 저장 시 추가)"""
+        tag_number = self.data.get('tag_number', 'unknown').replace('-', '_').replace(' ', '_')
+        return f"cyclone_{tag_number}"
+        
+    def save_model(self, output_dir: str = "output/models", formats: List[str] = None,
+                   quantize: bool = False):
+        """3D 모델을 파일로 저장
+        
+        공유 버퍼를 한 번 준비해 모든 형식을 동시에 저장합니다. 파일 이름은
+        cyclone_<태그>_<내용 해시>.<형식>이므로 모델이 그대로면 다시 쓰지 않습니다.
+        'glb' 형식은 부품별 노드와 노즐 인스턴스 노드(크기 x 등급별 메시 공유)를 가진
+        바이너리 glTF로 저장하며, quantize이면 KHR_mesh_quantization 정수 속성을 사용합니다.
+        """
+        if self.mesh is None:
+            raise ValueError("먼저 create_3d_model()을 실행하세요")
             
-            return pipe
+        if formats is None:
+            formats = ['stl', 'obj']  # 문제가 적은 형식들만
             
-        except Exception as e:
-            logger.error(f"가스 출구 생성 오류: {e}")
-            # 간단한 실린더로 대체
-            return trimesh.creation.cylinder(
-                radius=50,
-                height=100,
-                sections=16
-            )
+        # 부품 씬은 GLB를 실제로 쓸 때만 만듦 (전체 메시 캐시 적중 시 부품을 다시 만들지 않음)
+        buffers = prepare_buffers(self.mesh, layout=lambda: (self.get_parts(), self.get_instances()))
+        results = export_mesh(buffers, output_dir, self._base_filename(), formats, quantize=quantize)
+        return self._log_export(results)
         
-    def _create_solids_outlet(self) -> trimesh.Trimesh:
-        """고체 출구 생성"""
-        try:
-            # 파이프
-            pipe = trimesh.creation.cylinder(
-                radius=self.geometry.solids_outlet_diameter / 2,
-                height=200,  # 아래로 연장
-                sections=32
-            )
+    def _log_export(self, results: Dict[str, Dict]) -> List[str]:
+        """형식별 저장 결과 로그 (저장된 파일 경로 목록 반환)"""
+        saved_files = []
+        for fmt, result in results.items():
+            if result['status'] == 'failed':
+                logger.error(f"{fmt} 저장 실패: {result['error']}")
+                continue
+            if result['status'] == 'unchanged':
+                logger.info(f"{fmt.upper()} 파일 변경 없음, 건너뜀: {result['path']}")
+            else:
+                logger.info(f"{fmt.upper()} 파일 저장: {result['path']}")
+            saved_files.append(result['path'])
+        return saved_files
+        
+    def save_lod_chain(self, output_dir: str = "output/models", formats: List[str] = None) -> List[str]:
+        """LOD 메시들을 <이름>_LOD<n>_<해시>.<형식>으로 저장하고 <이름>_lod.json 목록 작성
+        
+        대시보드와 Unity 뷰어는 목록에서 충분한 품질 중 가장 가벼운 단계를 고릅니다.
+        """
+        if not self.lod_chain:
+            self.create_lod_chain()
             
-            # 위치 조정 (원뿔 하단)
-            z_offset = -self.geometry.cone_height - 100
-            pipe.apply_translation([0, 0, z_offset])
+        if formats is None:
+            formats = ['obj']
             
-            return pipe
+        output_path = Path(output_dir)
+        output_path.mkdir(parents=True, exist_ok=True)
+        base_filename = self._base_filename()
+        
+        saved_files = []
+        manifest = {'tag_number': self.data.get('tag_number', 'N/A'), 'levels': []}
+        
+        for level in self.lod_chain:
+            mesh = level['mesh']
+            results = export_mesh(prepare_buffers(mesh), output_dir, f"{base_filename}_LOD{level['lod']}", formats)
+            files = self._log_export(results)
+            saved_files.extend(files)
+                    
+            manifest['levels'].append({
+                'lod': level['lod'],
+                'quality': level['quality'],
+                'face_budget': level['face_budget'],
+                'sections': level['sections'],
+                'faces': len(mesh.faces),
+                'vertices': len(mesh.vertices),
+                'files': [Path(file).name for file in files],
+            })
             
-        except Exception as e:
-            logger.error(f"고체 출구 생성 오류: {e}")
-            # 간단한 실린더로 대체
-            return trimesh.creation.cylinder(
-                radius=40,
-                height=100,
-                sections=16
-            )
+        manifest_path = output_path / f"{base_filename}_lod.json"
+        atomic_write(manifest_path, lambda path: path.write_text(
+            json.dumps(manifest, indent=2, ensure_ascii=False), encoding='utf-8'))
+        saved_files.append(str(manifest_path))
+        logger.info(f"LOD {len(self.lod_chain)}단계 저장: {manifest_path}")
         
-    def save_model(self, output_dir: str = "output/models", formats: List[str] = None):
-        """3D 모델을 파일로 저장"""
+        return saved_files
+        
+    @cached_property
+    def material(self) -> Tuple[str, float]:
+        """(재질 약어, 밀도 kg/m³), 표에 없으면 탄소강으로 가정"""
+        material = str(self.data.get('material') or DEFAULT_MATERIAL).upper().replace(' ', '').replace('-', '')
+        if material not in MATERIAL_DENSITY:
+            logger.warning(f"알 수 없는 재질 '{material}', {DEFAULT_MATERIAL} 밀도 사용")
+            return material, MATERIAL_DENSITY[DEFAULT_MATERIAL]
+        return material, MATERIAL_DENSITY[material]
+        
+    def progressive_parts(self) -> List[StreamPart]:
+        """점진적 스트림용 부품 (바디/노즐은 회전 프로파일, 입구 덕트는 정적 메시)"""
+        # 입구 덕트는 상자 하나이므로 부품 씬 없이 바로 만듦
+        inlet = self._create_inlet().apply_transform(self._inlet_transform())
+        parts = [
+            StreamPart('body', profile=self.geometry.wall_profile()),
+            StreamPart('inlet', mesh=inlet),
+        ]
+        for placement in self._nozzle_placements():
+            parts.append(StreamPart(placement['name'], profile=placement['dims'].profile(),
+                                    transform=placement['transform']))
+        return parts
+        
+    def save_progressive(self, output_dir: str = "output/models",
+                         chord_tolerance: Optional[float] = None) -> str:
+        """점진적 메시 스트림(.p3s) 저장
+        
+        거친 기본 메시 뒤에 편차가 큰 순서의 세분화 청크가 오므로 대시보드/Unity는
+        처음 몇 KB만 받아도 형상을 표시할 수 있습니다. 파일 이름은 형상 해시로 정합니다.
+        """
         if self.mesh is None:
             raise ValueError("먼저 create_3d_model()을 실행하세요")
             
-        if formats is None:
-            formats = ['stl', 'obj']  # 문제가 적은 형식들만
-            
+        chord_tolerance = chord_tolerance or self.chord_tolerance
+        data = encode_stream(self.progressive_parts(), chord_tolerance, metadata={
+            'tag_number': self.data.get('tag_number', 'N/A'),
+            'bounds': self.mesh.bounds.tolist(),
+        })
+        
         output_path = Path(output_dir)
         output_path.mkdir(parents=True, exist_ok=True)
+        digest = geometry_key(self.geometry, chord_tolerance=chord_tolerance)[:16]
+        file_path = output_path / f"{self._base_filename()}_{digest}{STREAM_SUFFIX}"
+        if file_path.exists():
+            logger.info(f"P3S 파일 변경 없음, 건너뜀: {file_path}")
+        else:
+            atomic_write(file_path, lambda path: path.write_bytes(data))
+            logger.info(f"P3S 파일 저장: {file_path} ({len(data):,} bytes)")
+        return str(file_path)
         
-        # 파일명 생성
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        tag_number = self.data.get('tag_number', 'unknown').replace('-', '_').replace(' ', '_')
-        base_filename = f"cyclone_{tag_number}_{timestamp}"
+    def get_properties(self) -> Dict:
+        """형상 파라미터에서 해석적으로 계산한 물성 (메시를 만들지 않아도 됨)
         
-        saved_files = []
+        부피는 mm³, 넓이는 mm², 질량은 kg이며 형상별로 한 번만 계산합니다.
+        """
+        material, density = self.material
+        return {
+            'shell_volume': self.geometry.shell_volume,
+            'fluid_volume': self.geometry.fluid_volume,
+            'wetted_area': self.geometry.wetted_area,
+            'material': material,
+            'density': density,
+            'shell_mass': self.geometry.shell_mass(density),
+        }
         
-        for fmt in formats:
-            try:
-                file_path = output_path / f"{base_filename}.{fmt}"
-                self.mesh.export(file_path)
-                saved_files.append(str(file_path))
-                logger.info(f"{fmt.upper()} 파일 저장: {file_path}")
-                
-            except Exception as e:
-                logger.error(f"{fmt} 저장 실패: {e}")
-                
-        return saved_files
+    def cross_check(self) -> Dict:
+        """바디 메시의 부피/넓이와 해석값 비교 (테셀레이션 오차 확인용)"""
+        if self.mesh is None:
+            raise ValueError("먼저 create_3d_model()을 실행하세요")
+        body = self._update_scene(self.sections).nodes['body'].mesh
+        mesh_volume = float(body.volume)
+        analytic_volume = self.geometry.shell_volume
+        return {
+            'mesh_volume': mesh_volume,
+            'analytic_volume': analytic_volume,
+            'volume_error': (mesh_volume - analytic_volume) / analytic_volume,
+            'mesh_area': float(body.area),
+        }
+        
+    def get_model_info(self, cross_check: bool = False) -> Dict:
+        """모델 정보 반환
         
-    def get_model_info(self) -> Dict:
-        """모델 정보 반환"""
+        물성은 해석값을 사용합니다. cross_check이면 메시에서 계산한 부피/넓이와의
+        비교도 포함합니다 (메시 적분이 필요하므로 기본은 생략).
+        """
         if self.mesh is None:
             raise ValueError("먼저 create_3d_model()을 실행하세요")
             
@@ -459,29 +860,50 @@ class CycloneModeler:
                 'cylinder_diameter': self.geometry.cylinder_diameter,
                 'total_height': self.geometry.cylinder_height + self.geometry.cone_height,
                 'inlet_size': f"{self.geometry.inlet_width} x {self.geometry.inlet_height} mm",
-                'nozzle_count': len(self.geometry.nozzles)
+                'nozzle_count': len(self.geometry.nozzles),
+                'nozzle_types': sorted({placement['dims'].label for placement in self._nozzle_placements()})
             },
+            'properties': self.get_properties(),
             'mesh': {
                 'vertices': len(self.mesh.vertices),
                 'faces': len(self.mesh.faces),
-                'volume': float(self.mesh.volume) if hasattr(self.mesh, 'volume') else 0,
-                'surface_area': float(self.mesh.area) if hasattr(self.mesh, 'area') else 0,
                 'bounds': self.mesh.bounds.tolist() if hasattr(self.mesh, 'bounds') else []
             },
+            'validation': self._validation_summary(),
             'performance': {
                 'efficiency': self.data.get('efficiency', 'N/A'),
                 'pressure_drop': self.data.get('pressure_drop', 'N/A')
             }
         }
+        if cross_check:
+            info['cross_check'] = self.cross_check()
         
         return info
 
+    def _validation_summary(self) -> Dict:
+        """현재 씬에서 생성한 부품들의 검증/복구 요약 (캐시에서 읽은 부품은 제외)"""
+        scene = self.scenes.get(self.sections)
+        checks = scene.validation if scene is not None else {}
+        return {
+            'checked': sorted(checks),
+            'repaired': sorted(label for label, check in checks.items() if check['repaired']),
+            'validate_ms': round(sum(check['validation']['seconds'] for check in checks.values()) * 1000, 3),
+            'repair_ms': round(sum(check['repair_seconds'] for check in checks.values()) * 1000, 3),
+        }
+
 
-def create_cyclone_from_json(json_path: str, output_dir: str = "output/models") -> Dict:
-    """JSON 파일에서 사이클론 3D 모델 생성 (헬퍼 함수)"""
+def create_cyclone_from_json(json_path: str, output_dir: str = "output/models",
+                             cache_dir: Optional[str] = DEFAULT_CACHE_DIR, lod: bool = False,
+                             chord_tolerance: float = DEFAULT_CHORD_TOLERANCE) -> Dict:
+    """JSON 파일에서 사이클론 3D 모델 생성 (헬퍼 함수)
+    
+    cache_dir이 None이면 메시 캐시를 사용하지 않습니다.
+    lod이면 mesh_quality 단계별 LOD 메시와 목록 JSON도 함께 저장합니다 (기본은 저장하지 않음).
+    """
     try:
         # 모델러 생성
-        modeler = CycloneModeler(json_path)
+        cache = MeshCache(cache_dir) if cache_dir else None
+        modeler = CycloneModeler(json_path, cache=cache, chord_tolerance=chord_tolerance)
         
         # 3D 모델 생성
         mesh = modeler.create_3d_model()
@@ -492,6 +914,9 @@ def create_cyclone_from_json(json_path: str, output_dir: str = "output/models")
         # 모델 정보
         info = modeler.get_model_info()
         info['saved_files'] = saved_files
+        if lod:
+            info['lod_files'] = modeler.save_lod_chain(output_dir)
+            info['lod'] = [{k: v for k, v in level.items() if k != 'mesh'} for level in modeler.lod_chain]
         
         return info
         
@@ -529,7 +954,7 @@ if __name__ == "__main__":
                 print(f"  {exists} {path}")
             sys.exit(1)
         
-        info = create_cyclone_from_json(json_file)
+        info = create_cyclone_from_json(json_file, lod=True)
         
         print("\n" + "="*50)
         print("🎯 사이클론 3D 모델 생성 완료")
@@ -544,11 +969,16 @@ if __name__ == "__main__":
         print(f"\n🔺 메시 정보:")
         print(f"  • 정점 수: {info['mesh']['vertices']:,}")
         print(f"  • 면 수: {info['mesh']['faces']:,}")
-        if info['mesh']['volume'] > 0:
-            print(f"  • 부피: {info['mesh']['volume']:,.2f} mm³")
+        print("\n⚖️ 물성 (해석값):")
+        print(f"  • 벽 부피: {info['properties']['shell_volume']:,.0f} mm³")
+        print(f"  • 내부 유체 부피: {info['properties']['fluid_volume'] * 1e-6:,.2f} L")
+        print(f"  • 접액 면적: {info['properties']['wetted_area'] * 1e-6:,.3f} m²")
+        print(f"  • 벽 질량: {info['properties']['shell_mass']:,.1f} kg ({info['properties']['material']})")
         print(f"\n💾 저장된 파일:")
         for file in info['saved_files']:
             print(f"  📄 {file}")
+        for file in info['lod_files']:
+            print(f"  🪜 {file}")
         
         print(f"\n✅ 성공적으로 완료되었습니다!")
             
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+바이너리 glTF (GLB) 내보내기
+경로: E:\github\plant3D\src\modeler\gltf_export.py
+
+메시 배열(정점, 법선, 인덱스)을 중간 바이트열로 합치지 않고 파일에 바로 씁니다.
+부품마다 이름 있는 노드 1개를 만들어 Unity 등에서 부품 계층이 유지됩니다.
+인스턴스(노즐 등)는 프로토타입 메시를 한 번만 기록하고 배치마다 그 메시를
+참조하는 노드(matrix 변환)를 만듭니다.
+
+quantize=True이면 KHR_mesh_quantization 확장으로 위치는 uint16, 법선은 int16
+(정규화), 인덱스는 uint16(정점 65535개 이하)으로 저장합니다. glTF는 float16
+정점 속성을 허용하지 않으므로 위치는 부품별 바운딩 박스 기준 정수 양자화 후
+노드 변환(scale/translation)으로 복원합니다. 복원 스케일은 세 축에 같은 값을 써서
+법선이 노드 변환에 의해 기울지 않게 합니다.
+
+좌표계: 모델러는 mm, Z-up이고 glTF는 m, Y-up이므로 루트 노드에서 변환합니다.
+"""
+
+import json
+import struct
+import logging
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import trimesh
+
+logger = logging.getLogger(__name__)
+
+GLB_MAGIC = b'glTF'
+GLB_VERSION = 2
+CHUNK_JSON = 0x4E4F534A
+CHUNK_BIN = 0x004E4942
+
+# glTF 상수
+ARRAY_BUFFER = 34962
+ELEMENT_ARRAY_BUFFER = 34963
+COMPONENT_TYPES = {
+    np.dtype(np.int8): 5120,
+    np.dtype(np.uint8): 5121,
+    np.dtype(np.int16): 5122,
+    np.dtype(np.uint16): 5123,
+    np.dtype(np.uint32): 5125,
+    np.dtype(np.float32): 5126,
+}
+
+# Z-up -> Y-up (X축 -90° 회전) 쿼터니언 [x, y, z, w]
+Z_UP_TO_Y_UP = [-0.7071067811865476, 0.0, 0.0, 0.7071067811865476]
+
+
+def _pad4(length: int) -> int:
+    return (4 - length % 4) % 4
+
+
+class _BinaryBuffer:
+    """BIN 청크에 들어갈 배열 목록 (복사 없이 오프셋만 계산)"""
+
+    def __init__(self):
+        self.arrays: List[np.ndarray] = []
+        self.buffer_views: List[Dict] = []
+        self.length = 0
+
+    def add(self, array: np.ndarray, target: int, stride: Optional[int] = None) -> int:
+        """배열을 bufferView로 추가하고 인덱스 반환 (4바이트 정렬)"""
+        array = np.ascontiguousarray(array)
+        view = {'buffer': 0, 'byteOffset': self.length, 'byteLength': array.nbytes, 'target': target}
+        if stride:
+            view['byteStride'] = stride
+        self.arrays.append(array)
+        self.buffer_views.append(view)
+        self.length += array.nbytes + _pad4(array.nbytes)
+        return len(self.buffer_views) - 1
+
+    def write(self, f):
+        for array in self.arrays:
+            f.write(memoryview(array).cast('B'))
+            f.write(b'\0' * _pad4(array.nbytes))
+
+
+def _vertex_attribute(values: np.ndarray, dtype) -> np.ndarray:
+    """VEC3 정수 속성을 4성분으로 패딩 (정점 속성은 4바이트 정렬 필요)"""
+    padded = np.zeros((len(values), 4), dtype=dtype)
+    padded[:, :3] = values
+    return padded
+
+
+def export_glb(path: str, parts: Dict[str, trimesh.Trimesh], quantize: bool = False,
+               root_name: str = "model", unit_scale: float = 0.001, z_up: bool = True,
+               instances: Optional[Dict[str, Dict]] = None) -> int:
+    """부품별 메시를 GLB 파일로 저장 (파일 크기 반환)
+
+    Args:
+        path: 출력 .glb 경로
+        parts: 부품 이름 -> 메시 (부품마다 노드 1개)
+        quantize: KHR_mesh_quantization 양자화 사용
+        root_name: 루트 노드 이름
+        unit_scale: 모델 단위 -> m 배율 (mm이면 0.001)
+        z_up: 모델이 Z-up이면 루트 노드에서 Y-up으로 회전
+        instances: 프로토타입 이름 -> {'mesh': 로컬 메시, 'placements': [(노드 이름, 4x4 변환)]}
+    """
+    binary = _BinaryBuffer()
+    accessors, meshes, nodes = [], [], []
+
+    def add_accessor(view: int, component: np.dtype, count: int, kind: str, normalized: bool = False,
+                     minimum=None, maximum=None) -> int:
+        accessor = {'bufferView': view, 'componentType': COMPONENT_TYPES[np.dtype(component)],
+                    'count': int(count), 'type': kind}
+        if normalized:
+            accessor['normalized'] = True
+        if minimum is not None:
+            accessor['min'] = [float(v) if np.dtype(component).kind == 'f' else int(v) for v in minimum]
+            accessor['max'] = [float(v) if np.dtype(component).kind == 'f' else int(v) for v in maximum]
+        accessors.append(accessor)
+        return len(accessors) - 1
+
+    def add_mesh(name: str, mesh: trimesh.Trimesh) -> np.ndarray:
+        """메시 1개를 기록하고 양자화 복원 변환(4x4) 반환"""
+        vertices = np.asarray(mesh.vertices)
+        faces = np.asarray(mesh.faces)
+        normals = np.asarray(mesh.vertex_normals)
+        count = len(vertices)
+        dequantize = np.eye(4)
+
+        if quantize:
+            # 위치: 바운딩 박스의 가장 긴 축을 0..65535로 양자화, 노드 변환으로 복원
+            # (축별 스케일이면 비균일 노드 변환이 되어 법선이 틀어지므로 균일 스케일 사용)
+            lower = vertices.min(axis=0)
+            longest = float((vertices.max(axis=0) - lower).max())
+            scale = longest / 65535.0 if longest > 0 else 1.0
+            positions = np.rint((vertices - lower) / scale).astype(np.uint16)
+            view = binary.add(_vertex_attribute(positions, np.uint16), ARRAY_BUFFER, stride=8)
+            position = add_accessor(view, np.uint16, count, 'VEC3',
+                                    minimum=positions.min(axis=0), maximum=positions.max(axis=0))
+            dequantize[:3, :3] = np.eye(3) * scale
+            dequantize[:3, 3] = lower
+
+            # 법선: int16 정규화
+            packed = np.rint(np.clip(normals, -1.0, 1.0) * 32767).astype(np.int16)
+            view = binary.add(_vertex_attribute(packed, np.int16), ARRAY_BUFFER, stride=8)
+            normal = add_accessor(view, np.int16, count, 'VEC3', normalized=True)
+        else:
+            positions = vertices.astype(np.float32, copy=False)
+            view = binary.add(positions, ARRAY_BUFFER)
+            position = add_accessor(view, np.float32, count, 'VEC3',
+                                    minimum=positions.min(axis=0), maximum=positions.max(axis=0))
+            view = binary.add(normals.astype(np.float32, copy=False), ARRAY_BUFFER)
+            normal = add_accessor(view, np.float32, count, 'VEC3')
+
+        index_dtype = np.uint16 if quantize and count <= 65535 else np.uint32
+        view = binary.add(faces.astype(index_dtype, copy=False).reshape(-1), ELEMENT_ARRAY_BUFFER)
+        indices = add_accessor(view, index_dtype, faces.size, 'SCALAR')
+
+        meshes.append({'name': name, 'primitives': [{
+            'attributes': {'POSITION': position, 'NORMAL': normal},
+            'indices': indices,
+            'mode': 4,
+        }]})
+        return dequantize
+
+    for name, mesh in parts.items():
+        dequantize = add_mesh(name, mesh)
+        node = {'name': name, 'mesh': len(meshes) - 1}
+        if quantize:
+            node['translation'] = dequantize[:3, 3].tolist()
+            node['scale'] = np.diag(dequantize)[:3].tolist()
+        nodes.append(node)
+
+    for prototype, group in (instances or {}).items():
+        dequantize = add_mesh(prototype, group['mesh'])
+        for name, transform in group['placements']:
+            # glTF matrix는 열 우선 순서
+            matrix = np.asarray(transform, dtype=float) @ dequantize
+            nodes.append({'name': name, 'mesh': len(meshes) - 1, 'matrix': matrix.T.ravel().tolist()})
+
+    root = {'name': root_name, 'children': list(range(len(nodes))), 'scale': [unit_scale] * 3}
+    if z_up:
+        root['rotation'] = Z_UP_TO_Y_UP
+    nodes.append(root)
+
+    document = {
+        'asset': {'version': '2.0', 'generator': 'plant3D cyclone_modeler'},
+        'scene': 0,
+        'scenes': [{'nodes': [len(nodes) - 1]}],
+        'nodes': nodes,
+        'meshes': meshes,
+        'accessors': accessors,
+        'bufferViews': binary.buffer_views,
+        'buffers': [{'byteLength': binary.length}],
+    }
+    if quantize:
+        document['extensionsUsed'] = ['KHR_mesh_quantization']
+        document['extensionsRequired'] = ['KHR_mesh_quantization']
+
+    json_chunk = json.dumps(document, separators=(',', ':')).encode('utf-8')
+    json_chunk += b' ' * _pad4(len(json_chunk))
+    total = 12 + 8 + len(json_chunk) + 8 + binary.length
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(struct.pack('<4sII', GLB_MAGIC, GLB_VERSION, total))
+        f.write(struct.pack('<II', len(json_chunk), CHUNK_JSON))
+        f.write(json_chunk)
+        f.write(struct.pack('<II', binary.length, CHUNK_BIN))
+        binary.write(f)
+
+    logger.debug(f"GLB 저장: {path} ({total:,} bytes, 메시 {len(meshes)}개, 노드 {len(nodes) - 1}개)")
+    return total
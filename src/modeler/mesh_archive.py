@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+양자화/압축 메시 보관 형식 (.p3m)
+경로: E:\github\plant3D\src\modeler\mesh_archive.py
+
+수천 개 장비 모델을 보관/전송하기 위한 작은 바이너리 형식입니다.
+- 위치: 모델별 바운딩 박스 격자로 정수 양자화 (기본 16비트, 오차 <= 격자 간격/2),
+  축별로 분리한 뒤 이웃 정점과의 차분을 상위/하위 바이트 평면으로 나눠 저장
+- 인덱스: 이전 인덱스와의 차분을 zigzag 부호화하고 가능한 가장 작은 정수형으로 저장
+- 각 블록은 zlib(LZ77 + 허프만)으로 엔트로피 부호화
+법선은 저장하지 않고 로드 시 필요하면 다시 계산합니다.
+
+레이아웃: 헤더 | 메타데이터(JSON) | 위치 블록 | 인덱스 블록
+
+사용법 (STL/OBJ 대비 크기와 디코딩 속도 비교):
+  python mesh_archive.py <모델.stl|모델.obj|추출.json> [--bits 16] [--repeat 5]
+"""
+
+import sys
+import json
+import time
+import zlib
+import struct
+import logging
+import argparse
+import tempfile
+from pathlib import Path
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+# 스크립트로 직접 실행할 때만 프로젝트 루트를 Python 경로에 추가 (import 시에는 바꾸지 않음)
+project_root = Path(__file__).resolve().parents[2]
+if __name__ == "__main__":
+    sys.path.insert(0, str(project_root))
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_MAGIC = b'P3DM'
+ARCHIVE_VERSION = 1
+ARCHIVE_SUFFIX = '.p3m'
+DEFAULT_POSITION_BITS = 16
+COMPRESSION_LEVEL = 6
+
+# magic, version, 위치 비트 수, 인덱스 바이트 수, 정점 수, 면 수, 박스 하한(3), 격자 간격(3),
+# 메타데이터/위치/인덱스 블록 길이
+HEADER = struct.Struct('<4sHBBII3d3dIII')
+
+INDEX_DTYPES = {1: np.uint8, 2: np.uint16, 4: np.uint32, 8: np.uint64}
+
+
+@dataclass
+class ArchivedMesh:
+    """디코딩된 메시 배열"""
+    vertices: np.ndarray  # (N, 3) float64, mm
+    faces: np.ndarray  # (M, 3) int64
+    metadata: Dict = field(default_factory=dict)
+    step: np.ndarray = None  # 축별 격자 간격 (최대 오차 = step / 2)
+
+
+def _split_bytes(values: np.ndarray) -> bytes:
+    """uint16 배열을 상위 바이트 평면 + 하위 바이트 평면으로 (상위 바이트는 대부분 0 근처)"""
+    raw = values.astype('<u2', copy=False).view(np.uint8).reshape(-1, 2)
+    return raw[:, 1].tobytes() + raw[:, 0].tobytes()
+
+
+def _join_bytes(data: bytes, count: int) -> np.ndarray:
+    planes = np.frombuffer(data, dtype=np.uint8).reshape(2, count)
+    return (planes[0].astype(np.uint16) << 8) | planes[1]
+
+
+def encode_indices(flat: np.ndarray, level: int = COMPRESSION_LEVEL) -> Tuple[bytes, int]:
+    """인덱스 배열을 차분 -> zigzag -> 최소 정수형 -> zlib으로 부호화 ((데이터, 정수 바이트 수) 반환)"""
+    index_deltas = np.diff(np.asarray(flat, dtype=np.int64).ravel(), prepend=0)
+    zigzag = ((index_deltas << 1) ^ (index_deltas >> 63)).astype(np.uint64)
+    index_bytes = next(size for size, dtype in INDEX_DTYPES.items()
+                       if not len(zigzag) or zigzag.max() <= np.iinfo(dtype).max)
+    return zlib.compress(zigzag.astype(f'<u{index_bytes}').tobytes(), level), index_bytes
+
+
+def decode_indices(data: bytes, index_bytes: int) -> np.ndarray:
+    """encode_indices의 역변환 (1차원 int64 배열)"""
+    zigzag = np.frombuffer(zlib.decompress(data), dtype=f'<u{index_bytes}').astype(np.int64)
+    return np.cumsum((zigzag >> 1) ^ -(zigzag & 1))
+
+
+def encode_mesh(vertices: np.ndarray, faces: np.ndarray, bits: int = DEFAULT_POSITION_BITS,
+                metadata: Optional[Dict] = None, level: int = COMPRESSION_LEVEL) -> bytes:
+    """정점/면 배열을 .p3m 바이트열로 부호화
+
+    Args:
+        vertices: (N, 3) 정점 (mm)
+        faces: (M, 3) 삼각형 인덱스
+        bits: 위치 양자화 비트 수 (8~16)
+        metadata: 함께 저장할 JSON 직렬화 가능한 정보 (태그 등)
+        level: zlib 압축 수준
+    """
+    if not 8 <= bits <= 16:
+        raise ValueError(f"위치 비트 수는 8~16이어야 합니다: {bits}")
+    vertices = np.asarray(vertices, dtype=np.float64).reshape(-1, 3)
+    faces = np.asarray(faces, dtype=np.int64).reshape(-1, 3)
+    if len(vertices) == 0:
+        raise ValueError("정점이 없습니다")
+
+    # 위치: 바운딩 박스 격자로 양자화 후 축별 차분 (uint16 산술은 wrap-around로 복원 가능)
+    levels = (1 << bits) - 1
+    lower = vertices.min(axis=0)
+    step = np.maximum(vertices.max(axis=0) - lower, 1e-12) / levels
+    quantized = np.rint((vertices - lower) / step).astype(np.uint16).T
+    deltas = np.diff(quantized, axis=1, prepend=np.zeros((3, 1), dtype=np.uint16))
+    positions = zlib.compress(_split_bytes(deltas.ravel()), level)
+
+    # 인덱스: 차분 -> zigzag -> 최소 정수형
+    indices, index_bytes = encode_indices(faces, level)
+
+    meta = json.dumps(metadata or {}, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    header = HEADER.pack(ARCHIVE_MAGIC, ARCHIVE_VERSION, bits, index_bytes, len(vertices), len(faces),
+                         *lower, *step, len(meta), len(positions), len(indices))
+    return b''.join([header, meta, positions, indices])
+
+
+def decode_mesh(data: bytes) -> ArchivedMesh:
+    """.p3m 바이트열을 NumPy 배열로 복원"""
+    if len(data) < HEADER.size:
+        raise ValueError("p3m 데이터가 너무 짧습니다")
+    (magic, version, bits, index_bytes, vertex_count, face_count, *box,
+     meta_length, position_length, index_length) = HEADER.unpack_from(data)
+    if magic != ARCHIVE_MAGIC:
+        raise ValueError(f"p3m 형식이 아닙니다: {magic!r}")
+    if version != ARCHIVE_VERSION:
+        raise ValueError(f"지원하지 않는 p3m 버전: {version}")
+
+    lower, step = np.array(box[:3]), np.array(box[3:])
+    offset = HEADER.size
+    metadata = json.loads(data[offset:offset + meta_length].decode('utf-8')) if meta_length else {}
+    offset += meta_length
+
+    deltas = _join_bytes(zlib.decompress(data[offset:offset + position_length]), vertex_count * 3)
+    quantized = np.cumsum(deltas.reshape(3, vertex_count), axis=1, dtype=np.uint16)
+    vertices = quantized.T * step + lower
+    offset += position_length
+
+    faces = decode_indices(data[offset:offset + index_length], index_bytes).reshape(face_count, 3)
+
+    return ArchivedMesh(vertices=vertices, faces=faces, metadata=metadata, step=step)
+
+
+def write_archive(path, vertices: np.ndarray, faces: np.ndarray, bits: int = DEFAULT_POSITION_BITS,
+                  metadata: Optional[Dict] = None) -> int:
+    """.p3m 파일 저장 (파일 크기 반환)"""
+    data = encode_mesh(vertices, faces, bits=bits, metadata=metadata)
+    with open(path, 'wb') as f:
+        f.write(data)
+    return len(data)
+
+
+def load_archive(path) -> ArchivedMesh:
+    """.p3m 파일 로드"""
+    with open(path, 'rb') as f:
+        return decode_mesh(f.read())
+
+
+def benchmark(vertices: np.ndarray, faces: np.ndarray, bits: int = DEFAULT_POSITION_BITS,
+              repeat: int = 5) -> Dict[str, Dict]:
+    """STL/OBJ/p3m 파일 크기와 로드(디코딩) 시간 비교
+
+    Returns:
+        형식 -> {'bytes', 'load_ms', 'ratio'(STL 대비 크기)}, p3m에는 최대 위치 오차(mm) 포함
+    """
+    import trimesh
+    from src.modeler.mesh_export import prepare_buffers, write_stl, write_obj
+
+    mesh = trimesh.Trimesh(vertices=vertices, faces=faces, process=False)
+    buffers = prepare_buffers(mesh)
+    results = {}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = {fmt: Path(tmp) / f"model.{fmt}" for fmt in ('stl', 'obj', 'p3m')}
+        write_stl(paths['stl'], buffers)
+        write_obj(paths['obj'], buffers)
+        write_archive(paths['p3m'], vertices, faces, bits=bits)
+
+        loaders = {
+            'stl': lambda p: trimesh.load(p, process=False),
+            'obj': lambda p: trimesh.load(p, process=False),
+            'p3m': load_archive,
+        }
+        for fmt, path in paths.items():
+            seconds = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                loaded = loaders[fmt](path)
+                seconds.append(time.perf_counter() - start)
+            results[fmt] = {'bytes': path.stat().st_size, 'load_ms': round(min(seconds) * 1000, 3)}
+
+        error = np.abs(loaded.vertices - np.asarray(vertices)).max()
+        results['p3m']['max_error_mm'] = float(error)
+
+    for result in results.values():
+        result['ratio'] = round(result['bytes'] / results['stl']['bytes'], 4)
+    return results
+
+
+def main():
+    logging.basicConfig(level=logging.WARNING)
+
+    parser = argparse.ArgumentParser(description="p3m 메시 보관 형식 크기/속도 비교")
+    parser.add_argument('path', help='메시 파일(STL, OBJ) 또는 추출 JSON (모델을 생성해서 비교)')
+    parser.add_argument('--bits', type=int, default=DEFAULT_POSITION_BITS, help='위치 양자화 비트 수')
+    parser.add_argument('--repeat', type=int, default=5, help='반복 횟수 (최소 시간 사용)')
+    args = parser.parse_args()
+
+    path = Path(args.path)
+    if not path.exists():
+        print(f"파일을 찾을 수 없습니다: {path}")
+        sys.exit(1)
+
+    if path.suffix.lower() == '.json':
+        from src.modeler.cyclone_modeler import CycloneModeler
+        mesh = CycloneModeler(str(path)).create_3d_model()
+    else:
+        import trimesh
+        mesh = trimesh.load(path, force='mesh')
+
+    results = benchmark(mesh.vertices, mesh.faces, bits=args.bits, repeat=args.repeat)
+    print(f"정점 {len(mesh.vertices):,}개, 면 {len(mesh.faces):,}개")
+    for fmt, result in results.items():
+        print(f"  {fmt.upper():4s} {result['bytes']:>12,} bytes ({result['ratio'] * 100:6.2f}%)  "
+              f"로드 {result['load_ms']:8.3f} ms")
+    print(f"  p3m 최대 위치 오차: {results['p3m']['max_error_mm']:.4f} mm")
+
+
+if __name__ == "__main__":
+    main()
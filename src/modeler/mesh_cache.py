@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+형상 기반 메시 캐시
+경로: E:\github\plant3D\src\modeler\mesh_cache.py
+
+CycloneGeometry 파라미터와 테셀레이션 설정의 정규화된 해시를 키로
+생성된 메시를 디스크(.npz 배열)에 저장합니다. 파이프라인을 다시 실행할 때
+치수가 바뀌지 않은 장비는 메시 생성을 건너뜁니다.
+오래 사용하지 않은 항목부터 삭제합니다 (LRU, 파일 수정 시각 기준).
+"""
+
+import os
+import json
+import hashlib
+import logging
+import tempfile
+from pathlib import Path
+from dataclasses import asdict, is_dataclass
+from typing import Any, Dict, Optional
+
+import numpy as np
+import trimesh
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = "output/temp/mesh_cache"
+
+# 메시 생성 알고리즘이 바뀌면 올려서 기존 캐시를 무효화
+MESH_CACHE_VERSION = 2
+
+
+def geometry_key(geometry: Any, **settings) -> str:
+    """형상 파라미터 + 테셀레이션 설정의 정규화된 SHA-256 키"""
+    params = asdict(geometry) if is_dataclass(geometry) else dict(geometry)
+    payload = {
+        'version': MESH_CACHE_VERSION,
+        'geometry': params,
+        'settings': settings,
+    }
+    canonical = json.dumps(payload, sort_keys=True, separators=(',', ':'), ensure_ascii=False, default=str)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def _mtime(path: Path) -> float:
+    """수정 시각 (다른 프로세스가 이미 삭제한 경우 0)"""
+    try:
+        return path.stat().st_mtime
+    except FileNotFoundError:
+        return 0.0
+
+
+class MeshCache:
+    """디스크 메시 캐시 (키 -> 정점/면 배열)"""
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, max_entries: int = 256):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.npz"
+
+    def get(self, key: str) -> Optional[trimesh.Trimesh]:
+        """캐시된 메시 로드 (없으면 None)"""
+        path = self._path(key)
+        try:
+            with np.load(path) as arrays:
+                mesh = trimesh.Trimesh(vertices=arrays['vertices'], faces=arrays['faces'].astype(np.int64),
+                                       process=False)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except (OSError, KeyError, ValueError) as e:
+            logger.warning(f"손상된 캐시 항목 삭제: {path.name} ({e})")
+            path.unlink(missing_ok=True)
+            self.misses += 1
+            return None
+
+        # 사용 시각 갱신 (LRU)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+        self.hits += 1
+        return mesh
+
+    def put(self, key: str, mesh: trimesh.Trimesh):
+        """메시 저장 (임시 파일에 쓴 뒤 교체하므로 동시 실행에도 안전)"""
+        faces = np.asarray(mesh.faces)
+        index_dtype = np.uint16 if len(mesh.vertices) <= np.iinfo(np.uint16).max else np.uint32
+
+        fd, tmp_name = tempfile.mkstemp(suffix='.tmp', dir=self.cache_dir)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.savez(f, vertices=np.asarray(mesh.vertices, dtype=np.float64), faces=faces.astype(index_dtype))
+            os.replace(tmp_name, self._path(key))
+        except Exception:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+
+        self.evict()
+
+    def evict(self) -> int:
+        """max_entries를 넘는 오래된 항목 삭제 (삭제 수 반환)"""
+        entries = list(self.cache_dir.glob("*.npz"))
+        excess = len(entries) - self.max_entries
+        if excess <= 0:
+            return 0
+
+        entries.sort(key=_mtime)
+        for path in entries[:excess]:
+            path.unlink(missing_ok=True)
+        logger.debug(f"메시 캐시 {excess}개 항목 삭제")
+        return excess
+
+    def clear(self):
+        for path in self.cache_dir.glob("*.npz"):
+            path.unlink(missing_ok=True)
+
+    def stats(self) -> Dict:
+        entries = list(self.cache_dir.glob("*.npz"))
+        return {
+            'entries': len(entries),
+            'bytes': sum(p.stat().st_size for p in entries),
+            'hits': self.hits,
+            'misses': self.misses,
+        }
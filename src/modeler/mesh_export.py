@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+단일 패스 다중 형식 메시 내보내기
+경로: E:\github\plant3D\src\modeler\mesh_export.py
+
+정점, 면 인덱스, 법선 버퍼를 한 번만 준비하고 STL/OBJ/GLB를 스레드에서 동시에 씁니다.
+파일 이름은 메시 내용의 해시로 정해지므로 모델이 바뀌지 않았으면 다시 쓰지 않으며,
+각 파일은 임시 파일에 쓴 뒤 교체하므로 중간에 중단되어도 깨진 파일이 남지 않습니다.
+STL/OBJ는 인스턴스까지 펼친 전체 메시를, GLB는 부품 노드와 공유 메시 인스턴스를 씁니다.
+P3M은 보관/전송용 양자화 압축 형식입니다 (mesh_archive 참고).
+"""
+
+import os
+import hashlib
+import logging
+import threading
+from pathlib import Path
+from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import trimesh
+
+from src.modeler.gltf_export import export_glb
+from src.modeler.mesh_archive import write_archive
+
+logger = logging.getLogger(__name__)
+
+SUPPORTED_FORMATS = ('stl', 'obj', 'glb', 'p3m')
+
+# 바이너리 STL 삼각형 레코드 (법선, 정점 3개, 속성)
+STL_RECORD = np.dtype([('normal', '<f4', 3), ('vertices', '<f4', (3, 3)), ('attributes', '<u2')])
+
+
+@dataclass
+class ExportBuffers:
+    """모든 형식이 공유하는 메시 버퍼"""
+    vertices: np.ndarray
+    faces: np.ndarray
+    face_normals: np.ndarray
+    vertex_normals: np.ndarray
+    parts: Dict[str, trimesh.Trimesh] = field(default_factory=dict)
+    instances: Dict[str, Dict] = field(default_factory=dict)  # 프로토타입 -> {'mesh', 'placements'}
+    digest: str = ""
+    layout: Optional[Callable[[], Tuple[Dict, Dict]]] = None  # GLB를 쓸 때만 (부품, 인스턴스)를 만드는 함수
+
+    def glb_layout(self) -> Tuple[Dict[str, trimesh.Trimesh], Dict[str, Dict]]:
+        """GLB 노드용 (부품, 인스턴스), layout이 있으면 이때 처음 만듦"""
+        if self.layout is not None:
+            parts, instances = self.layout()
+            self.parts, self.instances = parts or self.parts, instances or {}
+            self.layout = None
+        return self.parts, self.instances
+
+
+def prepare_buffers(mesh: trimesh.Trimesh, parts: Optional[Dict[str, trimesh.Trimesh]] = None,
+                    instances: Optional[Dict[str, Dict]] = None,
+                    layout: Optional[Callable[[], Tuple[Dict, Dict]]] = None) -> ExportBuffers:
+    """메시에서 공유 버퍼와 내용 해시를 한 번 계산
+
+    내용 해시는 전체 메시만으로 계산합니다. 부품/인스턴스 구성은 같은 모델이면 메시에서
+    정해지므로, 부품을 만들었는지와 관계없이 같은 모델은 같은 파일 이름이 됩니다.
+
+    Args:
+        mesh: 인스턴스까지 펼친 전체 메시 (STL/OBJ)
+        parts: 부품 이름 -> 월드 좌표 메시 (GLB 노드)
+        instances: 프로토타입 이름 -> {'mesh': 로컬 메시, 'placements': [(이름, 변환)]} (GLB 공유 메시)
+        layout: (parts, instances)를 돌려주는 함수, GLB를 실제로 쓸 때만 호출 (부품 생성 비용 절약)
+    """
+    vertices = np.ascontiguousarray(mesh.vertices, dtype=np.float64)
+    faces = np.ascontiguousarray(mesh.faces, dtype=np.int64)
+
+    digest = hashlib.sha256()
+    digest.update(vertices.tobytes())
+    digest.update(faces.tobytes())
+
+    return ExportBuffers(
+        vertices=vertices,
+        faces=faces,
+        face_normals=np.asarray(mesh.face_normals, dtype=np.float32),
+        vertex_normals=np.asarray(mesh.vertex_normals, dtype=np.float32),
+        parts=parts or {'model': mesh},
+        instances=instances or {},
+        digest=digest.hexdigest()[:16],
+        layout=layout,
+    )
+
+
+def write_stl(path: Path, buffers: ExportBuffers):
+    """바이너리 STL (레코드 배열 하나로 기록)"""
+    records = np.zeros(len(buffers.faces), dtype=STL_RECORD)
+    records['normal'] = buffers.face_normals
+    records['vertices'] = buffers.vertices[buffers.faces]
+    with open(path, 'wb') as f:
+        f.write(b'plant3D cyclone_modeler'.ljust(80, b' '))
+        f.write(np.uint32(len(records)).tobytes())
+        f.write(memoryview(records).cast('B'))
+
+
+def write_obj(path: Path, buffers: ExportBuffers):
+    """Wavefront OBJ (정점, 정점 법선, 면)"""
+    vertex_count, face_count = len(buffers.vertices), len(buffers.faces)
+    faces = buffers.faces + 1
+    with open(path, 'w', encoding='ascii', newline='\n') as f:
+        f.write(f"# plant3D cyclone_modeler\n# vertices {vertex_count}, faces {face_count}\n")
+        f.write(('v %.6f %.6f %.6f\n' * vertex_count) % tuple(buffers.vertices.ravel()))
+        f.write(('vn %.6f %.6f %.6f\n' * vertex_count) % tuple(buffers.vertex_normals.ravel()))
+        f.write(('f %d//%d %d//%d %d//%d\n' * face_count) % tuple(np.repeat(faces.ravel(), 2)))
+
+
+def write_glb(path: Path, buffers: ExportBuffers, quantize: bool = False, root_name: str = "model"):
+    """부품별 노드와 인스턴스 노드를 가진 GLB"""
+    parts, instances = buffers.glb_layout()
+    export_glb(path, parts, quantize=quantize, root_name=root_name, instances=instances)
+
+
+def write_p3m(path: Path, buffers: ExportBuffers):
+    """양자화/압축 보관 형식 (.p3m)"""
+    write_archive(path, buffers.vertices, buffers.faces, metadata={'digest': buffers.digest})
+
+
+def atomic_write(path: Path, writer: Callable[[Path], None]):
+    """임시 파일에 쓴 뒤 교체"""
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        writer(tmp_path)
+        os.replace(tmp_path, path)
+    except Exception:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def export_mesh(buffers: ExportBuffers, output_dir: str, base_name: str, formats: List[str],
+                quantize: bool = False) -> Dict[str, Dict]:
+    """공유 버퍼로 여러 형식을 동시에 저장
+
+    파일 이름은 <base_name>_<내용 해시>.<형식>이며 같은 파일이 이미 있으면 건너뜁니다.
+
+    Returns:
+        형식 -> {'path', 'status': written | unchanged | failed, 'error'}
+    """
+    output_path = Path(output_dir)
+    output_path.mkdir(parents=True, exist_ok=True)
+    stem = f"{base_name}_{buffers.digest}"
+
+    writers = {
+        'stl': lambda p: write_stl(p, buffers),
+        'obj': lambda p: write_obj(p, buffers),
+        'glb': lambda p: write_glb(p, buffers, quantize=quantize, root_name=stem),
+        'p3m': lambda p: write_p3m(p, buffers),
+    }
+
+    results = {}
+    jobs = {}
+    with ThreadPoolExecutor(max_workers=max(1, len(formats))) as executor:
+        for fmt in formats:
+            # GLB 양자화 여부는 내용이 달라지므로 이름에 반영
+            suffix = f"_q.{fmt}" if fmt == 'glb' and quantize else f".{fmt}"
+            file_path = output_path / f"{stem}{suffix}"
+            if fmt not in SUPPORTED_FORMATS:
+                results[fmt] = {'path': str(file_path), 'status': 'failed', 'error': f"지원하지 않는 형식: {fmt}"}
+            elif file_path.exists():
+                results[fmt] = {'path': str(file_path), 'status': 'unchanged', 'error': ''}
+            else:
+                jobs[fmt] = (file_path, executor.submit(atomic_write, file_path, writers[fmt]))
+
+        for fmt, (file_path, future) in jobs.items():
+            try:
+                future.result()
+                results[fmt] = {'path': str(file_path), 'status': 'written', 'error': ''}
+            except Exception as e:
+                results[fmt] = {'path': str(file_path), 'status': 'failed', 'error': str(e)}
+
+    return results
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+해석적 메시 프리미티브
+경로: E:\github\plant3D\src\modeler\mesh_primitives.py
+
+불리언 연산(CSG) 없이 NumPy로 정점과 면을 한 번에 구성하는 메시 생성 함수입니다.
+축대칭 형상은 (r, z) 평면의 닫힌 단면 프로파일을 z축 둘레로 회전시켜
+이음매 정점을 공유하는 하나의 수밀(watertight) 인덱스 메시로 만듭니다.
+"""
+
+import math
+
+import numpy as np
+import trimesh
+
+# 원주 분할 수 범위 (chord 허용 오차로 계산한 값을 이 범위로 제한)
+MIN_SECTIONS = 8
+MAX_SECTIONS = 1024
+
+
+def sections_for_radius(radius: float, chord_tolerance: float,
+                        min_sections: int = MIN_SECTIONS, max_sections: int = MAX_SECTIONS) -> int:
+    """반지름 radius의 원을 현(chord) 편차 chord_tolerance(mm) 이내로 근사하는 분할 수
+
+    n각형의 최대 편차(sagitta)는 r(1 - cos(π/n))이므로
+    n = ceil(π / acos(1 - tol / r))입니다.
+    """
+    if radius <= 0 or chord_tolerance <= 0:
+        raise ValueError(f"반지름과 허용 오차는 0보다 커야 합니다: {radius}, {chord_tolerance}")
+    if chord_tolerance >= radius:
+        return min_sections
+    sections = math.ceil(math.pi / math.acos(1.0 - chord_tolerance / radius))
+    return int(min(max(sections, min_sections), max_sections))
+
+
+def profile_area(profile: np.ndarray) -> float:
+    """(r, z) 프로파일의 부호 있는 면적 (반시계 방향이면 양수)"""
+    r, z = profile[:, 0], profile[:, 1]
+    return 0.5 * float(np.dot(r, np.roll(z, -1)) - np.dot(np.roll(r, -1), z))
+
+
+def revolved_volume(profile) -> float:
+    """닫힌 (r, z) 프로파일을 z축 둘레로 회전한 입체의 부피 (파푸스 정리, mm³)
+
+    V = 2π ∬ r dA이고 그린 정리로 변마다 (z1 - z0)(r0² + r0·r1 + r1²) / 6의 합이 됩니다.
+    축 위의 점(r = 0)도 허용하며 프로파일 방향과 무관하게 양수를 반환합니다.
+    """
+    profile = np.asarray(profile, dtype=float)
+    r0, z0 = profile[:, 0], profile[:, 1]
+    r1, z1 = np.roll(r0, -1), np.roll(z0, -1)
+    return abs(float(np.pi / 3.0 * np.sum((z1 - z0) * (r0 * r0 + r0 * r1 + r1 * r1))))
+
+
+def revolved_area(polyline) -> float:
+    """열린 (r, z) 꺾은선을 z축 둘레로 회전한 곡면의 넓이 (원뿔대 옆면 합, mm²)"""
+    polyline = np.asarray(polyline, dtype=float)
+    r0, r1 = polyline[:-1, 0], polyline[1:, 0]
+    lengths = np.linalg.norm(np.diff(polyline, axis=0), axis=1)
+    return float(np.pi * np.sum((r0 + r1) * lengths))
+
+
+def clean_profile(profile) -> np.ndarray:
+    """프로파일 배열 변환 및 연속 중복 점 제거 (치수가 같아 생기는 길이 0 변)"""
+    profile = np.asarray(profile, dtype=float)
+    if profile.ndim != 2 or profile.shape[1] != 2 or len(profile) < 3:
+        raise ValueError(f"프로파일은 (N >= 3, 2) 배열이어야 합니다: {profile.shape}")
+    keep = np.any(np.abs(profile - np.roll(profile, 1, axis=0)) > 1e-9, axis=1)
+    return profile[keep]
+
+
+def revolve_profile(profile, sections: int = 64) -> trimesh.Trimesh:
+    """닫힌 (r, z) 단면 프로파일을 z축 둘레로 회전한 메시 생성
+
+    정점은 (각도, 프로파일 점) 격자 하나로 만들고, 프로파일의 마지막 변과
+    360° 이음매는 첫 정점을 다시 참조하므로 전체가 수밀 메시가 됩니다.
+    프로파일 방향(시계/반시계)과 무관하게 법선은 바깥을 향합니다.
+
+    Args:
+        profile: (N, 2) 닫힌 다각형 점 [r, z] (mm, 첫 점을 반복하지 않음, r > 0)
+        sections: 원주 방향 분할 수
+    """
+    if sections < 3:
+        raise ValueError(f"분할 수는 3 이상이어야 합니다: {sections}")
+
+    profile = clean_profile(profile)
+    if np.any(profile[:, 0] <= 0):
+        raise ValueError("프로파일 반지름은 모두 0보다 커야 합니다 (축 위의 점은 지원하지 않음)")
+
+    area = profile_area(profile)
+    if abs(area) < 1e-12:
+        raise ValueError("프로파일 면적이 0입니다")
+    if area < 0:
+        profile = profile[::-1]
+
+    points = len(profile)
+    theta = np.linspace(0.0, 2.0 * np.pi, sections, endpoint=False)
+
+    # 정점 인덱스 = 각도 * points + 프로파일 점
+    vertices = np.empty((sections, points, 3))
+    vertices[..., 0] = np.cos(theta)[:, None] * profile[:, 0]
+    vertices[..., 1] = np.sin(theta)[:, None] * profile[:, 0]
+    vertices[..., 2] = profile[:, 1]
+
+    index = np.arange(sections * points).reshape(sections, points)
+    a = index                                        # (각도 k, 점 p)
+    b = np.roll(index, -1, axis=1)                   # (각도 k, 점 p+1)
+    c = np.roll(b, -1, axis=0)                       # (각도 k+1, 점 p+1)
+    d = np.roll(index, -1, axis=0)                   # (각도 k+1, 점 p)
+
+    # 반시계 프로파일에서 (p -> p+1, k -> k+1) 사각형을 바깥 법선으로 분할
+    faces = np.concatenate([
+        np.stack([a, c, b], axis=-1).reshape(-1, 3),
+        np.stack([a, d, c], axis=-1).reshape(-1, 3),
+    ])
+
+    return trimesh.Trimesh(vertices=vertices.reshape(-1, 3), faces=faces, process=False)
+
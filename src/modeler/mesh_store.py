@@ -0,0 +1,351 @@
+#!/usr/bin/env python3
+"""
+메모리 매핑 메시 저장소
+경로: E:\github\plant3D\src\modeler\mesh_store.py
+
+플랜트 전체 장비 메시를 STL/OBJ 파싱 없이 다루기 위한 디렉터리 저장소입니다.
+- vertices.bin: 모든 모델의 정점 (float32, N x 3) 을 이어 붙인 평면 파일
+- faces.bin: 모든 모델의 면 (uint32, M x 3, 모델 안의 로컬 인덱스)
+- index.json: 태그 -> 정점/면 범위, 바운딩 박스, 메타데이터
+compact() 후에는 세대 번호가 붙은 파일(vertices.<세대>.bin, faces.<세대>.bin)을 쓰고
+인덱스의 generation이 현재 세대를 가리킵니다.
+
+읽기는 numpy.memmap으로 열어 태그별 범위를 잘라 주므로 복사 없이 필요한 모델/범위만
+페이지 단위로 읽힙니다. 바운딩 박스는 인덱스에 있어 배열을 건드리지 않고 컬링할 수 있습니다.
+
+쓰기는 한 프로세스에서만 합니다. 배열을 먼저 덧붙이고 인덱스를 원자적으로 교체하므로
+중간에 중단되어도 인덱스가 가리키는 범위는 항상 온전합니다. compact()는 새 세대 파일을
+다 쓴 뒤 인덱스를 교체하므로 기존 파일을 매핑한 독자와 중단된 정리 모두 안전합니다.
+
+사용법:
+  python mesh_store.py build <저장소> <메시 파일|폴더>...   # STL/OBJ/p3m 가져오기
+  python mesh_store.py info <저장소>
+  python mesh_store.py compact <저장소>
+"""
+
+import os
+import sys
+import copy
+import json
+import logging
+import argparse
+from pathlib import Path
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+# 스크립트로 직접 실행할 때만 프로젝트 루트를 Python 경로에 추가 (import 시에는 바꾸지 않음)
+project_root = Path(__file__).resolve().parents[2]
+if __name__ == "__main__":
+    sys.path.insert(0, str(project_root))
+
+logger = logging.getLogger(__name__)
+
+STORE_VERSION = 1
+VERTEX_FILE = "vertices.bin"
+FACE_FILE = "faces.bin"
+DATA_PATTERNS = ("vertices*.bin", "faces*.bin")
+INDEX_FILE = "index.json"
+VERTEX_DTYPE = np.dtype('<f4')
+FACE_DTYPE = np.dtype('<u4')
+
+MESH_SUFFIXES = ('.stl', '.obj', '.p3m')
+
+
+@dataclass
+class StoredMesh:
+    """저장소의 모델 하나 (배열은 memmap 뷰, 복사하지 않음)"""
+    tag: str
+    vertices: np.ndarray  # (N, 3) float32
+    faces: np.ndarray  # (M, 3) uint32, 로컬 인덱스
+    info: Dict
+
+    def to_trimesh(self):
+        """trimesh 객체로 변환 (이때 float64로 복사됨)"""
+        import trimesh
+        return trimesh.Trimesh(vertices=self.vertices, faces=self.faces, process=False)
+
+
+class MeshStore:
+    """태그 색인 메모리 매핑 메시 저장소"""
+
+    def __init__(self, store_dir: str):
+        self.store_dir = Path(store_dir)
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+        self.index = self._load_index()
+        self._vertices: Optional[np.memmap] = None
+        self._faces: Optional[np.memmap] = None
+
+    def _load_index(self) -> Dict:
+        path = self.store_dir / INDEX_FILE
+        if not path.exists():
+            return _empty_index()
+        with open(path, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+        if index.get('version') != STORE_VERSION:
+            raise ValueError(f"지원하지 않는 메시 저장소 버전: {index.get('version')}")
+        return index
+
+    def _write_index(self, index: Optional[Dict] = None):
+        """인덱스를 임시 파일에 쓰고 디스크에 내린 뒤 원자적으로 교체 (기본: 현재 인덱스)"""
+        path = self.store_dir / INDEX_FILE
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.index if index is None else index, f, ensure_ascii=False, separators=(',', ':'))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    def _data_paths(self, index: Optional[Dict] = None):
+        """인덱스 세대의 (정점 파일, 면 파일) 경로"""
+        vertex_name, face_name = _data_files((index or self.index).get('generation', 0))
+        return self.store_dir / vertex_name, self.store_dir / face_name
+
+    # ------------------------------------------------------------------ 읽기
+
+    def _map(self, path: Path, dtype: np.dtype, rows: int) -> Optional[np.memmap]:
+        if rows == 0:
+            return None
+        return np.memmap(path, dtype=dtype, mode='r', shape=(rows, 3))
+
+    @property
+    def vertices(self) -> Optional[np.memmap]:
+        """전체 정점 배열 (memmap)"""
+        if self._vertices is None:
+            self._vertices = self._map(self._data_paths()[0], VERTEX_DTYPE, self.index['vertex_count'])
+        return self._vertices
+
+    @property
+    def faces(self) -> Optional[np.memmap]:
+        """전체 면 배열 (memmap, 모델별 로컬 인덱스)"""
+        if self._faces is None:
+            self._faces = self._map(self._data_paths()[1], FACE_DTYPE, self.index['face_count'])
+        return self._faces
+
+    def __contains__(self, tag: str) -> bool:
+        return tag in self.index['models']
+
+    def __len__(self) -> int:
+        return len(self.index['models'])
+
+    def tags(self) -> List[str]:
+        return sorted(self.index['models'])
+
+    def info(self, tag: str) -> Dict:
+        """태그의 범위/바운딩 박스/메타데이터 (배열을 읽지 않음)"""
+        if tag not in self.index['models']:
+            raise KeyError(f"저장소에 없는 태그: {tag}")
+        return self.index['models'][tag]
+
+    def get(self, tag: str) -> StoredMesh:
+        """태그의 정점/면 memmap 뷰"""
+        info = self.info(tag)
+        v0, f0 = info['vertex_offset'], info['face_offset']
+        return StoredMesh(
+            tag=tag,
+            vertices=self.vertices[v0:v0 + info['vertex_count']],
+            faces=self.faces[f0:f0 + info['face_count']],
+            info=info,
+        )
+
+    def vertex_range(self, tag: str, start: int, stop: int) -> np.ndarray:
+        """태그 정점의 일부 범위 (memmap 뷰)"""
+        info = self.info(tag)
+        start, stop, _ = slice(start, stop).indices(info['vertex_count'])
+        offset = info['vertex_offset']
+        return self.vertices[offset + start:offset + stop]
+
+    def query_bounds(self, lower, upper) -> List[str]:
+        """바운딩 박스가 [lower, upper] 영역과 겹치는 태그 (인덱스만 사용)"""
+        lower, upper = np.asarray(lower, dtype=float), np.asarray(upper, dtype=float)
+        return [tag for tag, info in sorted(self.index['models'].items())
+                if np.all(np.asarray(info['bounds'][0]) <= upper) and np.all(np.asarray(info['bounds'][1]) >= lower)]
+
+    # ------------------------------------------------------------------ 쓰기
+
+    def add(self, tag: str, vertices: np.ndarray, faces: np.ndarray, metadata: Optional[Dict] = None):
+        """모델 추가 (같은 태그가 있으면 교체, 이전 범위는 compact() 전까지 남음)"""
+        self.add_many([(tag, vertices, faces, metadata)])
+
+    def add_many(self, models: Iterable):
+        """(태그, 정점, 면, 메타데이터) 여러 개를 한 번에 덧붙이고 인덱스는 한 번만 기록
+
+        새 범위는 인덱스 사본에 기록하고, 배열을 디스크에 내린 뒤 인덱스 파일을 교체한 다음에만
+        현재 인덱스로 삼습니다. 중간에 실패하면 메모리와 디스크의 인덱스 모두 이전 상태로 남고,
+        덧붙인 꼬리는 다음 쓰기 때 잘려 나갑니다.
+        """
+        vertex_path, face_path = self._data_paths()
+        index = copy.deepcopy(self.index)
+
+        # 인덱스에 기록되지 않은 (중단된 쓰기의) 꼬리를 잘라냄
+        self._close()
+        with open(vertex_path, 'ab') as vertex_file, open(face_path, 'ab') as face_file:
+            vertex_file.truncate(index['vertex_count'] * 3 * VERTEX_DTYPE.itemsize)
+            face_file.truncate(index['face_count'] * 3 * FACE_DTYPE.itemsize)
+            added = _append_models(index, vertex_file, face_file, models)
+            for data_file in (vertex_file, face_file):
+                data_file.flush()
+                os.fsync(data_file.fileno())
+
+        self._write_index(index)
+        self.index = index
+        logger.debug(f"메시 저장소에 {added}개 추가: {self.store_dir}")
+
+    def remove(self, tag: str):
+        """태그를 인덱스에서 제거 (배열 공간은 compact()로 회수)"""
+        if tag not in self.index['models']:
+            return
+        index = copy.deepcopy(self.index)
+        info = index['models'].pop(tag)
+        index['garbage_vertices'] = index.get('garbage_vertices', 0) + info['vertex_count']
+        self._write_index(index)
+        self.index = index
+
+    def compact(self):
+        """교체/삭제로 남은 범위를 제거하고 배열을 새 세대 파일로 다시 작성
+
+        새 파일을 모두 쓰고 디스크에 내린 뒤 인덱스를 교체하므로, 도중에 중단되면 기존
+        인덱스와 파일이 그대로 남습니다. 이전 세대 파일은 인덱스 교체 후 지우며, 다른 독자가
+        매핑하고 있어 지우지 못한 파일은 다음 정리 때 다시 지웁니다.
+        """
+        index = _empty_index(self.index.get('generation', 0) + 1)
+        vertex_path, face_path = self._data_paths(index)
+        live = ((tag, mesh.vertices, mesh.faces, mesh.info['metadata'])
+                for tag, mesh in ((tag, self.get(tag)) for tag in self.tags()))
+        with open(vertex_path, 'wb') as vertex_file, open(face_path, 'wb') as face_file:
+            count = _append_models(index, vertex_file, face_file, live)
+            for data_file in (vertex_file, face_file):
+                data_file.flush()
+                os.fsync(data_file.fileno())
+
+        self._close()
+        self._write_index(index)
+        self.index = index
+        self._remove_stale_files()
+        logger.info(f"메시 저장소 정리 완료: {count}개 모델 (세대 {index['generation']})")
+
+    def _remove_stale_files(self):
+        """현재 세대가 아닌 배열 파일 삭제 (매핑 중이라 지울 수 없으면 남겨 둠)"""
+        current = set(self._data_paths())
+        for pattern in DATA_PATTERNS:
+            for path in self.store_dir.glob(pattern):
+                if path in current:
+                    continue
+                try:
+                    path.unlink()
+                except OSError as e:
+                    logger.debug(f"이전 세대 파일 삭제 보류: {path.name} ({e})")
+
+    def _close(self):
+        """열린 memmap 해제 (쓰기 후 다시 매핑)"""
+        self._vertices = None
+        self._faces = None
+
+    def summary(self) -> Dict:
+        return {
+            'models': len(self),
+            'vertices': self.index['vertex_count'],
+            'faces': self.index['face_count'],
+            'garbage_vertices': self.index.get('garbage_vertices', 0),
+            'bytes': sum(path.stat().st_size
+                         for path in (*self._data_paths(), self.store_dir / INDEX_FILE) if path.exists()),
+        }
+
+
+def _empty_index(generation: int = 0) -> Dict:
+    return {'version': STORE_VERSION, 'generation': generation, 'vertex_count': 0, 'face_count': 0, 'models': {}}
+
+
+def _data_files(generation: int):
+    """세대 번호의 (정점 파일 이름, 면 파일 이름), 0세대는 처음 만든 저장소의 이름"""
+    if generation == 0:
+        return VERTEX_FILE, FACE_FILE
+    return f"vertices.{generation}.bin", f"faces.{generation}.bin"
+
+
+def _append_models(index: Dict, vertex_file, face_file, models: Iterable) -> int:
+    """열린 배열 파일 끝에 모델들을 쓰고 index의 범위/개수를 갱신, 추가한 모델 수 반환"""
+    added = 0
+    for tag, vertices, faces, metadata in models:
+        vertices = np.ascontiguousarray(vertices, dtype=VERTEX_DTYPE).reshape(-1, 3)
+        faces = np.ascontiguousarray(faces, dtype=FACE_DTYPE).reshape(-1, 3)
+        if len(vertices) == 0 or len(faces) == 0:
+            raise ValueError(f"빈 메시는 저장할 수 없습니다: {tag}")
+        if int(faces.max()) >= len(vertices):
+            raise ValueError(f"면 인덱스가 정점 수를 넘습니다: {tag}")
+
+        vertex_file.write(memoryview(vertices).cast('B'))
+        face_file.write(memoryview(faces).cast('B'))
+
+        if tag in index['models']:
+            index['garbage_vertices'] = index.get('garbage_vertices', 0) + index['models'][tag]['vertex_count']
+        index['models'][tag] = {
+            'vertex_offset': index['vertex_count'],
+            'vertex_count': len(vertices),
+            'face_offset': index['face_count'],
+            'face_count': len(faces),
+            'bounds': [vertices.min(axis=0).tolist(), vertices.max(axis=0).tolist()],
+            'metadata': metadata or {},
+        }
+        index['vertex_count'] += len(vertices)
+        index['face_count'] += len(faces)
+        added += 1
+    return added
+
+
+def _mesh_files(paths: List[str]) -> List[Path]:
+    files = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            files.extend(sorted(p for p in path.iterdir() if p.suffix.lower() in MESH_SUFFIXES))
+        elif path.suffix.lower() in MESH_SUFFIXES:
+            files.append(path)
+    return files
+
+
+def import_files(store: MeshStore, paths: List[str]) -> int:
+    """STL/OBJ/p3m 파일을 저장소로 가져오기 (태그는 p3m 메타데이터 또는 파일 이름)"""
+    from src.modeler.mesh_archive import load_archive
+
+    models = []
+    for path in _mesh_files(paths):
+        if path.suffix.lower() == '.p3m':
+            archived = load_archive(path)
+            vertices, faces, metadata = archived.vertices, archived.faces, archived.metadata
+        else:
+            import trimesh
+            mesh = trimesh.load(path, force='mesh')
+            vertices, faces, metadata = mesh.vertices, mesh.faces, {}
+        tag = metadata.get('tag_number') or path.stem
+        models.append((tag, vertices, faces, dict(metadata, source=path.name)))
+
+    if models:
+        store.add_many(models)
+    return len(models)
+
+
+def main():
+    logging.basicConfig(level=logging.INFO)
+
+    parser = argparse.ArgumentParser(description="메모리 매핑 메시 저장소")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    build_parser = subparsers.add_parser('build', help='메시 파일 가져오기')
+    build_parser.add_argument('store', help='저장소 폴더')
+    build_parser.add_argument('paths', nargs='+', help='STL/OBJ/p3m 파일 또는 폴더')
+    info_parser = subparsers.add_parser('info', help='저장소 요약')
+    info_parser.add_argument('store', help='저장소 폴더')
+    compact_parser = subparsers.add_parser('compact', help='교체/삭제된 범위 정리')
+    compact_parser.add_argument('store', help='저장소 폴더')
+    args = parser.parse_args()
+
+    store = MeshStore(args.store)
+    if args.command == 'build':
+        print(f"{import_files(store, args.paths)}개 모델 가져옴")
+    elif args.command == 'compact':
+        store.compact()
+    print(json.dumps(store.summary(), ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+벡터화 메시 검증과 조건부 복구
+경로: E:\github\plant3D\src\modeler\mesh_validation.py
+
+모델러의 생성 함수(회전 프로파일, 박스, 노즐)는 수밀하고 감긴 방향이 일관된 메시를
+만들므로 중복 면 제거, 퇴화 면 제거, fix_normals(그래프 탐색) 같은 복구는 보통 필요 없습니다.
+대신 변(edge) 사용 횟수, 방향 있는 변 중복, 부호 있는 부피를 NumPy 연산 몇 번으로 확인하고
+검증에 실패한 메시만 trimesh 복구를 실행합니다.
+
+사용법 (검증과 복구 소요 시간 비교):
+  python mesh_validation.py <모델.stl|모델.obj> [--repeat 5]
+"""
+
+import sys
+import time
+import logging
+import argparse
+from pathlib import Path
+from dataclasses import dataclass, asdict
+from typing import Dict, Tuple
+
+import numpy as np
+import trimesh
+
+logger = logging.getLogger(__name__)
+
+# 퇴화 면 판정 기준 (면적 mm²)
+DEGENERATE_AREA = 1e-12
+
+
+@dataclass
+class MeshValidation:
+    """메시 검증 결과"""
+    faces: int
+    boundary_edges: int  # 면 1개에만 속한 변 (구멍)
+    non_manifold_edges: int  # 면 3개 이상이 공유하는 변
+    inconsistent_edges: int  # 같은 방향으로 두 번 쓰인 변 (감긴 방향 불일치)
+    degenerate_faces: int
+    duplicate_faces: int
+    signed_volume: float  # 법선이 바깥을 향하면 양수
+    seconds: float = 0.0
+
+    @property
+    def watertight(self) -> bool:
+        return self.boundary_edges == 0 and self.non_manifold_edges == 0
+
+    @property
+    def valid(self) -> bool:
+        """복구 없이 사용 가능 (수밀, 일관된 감김, 바깥 법선, 퇴화/중복 면 없음)"""
+        return (self.watertight and self.inconsistent_edges == 0 and self.degenerate_faces == 0
+                and self.duplicate_faces == 0 and self.signed_volume > 0)
+
+    def to_dict(self) -> Dict:
+        result = asdict(self)
+        result['watertight'] = self.watertight
+        result['valid'] = self.valid
+        return result
+
+
+def validate_mesh(mesh: trimesh.Trimesh) -> MeshValidation:
+    """그래프 탐색 없이 배열 연산만으로 메시 검증"""
+    start = time.perf_counter()
+    vertices = np.asarray(mesh.vertices, dtype=np.float64)
+    faces = np.asarray(mesh.faces, dtype=np.int64)
+    vertex_count = max(len(vertices), 1)
+
+    # 방향 있는 변 (a -> b), 면마다 3개. 변은 정수 키 하나로 만들어 1차원 unique로 센다
+    directed = faces[:, [0, 1, 1, 2, 2, 0]].reshape(-1, 2)
+    start_index, end_index = directed[:, 0], directed[:, 1]
+    undirected_keys = np.minimum(start_index, end_index) * vertex_count + np.maximum(start_index, end_index)
+
+    # 변 사용 횟수: 수밀 다양체면 모든 변이 정확히 2번
+    _, edge_counts = np.unique(undirected_keys, return_counts=True)
+    # 일관된 감김이면 같은 방향 변은 한 번만 나옴
+    _, directed_counts = np.unique(start_index * vertex_count + end_index, return_counts=True)
+
+    triangles = vertices[faces]
+    cross = np.cross(triangles[:, 1] - triangles[:, 0], triangles[:, 2] - triangles[:, 0])
+    areas = 0.5 * np.linalg.norm(cross, axis=1)
+    unique_faces = _count_unique_rows(np.sort(faces, axis=1), vertex_count)
+    signed_volume = float(np.einsum('ij,ij->', triangles[:, 0], np.cross(triangles[:, 1], triangles[:, 2]))) / 6.0
+
+    return MeshValidation(
+        faces=len(faces),
+        boundary_edges=int(np.count_nonzero(edge_counts == 1)),
+        non_manifold_edges=int(np.count_nonzero(edge_counts > 2)),
+        inconsistent_edges=int(np.count_nonzero(directed_counts > 1)),
+        degenerate_faces=int(np.count_nonzero(areas <= DEGENERATE_AREA)),
+        duplicate_faces=len(faces) - unique_faces,
+        signed_volume=signed_volume,
+        seconds=time.perf_counter() - start,
+    )
+
+
+def _count_unique_rows(rows: np.ndarray, base: int) -> int:
+    """정수 3열 배열의 고유 행 수 (가능하면 정수 키 하나로 인코딩해 1차원 unique 사용)"""
+    if len(rows) == 0:
+        return 0
+    if base ** 3 < np.iinfo(np.int64).max:
+        return len(np.unique((rows[:, 0] * base + rows[:, 1]) * base + rows[:, 2]))
+    return len(np.unique(rows, axis=0))
+
+
+def repair_mesh(mesh: trimesh.Trimesh) -> trimesh.Trimesh:
+    """기존 복구 단계 (정점 병합, 중복/퇴화 면 제거, 법선 정렬)를 복사본에 실행"""
+    mesh = mesh.copy()
+    mesh.merge_vertices()
+    if hasattr(mesh, 'unique_faces'):
+        mesh.update_faces(mesh.unique_faces())
+        mesh.update_faces(mesh.nondegenerate_faces())
+    else:
+        # 이전 trimesh
+        mesh.remove_duplicate_faces()
+        mesh.remove_degenerate_faces()
+    mesh.fix_normals()
+    return mesh
+
+
+def ensure_valid(mesh: trimesh.Trimesh, label: str = "mesh") -> Tuple[trimesh.Trimesh, Dict]:
+    """검증하고 실패한 경우에만 복구
+
+    Returns:
+        (사용할 메시, {'validation', 'repaired', 'repair_seconds'})
+    """
+    report = validate_mesh(mesh)
+    result = {'validation': report.to_dict(), 'repaired': False, 'repair_seconds': 0.0}
+    if report.valid:
+        return mesh, result
+
+    logger.warning(f"메시 검증 실패, 복구 실행: {label} (구멍 변 {report.boundary_edges}, "
+                   f"비다양체 변 {report.non_manifold_edges}, 감김 불일치 변 {report.inconsistent_edges}, "
+                   f"퇴화 면 {report.degenerate_faces}, 중복 면 {report.duplicate_faces}, "
+                   f"부피 {report.signed_volume:.1f})")
+    start = time.perf_counter()
+    mesh = repair_mesh(mesh)
+    result['repair_seconds'] = time.perf_counter() - start
+    result['repaired'] = True
+    if not validate_mesh(mesh).valid:
+        logger.warning(f"복구 후에도 검증 실패: {label}")
+    return mesh, result
+
+
+def benchmark(mesh: trimesh.Trimesh, repeat: int = 5) -> Dict:
+    """검증과 복구의 최소 소요 시간 (복구를 건너뛰어 절약되는 시간)"""
+    validate_seconds = min(validate_mesh(mesh).seconds for _ in range(repeat))
+    repair_seconds = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        repair_mesh(mesh)
+        repair_seconds.append(time.perf_counter() - start)
+    repair_best = min(repair_seconds)
+    return {
+        'faces': len(mesh.faces),
+        'validate_ms': round(validate_seconds * 1000, 3),
+        'repair_ms': round(repair_best * 1000, 3),
+        'saved_ms': round((repair_best - validate_seconds) * 1000, 3),
+    }
+
+
+def main():
+    logging.basicConfig(level=logging.INFO)
+
+    parser = argparse.ArgumentParser(description="메시 검증 및 복구 소요 시간 비교")
+    parser.add_argument('path', help='메시 파일 (STL, OBJ 등)')
+    parser.add_argument('--repeat', type=int, default=5, help='반복 횟수 (최소 시간 사용)')
+    args = parser.parse_args()
+
+    path = Path(args.path)
+    if not path.exists():
+        print(f"파일을 찾을 수 없습니다: {path}")
+        sys.exit(1)
+
+    # STL은 삼각형마다 정점이 따로 있으므로 로드 시 정점 병합 (process=True)
+    mesh = trimesh.load(path, force='mesh')
+    report = validate_mesh(mesh)
+    print(f"검증: {'통과' if report.valid else '실패'} {report.to_dict()}")
+    result = benchmark(mesh, args.repeat)
+    print(f"면 {result['faces']:,}개 - 검증 {result['validate_ms']} ms, 복구 {result['repair_ms']} ms, "
+          f"복구 생략 시 절약 {result['saved_ms']} ms")
+
+
+if __name__ == "__main__":
+    main()
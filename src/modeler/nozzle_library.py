@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+표준 노즐/플랜지 형상 라이브러리
+경로: E:\github\plant3D\src\modeler\nozzle_library.py
+
+ASME B16.5 웰드넥 플랜지(Class 150/300/600)와 ASME B36.10 STD 배관 치수를
+미리 계산한 조회 테이블로 노즐 넥 + 플랜지 + 레이즈드 페이스 메시를 만듭니다.
+메시는 (호칭 크기, 등급, 분할 수)마다 한 번만 생성하고 모든 배치가 공유하므로
+노즐이 수천 개인 플랜트에서도 형상이 중복되지 않고, 배치는 변환 행렬로만 표현합니다.
+
+노즐 로컬 좌표: 축은 +z, z=0이 용기 부착점, z=projection이 플랜지 면입니다.
+"""
+
+import re
+import math
+import logging
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import trimesh
+
+from src.modeler.mesh_primitives import revolve_profile
+
+logger = logging.getLogger(__name__)
+
+# ASME B36.10 배관 외경, STD 두께 (mm)
+PIPE_DIMENSIONS: Dict[float, Tuple[float, float]] = {
+    0.5: (21.3, 2.77), 0.75: (26.7, 2.87), 1.0: (33.4, 3.38), 1.5: (48.3, 3.68),
+    2.0: (60.3, 3.91), 3.0: (88.9, 5.49), 4.0: (114.3, 6.02), 6.0: (168.3, 7.11),
+    8.0: (219.1, 8.18), 10.0: (273.1, 9.27), 12.0: (323.8, 9.53), 14.0: (355.6, 9.53),
+    16.0: (406.4, 9.53), 18.0: (457.0, 9.53), 20.0: (508.0, 9.53), 24.0: (610.0, 9.53),
+}
+
+# ASME B16.5 플랜지 외경, 두께 (mm)
+FLANGE_DIMENSIONS: Dict[int, Dict[float, Tuple[float, float]]] = {
+    150: {
+        0.5: (90, 9.6), 0.75: (100, 11.2), 1.0: (110, 12.7), 1.5: (125, 15.9),
+        2.0: (150, 17.5), 3.0: (190, 22.3), 4.0: (230, 22.3), 6.0: (280, 23.9),
+        8.0: (345, 27.0), 10.0: (405, 28.6), 12.0: (485, 30.2), 14.0: (535, 33.4),
+        16.0: (595, 35.0), 18.0: (635, 38.1), 20.0: (700, 41.3), 24.0: (815, 46.1),
+    },
+    300: {
+        0.5: (95, 12.7), 0.75: (115, 14.3), 1.0: (125, 15.9), 1.5: (155, 19.1),
+        2.0: (165, 20.7), 3.0: (210, 27.0), 4.0: (255, 30.2), 6.0: (320, 35.0),
+        8.0: (380, 39.7), 10.0: (445, 46.1), 12.0: (520, 49.3), 14.0: (585, 52.4),
+        16.0: (650, 55.6), 18.0: (710, 58.8), 20.0: (775, 62.0), 24.0: (915, 68.3),
+    },
+    600: {
+        0.5: (95, 14.3), 0.75: (115, 15.9), 1.0: (125, 17.5), 1.5: (155, 22.3),
+        2.0: (165, 25.4), 3.0: (210, 31.8), 4.0: (275, 38.1), 6.0: (355, 47.7),
+        8.0: (420, 55.6), 10.0: (510, 63.5), 12.0: (560, 66.7), 14.0: (605, 69.9),
+        16.0: (685, 76.2), 18.0: (745, 82.6), 20.0: (815, 88.9), 24.0: (940, 101.6),
+    },
+}
+
+# 레이즈드 페이스 직경 (mm), 높이는 Class 150/300이 1.6 mm, 600 이상이 6.4 mm
+RAISED_FACE_DIAMETER: Dict[float, float] = {
+    0.5: 35.1, 0.75: 42.9, 1.0: 50.8, 1.5: 73.2, 2.0: 91.9, 3.0: 127.0, 4.0: 157.2, 6.0: 215.9,
+    8.0: 269.7, 10.0: 323.9, 12.0: 381.0, 14.0: 412.8, 16.0: 469.9, 18.0: 533.4, 20.0: 584.2, 24.0: 692.2,
+}
+
+DEFAULT_RATING = 150
+MIN_PROJECTION = 150.0  # mm, 부착점 -> 플랜지 면
+
+
+@dataclass(frozen=True)
+class FlangeDimensions:
+    """호칭 크기 x 등급별 노즐 치수 (mm)"""
+    nps: float
+    rating: int
+    pipe_od: float
+    pipe_wall: float
+    flange_od: float
+    flange_thickness: float
+    raised_face_diameter: float
+    raised_face_height: float
+
+    @property
+    def label(self) -> str:
+        """메시/노드 이름용 표기 (예: NPS14_300)"""
+        return f"NPS{self.nps:g}_{self.rating}".replace('.', 'p')
+
+    @property
+    def projection(self) -> float:
+        """부착점에서 플랜지 면까지 길이 (플랜지 뒤로 넥이 드러나도록 최소값 보장)"""
+        return max(MIN_PROJECTION, self.flange_thickness + self.raised_face_height + self.pipe_od / 2)
+
+    def profile(self) -> np.ndarray:
+        """넥 + 플랜지 + 레이즈드 페이스의 (r, z) 단면 프로파일"""
+        ri = self.pipe_od / 2 - self.pipe_wall
+        ro = self.pipe_od / 2
+        rf = self.flange_od / 2
+        rr = self.raised_face_diameter / 2
+        z_face = self.projection
+        z_raised = z_face - self.raised_face_height
+        z_back = z_raised - self.flange_thickness
+        return np.array([
+            (ri, 0.0),
+            (ro, 0.0),
+            (ro, z_back),
+            (rf, z_back),
+            (rf, z_raised),
+            (rr, z_raised),
+            (rr, z_face),
+            (ri, z_face),
+        ])
+
+
+def _build_table() -> Dict[Tuple[float, int], FlangeDimensions]:
+    table = {}
+    for rating, flanges in FLANGE_DIMENSIONS.items():
+        for nps, (flange_od, thickness) in flanges.items():
+            pipe_od, wall = PIPE_DIMENSIONS[nps]
+            table[(nps, rating)] = FlangeDimensions(
+                nps=nps,
+                rating=rating,
+                pipe_od=pipe_od,
+                pipe_wall=wall,
+                flange_od=float(flange_od),
+                flange_thickness=thickness,
+                raised_face_diameter=RAISED_FACE_DIAMETER[nps],
+                raised_face_height=1.6 if rating < 600 else 6.4,
+            )
+    return table
+
+
+# (호칭 크기, 등급) -> 치수
+FLANGE_TABLE: Dict[Tuple[float, int], FlangeDimensions] = _build_table()
+
+
+def parse_rating(rating) -> int:
+    """'300#', 'CL300', 300 등을 표준 등급으로 변환 (없거나 표에 없으면 가까운 상위 등급)"""
+    match = re.search(r'\d+', str(rating or ''))
+    if not match:
+        return DEFAULT_RATING
+    value = int(match.group())
+    ratings = sorted(FLANGE_DIMENSIONS)
+    for standard in ratings:
+        if value <= standard:
+            return standard
+    logger.warning(f"지원하지 않는 플랜지 등급, Class {ratings[-1]} 사용: {rating}")
+    return ratings[-1]
+
+
+def lookup_flange(diameter_mm: float, rating=None) -> FlangeDimensions:
+    """배관 호칭 직경(mm)과 등급에 가장 가까운 표준 노즐 치수"""
+    nps = min(PIPE_DIMENSIONS, key=lambda size: abs(size * 25.4 - diameter_mm))
+    if not math.isclose(nps * 25.4, diameter_mm, rel_tol=0.05):
+        logger.warning(f"표준 호칭 크기가 아님, NPS {nps:g} 사용: {diameter_mm:.1f} mm")
+    return FLANGE_TABLE[(nps, parse_rating(rating))]
+
+
+@lru_cache(maxsize=None)
+def nozzle_mesh(dims: FlangeDimensions, sections: int) -> trimesh.Trimesh:
+    """노즐 메시 (로컬 좌표, 치수와 분할 수마다 프로세스에서 한 번만 생성)
+
+    반환된 메시는 여러 배치가 공유하므로 수정하면 안 됩니다.
+    """
+    logger.debug(f"노즐 메시 생성: {dims.label} (분할 수 {sections})")
+    return revolve_profile(dims.profile(), sections)
+
+
+def placement_transform(origin, direction) -> np.ndarray:
+    """노즐 로컬 +z 축을 direction으로 돌리고 origin에 놓는 4x4 변환"""
+    direction = np.asarray(direction, dtype=float)
+    transform = trimesh.geometry.align_vectors([0.0, 0.0, 1.0], direction / np.linalg.norm(direction))
+    transform[:3, 3] = origin
+    return transform
+
+
+def attachment_radius(shell_radius: float, dims: FlangeDimensions) -> Optional[float]:
+    """원통 셸의 반경 방향 노즐 부착 위치 (넥 바깥 모서리가 셸 표면에 닿는 반지름)
+
+    넥이 셸보다 굵으면 None을 반환합니다.
+    """
+    half = dims.pipe_od / 2
+    if half >= shell_radius:
+        return None
+    return math.sqrt(shell_radius ** 2 - half ** 2)
@@ -0,0 +1,637 @@
+#!/usr/bin/env python3
+"""
+플랜트 배치 조립과 간섭(clash) 검사
+경로: E:\github\plant3D\src\modeler\plant_layout.py
+
+배치 파일(JSON)의 장비 메시를 위치/회전으로 배치하고 장비 간 간섭을 찾습니다.
+모든 장비 쌍의 메시를 교차 검사하면 장비 수의 제곱으로 늘어나므로 두 단계로 나눕니다.
+- 광역 단계: 장비 월드 AABB의 BVH를 자기 자신과 동시 순회해 상자가 겹치는 후보 쌍만 추림
+- 정밀 단계: 후보 쌍마다 겹침 영역 안의 삼각형으로 삼각형 BVH를 만들어 같은 방식으로 순회하고,
+  후보 삼각형 쌍만 분리축 정리(SAT, 17개 축)로 검사
+표면이 만나지 않아도 한 장비가 다른 장비 안에 완전히 들어 있으면 점 포함(광선 교차 홀짝) 검사로 찾습니다.
+
+BVH는 모턴 코드 순으로 정렬한 상자를 잎(LEAF_SIZE개)으로 묶고 아래에서 위로 두 개씩 합치는
+배열 구조이고, 순회는 같은 깊이의 노드 쌍 전체를 NumPy 배열로 한 번에 내려갑니다.
+
+배치 파일 형식:
+  {
+    "name": "Unit 32",
+    "store": "output/models/store",      # 선택: 태그로 찾을 메시 저장소
+    "clearance": 0.0,                     # 선택: 이 거리(mm) 이내도 간섭으로 보고
+    "ignore": [["32-C-2222", "D-101"]],   # 선택: 붙어 있는 것이 정상인 장비 쌍
+    "items": [
+      {"name": "32-C-2222", "tag": "32-C-2222", "position": [0, 0, 0], "rotation": 90},
+      {"name": "C-2", "source": "C-2_extracted.json", "position": [3000, 0, 0]},
+      {"name": "V-1", "mesh": "v1.stl", "position": [0, 4000, 0], "rotation": [0, 0, 45]},
+      {"name": "D-101", "box": [2000, 300, 300], "position": [1500, 0, 900]}
+    ]
+  }
+메시는 tag(메시 저장소), mesh(STL/OBJ/p3m), source(추출 JSON/.eqb -> CycloneModeler), box(직육면체)
+중 하나로 지정하고, 같은 메시를 여러 번 배치해도 한 번만 읽습니다.
+rotation은 z축 회전각(도) 또는 [x, y, z] 오일러각(도, x -> y -> z 순서로 적용)입니다.
+clearance > 0의 판정은 SAT 축 간격으로 하므로 보수적입니다 (모서리끼리 가까운 경우 실제
+거리가 clearance보다 조금 커도 보고될 수 있음).
+
+사용법:
+  python plant_layout.py <배치.json> [--output output/reports/clash_report] [--clearance 0]
+"""
+
+import sys
+import csv
+import json
+import time
+import logging
+import argparse
+from pathlib import Path
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+# 스크립트로 직접 실행할 때만 프로젝트 루트를 Python 경로에 추가 (import 시에는 바꾸지 않음)
+project_root = Path(__file__).resolve().parents[2]
+if __name__ == "__main__":
+    sys.path.insert(0, str(project_root))
+
+from src.modeler.mesh_cache import DEFAULT_CACHE_DIR
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_REPORT = "output/reports/clash_report"
+LEAF_SIZE = 4
+PAIR_BATCH = 256  # 정밀 단계에서 한 번에 처리할 장비 쌍 수 (메모리 제한)
+PAIR_CHUNK = 1 << 16  # SAT에서 한 번에 처리할 삼각형 쌍 수
+SMALL_MESH = 64  # 이 이하 삼각형의 원본은 BVH 없이 전부 후보로 사용
+CONTACT_EPSILON = 1e-6  # mm, 이 이하의 분리 거리는 접촉(간섭)으로 봄
+
+
+# ---------------------------------------------------------------------- BVH
+
+def _spread_bits(values: np.ndarray) -> np.ndarray:
+    """10비트 정수의 비트 사이에 0을 두 개씩 끼움 (모턴 코드용)"""
+    x = values.astype(np.uint32) & 0x3FF
+    x = (x | (x << 16)) & 0x030000FF
+    x = (x | (x << 8)) & 0x0300F00F
+    x = (x | (x << 4)) & 0x030C30C3
+    x = (x | (x << 2)) & 0x09249249
+    return x
+
+
+def morton_codes(points: np.ndarray, lower: np.ndarray = None, upper: np.ndarray = None) -> np.ndarray:
+    """점의 30비트 모턴 코드 (lower/upper 기준 정규화, 없으면 점들의 바운딩 박스, 점별 배열도 가능)"""
+    if lower is None:
+        lower, upper = points.min(axis=0), points.max(axis=0)
+    cells = np.clip((points - lower) / np.maximum(upper - lower, 1e-12) * 1023, 0, 1023).astype(np.uint32)
+    return (_spread_bits(cells[:, 0]) << 2) | (_spread_bits(cells[:, 1]) << 1) | _spread_bits(cells[:, 2])
+
+
+class BVH:
+    """AABB 계층 (모턴 순서 잎을 아래에서 위로 두 개씩 합침)
+
+    levels[0]은 잎, levels[-1]은 루트 하나이며 level l의 노드 i의 자식은
+    level l-1의 2i, 2i+1 (있는 경우) 입니다.
+    """
+
+    def __init__(self, lower: np.ndarray, upper: np.ndarray, leaf_size: int = LEAF_SIZE,
+                 order: Optional[np.ndarray] = None):
+        """order를 주면 모턴 순서 대신 그 순서로 잎을 묶습니다."""
+        lower = np.asarray(lower, dtype=float).reshape(-1, 3)
+        upper = np.asarray(upper, dtype=float).reshape(-1, 3)
+        if len(lower) == 0:
+            raise ValueError("BVH에 넣을 상자가 없습니다")
+        self.lower, self.upper = lower, upper
+        self.leaf_size = leaf_size
+        self.order = np.argsort(morton_codes((lower + upper) / 2), kind='stable') if order is None else order
+
+        starts = np.arange(0, len(lower), leaf_size)
+        level = (np.minimum.reduceat(lower[self.order], starts), np.maximum.reduceat(upper[self.order], starts))
+        self.levels = [level]
+        while len(level[0]) > 1:
+            lo, hi = level
+            pairs = len(lo) // 2
+            merged_lo = np.minimum(lo[0:2 * pairs:2], lo[1:2 * pairs:2])
+            merged_hi = np.maximum(hi[0:2 * pairs:2], hi[1:2 * pairs:2])
+            if len(lo) % 2:
+                merged_lo, merged_hi = np.vstack([merged_lo, lo[-1:]]), np.vstack([merged_hi, hi[-1:]])
+            level = (merged_lo, merged_hi)
+            self.levels.append(level)
+
+    def __len__(self) -> int:
+        return len(self.lower)
+
+    @property
+    def height(self) -> int:
+        return len(self.levels)
+
+    def leaf_members(self, leaves: np.ndarray) -> np.ndarray:
+        """잎 번호들의 원래 상자 번호 (k, leaf_size), 빈 자리는 -1"""
+        slots = leaves[:, None] * self.leaf_size + np.arange(self.leaf_size)
+        valid = slots < len(self.order)
+        return np.where(valid, self.order[np.minimum(slots, len(self.order) - 1)], -1)
+
+
+def _children(nodes: np.ndarray, partner: np.ndarray, count: int) -> Tuple[np.ndarray, np.ndarray]:
+    """노드 쌍의 한쪽을 자식 두 개로 내림 (다른 쪽은 복제)"""
+    children = np.concatenate([2 * nodes, 2 * nodes + 1])
+    partner = np.concatenate([partner, partner])
+    valid = children < count
+    return children[valid], partner[valid]
+
+
+def overlapping_pairs(a: BVH, b: BVH, margin: float = 0.0, self_pairs: bool = False) -> np.ndarray:
+    """상자가 margin(mm) 이내로 겹치는 (a 번호, b 번호) 쌍 (k, 2)
+
+    두 트리를 같은 깊이 단위로 동시에 내려가며 겹치지 않는 노드 쌍을 통째로 버립니다.
+    self_pairs이면 a와 b가 같은 트리라고 보고 i < j 쌍만 돌려줍니다.
+    """
+    la, lb = a.height - 1, b.height - 1
+    ia, ib = np.zeros(1, dtype=np.int64), np.zeros(1, dtype=np.int64)
+
+    while True:
+        (alo, ahi), (blo, bhi) = a.levels[la], b.levels[lb]
+        keep = np.all((alo[ia] <= bhi[ib] + margin) & (blo[ib] <= ahi[ia] + margin), axis=1)
+        ia, ib = ia[keep], ib[keep]
+        if self_pairs:  # 대칭 쌍 중 한쪽만 (같은 깊이일 때)
+            keep = ia <= ib if la == lb else slice(None)
+            ia, ib = ia[keep], ib[keep]
+        if (la == 0 and lb == 0) or len(ia) == 0:
+            break
+        descend_a, descend_b = la > 0 and la >= lb, lb > 0 and lb >= la
+        if descend_a:
+            ia, ib = _children(ia, ib, len(a.levels[la - 1][0]))
+            la -= 1
+        if descend_b:
+            ib, ia = _children(ib, ia, len(b.levels[lb - 1][0]))
+            lb -= 1
+
+    # 잎 쌍 -> 원래 상자 쌍
+    members_a, members_b = a.leaf_members(ia), b.leaf_members(ib)
+    pa = np.repeat(members_a, b.leaf_size, axis=1).ravel()
+    pb = np.tile(members_b, (1, a.leaf_size)).ravel()
+    valid = (pa >= 0) & (pb >= 0)
+    if self_pairs:  # 같은 잎 안에서는 잎 내 순서로 한 번만, 결과는 (작은 번호, 큰 번호)
+        slot_a = np.repeat(np.arange(a.leaf_size), b.leaf_size)
+        slot_b = np.tile(np.arange(b.leaf_size), a.leaf_size)
+        valid &= ((ia[:, None] != ib[:, None]) | (slot_a < slot_b)).ravel()
+    pa, pb = pa[valid], pb[valid]
+    if self_pairs:
+        pa, pb = np.minimum(pa, pb), np.maximum(pa, pb)
+    keep = np.all((a.lower[pa] <= b.upper[pb] + margin) & (b.lower[pb] <= a.upper[pa] + margin), axis=1)
+    return np.stack([pa[keep], pb[keep]], axis=-1)
+
+
+# ---------------------------------------------------------------------- 삼각형 검사
+
+def _dot(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    return a[..., 0] * b[..., 0] + a[..., 1] * b[..., 1] + a[..., 2] * b[..., 2]
+
+
+def _cross(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """마지막 축 (x, y, z) 벡터의 외적 (작은 배열을 많이 다룰 때 np.cross보다 빠름)"""
+    return np.stack([a[..., 1] * b[..., 2] - a[..., 2] * b[..., 1],
+                     a[..., 2] * b[..., 0] - a[..., 0] * b[..., 2],
+                     a[..., 0] * b[..., 1] - a[..., 1] * b[..., 0]], axis=-1)
+
+
+def _project(axes: np.ndarray, triangles: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """축 (k, a, 3)에 삼각형 (k, 3, 3)을 투영한 구간 (최소, 최대) (k, a)"""
+    p0, p1, p2 = (_dot(axes, triangles[:, None, vertex]) for vertex in range(3))  # (k, a)
+    return np.minimum(np.minimum(p0, p1), p2), np.maximum(np.maximum(p0, p1), p2)
+
+
+def triangle_separation(t1: np.ndarray, t2: np.ndarray, limit: float = np.inf) -> np.ndarray:
+    """삼각형 쌍 (k, 3, 3)의 분리축 간격 (mm)
+
+    두 면 법선, 모서리 외적 9개, 면 안의 모서리 법선 6개(동일 평면 경우) 축에 투영한 구간 사이
+    간격의 최대값입니다. 0 이하이면 교차(접촉 포함)하고, 양수이면 그 이상 떨어져 있습니다
+    (실제 거리의 하한). 면 법선 축에서 이미 limit보다 떨어진 쌍은 나머지 축을 계산하지 않고
+    법선 축 간격을 돌려줍니다.
+    """
+    e1 = t1[:, [1, 2, 0]] - t1  # (k, 3, 3)
+    e2 = t2[:, [1, 2, 0]] - t2
+    n1 = _cross(e1[:, 0], e1[:, 1])
+    n2 = _cross(e2[:, 0], e2[:, 1])
+
+    def gaps(axes, a, b):
+        low_a, high_a = _project(axes, a)
+        low_b, high_b = _project(axes, b)
+        gap = np.maximum(low_b - high_a, low_a - high_b)
+        norm = np.sqrt(_dot(axes, axes))
+        # 평행한 모서리 등 길이가 0인 축은 분리를 증명하지 못함
+        return np.where(norm > 1e-12, gap / np.maximum(norm, 1e-300), -np.inf).max(axis=1)
+
+    # 대부분의 후보는 면 법선 하나로 분리되므로 먼저 두 축만 계산
+    separation = gaps(np.stack([n1, n2], axis=1), t1, t2)
+    rest = np.nonzero(separation <= limit)[0]
+    if len(rest):
+        e1, e2, n1, n2 = e1[rest], e2[rest], n1[rest], n2[rest]
+        axes = np.concatenate([_cross(e1[:, :, None], e2[:, None, :]).reshape(-1, 9, 3),
+                               _cross(n1[:, None], e1), _cross(n2[:, None], e2)], axis=1)  # (k, 15, 3)
+        separation[rest] = np.maximum(separation[rest], gaps(axes, t1[rest], t2[rest]))
+    return separation
+
+
+def point_in_mesh(point: np.ndarray, triangles: np.ndarray) -> bool:
+    """닫힌 메시 안의 점인지 (한 방향 광선의 교차 횟수 홀짝, Möller-Trumbore)"""
+    direction = np.array([0.5773, 0.5774, 0.5771])  # 축/모서리와 평행하지 않은 방향
+    v0, e1, e2 = triangles[:, 0], triangles[:, 1] - triangles[:, 0], triangles[:, 2] - triangles[:, 0]
+    p = np.cross(direction, e2)
+    det = _dot(e1, p)
+    ok = np.abs(det) > 1e-12
+    inv = 1.0 / np.where(ok, det, 1.0)
+    s = point - v0
+    u = _dot(s, p) * inv
+    q = np.cross(s, e1)
+    v = (q @ direction) * inv
+    t = _dot(e2, q) * inv
+    hits = ok & (u >= 0) & (v >= 0) & (u + v <= 1) & (t > 0)
+    return bool(np.count_nonzero(hits) % 2)
+
+
+# ---------------------------------------------------------------------- 배치
+
+def rotation_matrix(rotation) -> np.ndarray:
+    """z축 회전각(도) 또는 [x, y, z] 오일러각(도)의 3x3 회전 행렬"""
+    angles = np.radians([0.0, 0.0, float(rotation)] if np.isscalar(rotation) else np.asarray(rotation, dtype=float))
+    if angles.shape != (3,):
+        raise ValueError(f"회전은 각도 하나 또는 [x, y, z]여야 합니다: {rotation}")
+    cx, cy, cz = np.cos(angles)
+    sx, sy, sz = np.sin(angles)
+    rx = np.array([[1, 0, 0], [0, cx, -sx], [0, sx, cx]])
+    ry = np.array([[cy, 0, sy], [0, 1, 0], [-sy, 0, cy]])
+    rz = np.array([[cz, -sz, 0], [sz, cz, 0], [0, 0, 1]])
+    return rz @ ry @ rx
+
+
+class SourceMesh:
+    """배치 원본 메시 (로컬 좌표, 같은 원본을 배치한 항목끼리 공유)"""
+
+    def __init__(self, key: str, vertices: np.ndarray, faces: np.ndarray):
+        self.key = key
+        self.vertices = np.asarray(vertices, dtype=float)
+        self.faces = np.asarray(faces, dtype=np.int64)
+        self._tree: Optional[BVH] = None
+
+    @property
+    def triangles(self) -> np.ndarray:
+        return self.vertices[self.faces]
+
+    @property
+    def tree(self) -> BVH:
+        """로컬 삼각형 AABB의 BVH (처음 정밀 검사할 때 한 번 생성)"""
+        if self._tree is None:
+            triangles = self.triangles
+            self._tree = BVH(triangles.min(axis=1), triangles.max(axis=1))
+        return self._tree
+
+
+@dataclass
+class LayoutItem:
+    """배치된 장비 (원본 메시 + 회전/위치)"""
+    name: str
+    mesh: SourceMesh
+    rotation: np.ndarray  # 3x3
+    position: np.ndarray  # (3,) mm
+    bounds: np.ndarray = None  # (2, 3) 월드 AABB
+
+    def __post_init__(self):
+        if self.bounds is None:
+            world = self.to_world(self.mesh.vertices)
+            self.bounds = np.array([world.min(axis=0), world.max(axis=0)])
+
+    def to_world(self, points: np.ndarray) -> np.ndarray:
+        return points @ self.rotation.T + self.position
+
+    def world_triangles(self) -> np.ndarray:
+        return self.to_world(self.mesh.triangles)
+
+
+@dataclass
+class PlantLayout:
+    """배치 파일로 조립한 플랜트 모델"""
+    name: str
+    items: List[LayoutItem]
+    clearance: float = 0.0
+    ignore: set = field(default_factory=set)  # frozenset({이름, 이름})
+    load_seconds: float = 0.0
+
+    def bounds(self) -> np.ndarray:
+        boxes = np.array([item.bounds for item in self.items])
+        return np.array([boxes[:, 0].min(axis=0), boxes[:, 1].max(axis=0)])
+
+
+class _MeshSources:
+    """배치 항목의 메시 로더 (같은 원본은 한 번만 읽음)"""
+
+    def __init__(self, base_dir: Path, store_dir: Optional[str] = None):
+        self.base_dir = base_dir
+        self.store = None
+        if store_dir:
+            from src.modeler.mesh_store import MeshStore
+            self.store = MeshStore(str(self._resolve(store_dir)))
+        self.loaded: Dict[str, SourceMesh] = {}
+
+    def _resolve(self, path: str) -> Path:
+        candidate = self.base_dir / path
+        return candidate if candidate.exists() or not Path(path).exists() else Path(path)
+
+    def get(self, entry: Dict) -> SourceMesh:
+        if 'box' in entry:
+            key = f"box:{json.dumps([float(v) for v in entry['box']])}"
+        elif 'mesh' in entry:
+            key = f"mesh:{self._resolve(entry['mesh'])}"
+        elif 'source' in entry:
+            key = f"source:{self._resolve(entry['source'])}:{entry.get('tag', '')}"
+        elif 'tag' in entry:
+            key = f"tag:{entry['tag']}"
+        else:
+            raise ValueError(f"메시 지정(tag, mesh, source, box)이 없습니다: {entry.get('name')}")
+
+        if key not in self.loaded:
+            self.loaded[key] = SourceMesh(key, *self._load(entry))
+        return self.loaded[key]
+
+    def _load(self, entry: Dict) -> Tuple[np.ndarray, np.ndarray]:
+        if 'box' in entry:
+            import trimesh
+            mesh = trimesh.creation.box(extents=[float(v) for v in entry['box']])
+            return np.asarray(mesh.vertices), np.asarray(mesh.faces)
+        if 'mesh' in entry:
+            path = self._resolve(entry['mesh'])
+            if path.suffix.lower() == '.p3m':
+                from src.modeler.mesh_archive import load_archive
+                archived = load_archive(path)
+                return archived.vertices, archived.faces
+            import trimesh
+            mesh = trimesh.load(path, force='mesh')
+            return np.asarray(mesh.vertices), np.asarray(mesh.faces)
+        if 'source' in entry:
+            from src.modeler.cyclone_modeler import CycloneModeler
+            from src.modeler.mesh_cache import MeshCache
+            modeler = CycloneModeler(str(self._resolve(entry['source'])), tag_number=entry.get('tag'),
+                                     cache=MeshCache(DEFAULT_CACHE_DIR))
+            mesh = modeler.create_3d_model()
+            return np.asarray(mesh.vertices), np.asarray(mesh.faces)
+        if self.store is None:
+            raise ValueError(f"태그로 메시를 찾으려면 배치 파일에 store가 필요합니다: {entry['tag']}")
+        stored = self.store.get(entry['tag'])
+        return stored.vertices, stored.faces
+
+
+def load_layout(path: str) -> PlantLayout:
+    """배치 파일(JSON)을 읽어 장비 메시를 배치"""
+    start = time.perf_counter()
+    path = Path(path)
+    with open(path, 'r', encoding='utf-8') as f:
+        spec = json.load(f)
+
+    sources = _MeshSources(path.parent, spec.get('store'))
+    items, names = [], set()
+    for number, entry in enumerate(spec.get('items', [])):
+        name = str(entry.get('name') or entry.get('tag') or f"item-{number}")
+        if name in names:
+            raise ValueError(f"배치 항목 이름이 중복됩니다: {name}")
+        names.add(name)
+        items.append(LayoutItem(
+            name=name,
+            mesh=sources.get(entry),
+            rotation=rotation_matrix(entry.get('rotation', 0.0)),
+            position=np.asarray(entry.get('position', [0.0, 0.0, 0.0]), dtype=float),
+        ))
+    if not items:
+        raise ValueError(f"배치 항목이 없습니다: {path}")
+
+    ignore = {frozenset(map(str, pair)) for pair in spec.get('ignore', [])}
+    layout = PlantLayout(name=spec.get('name', path.stem), items=items, clearance=float(spec.get('clearance', 0.0)),
+                         ignore=ignore, load_seconds=time.perf_counter() - start)
+    logger.info(f"배치 로드: {len(items)}개 항목, 메시 원본 {len(sources.loaded)}개 ({layout.load_seconds:.2f} s)")
+    return layout
+
+
+# ---------------------------------------------------------------------- 간섭 검사
+
+@dataclass
+class Clash:
+    """장비 쌍의 간섭"""
+    item_a: str
+    item_b: str
+    kind: str  # intersect | clearance | contained
+    triangle_pairs: int  # 기준 이내 삼각형 쌍 수
+    separation: float  # 최소 SAT 간격 (mm, 0 이하면 교차)
+    location: List[float]  # 해당 삼각형 중심의 평균 (mm)
+    overlap_bounds: List[List[float]]  # 두 AABB의 겹침 영역
+
+    def to_dict(self) -> Dict:
+        return {
+            'item_a': self.item_a, 'item_b': self.item_b, 'kind': self.kind,
+            'triangle_pairs': self.triangle_pairs, 'separation': round(self.separation, 4),
+            'location': [round(v, 2) for v in self.location],
+            'overlap_bounds': [[round(v, 2) for v in corner] for corner in self.overlap_bounds],
+        }
+
+
+def _box_corners(lower: np.ndarray, upper: np.ndarray) -> np.ndarray:
+    """상자들 (k, 3)의 꼭짓점 (k, 8, 3)"""
+    select = np.array([[(corner >> axis) & 1 for axis in range(3)] for corner in range(8)], dtype=bool)
+    return np.where(select, upper[:, None, :], lower[:, None, :])
+
+
+def _triangles_in_boxes(items: List[LayoutItem], owners: np.ndarray,
+                        lower: np.ndarray, upper: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """질의 q마다 장비 owners[q]의 삼각형 중 월드 상자 q와 겹치는 것
+
+    같은 원본 메시를 쓰는 질의는 상자를 각 장비의 로컬 좌표로 옮긴 AABB로 모아
+    원본 BVH를 한 번만 순회합니다.
+
+    Returns:
+        (월드 좌표 삼각형 (k, 3, 3), 질의 번호 (k,))
+    """
+    groups: Dict[int, List[int]] = {}
+    for query, owner in enumerate(owners.tolist()):
+        groups.setdefault(id(items[owner].mesh), []).append(query)
+    rotations = np.array([item.rotation for item in items])
+    positions = np.array([item.position for item in items])
+
+    found_triangles, found_queries = [], []
+    for queries in groups.values():
+        queries = np.array(queries)
+        mesh = items[owners[queries[0]]].mesh
+        if len(mesh.faces) <= SMALL_MESH:
+            triangle_ids = np.tile(np.arange(len(mesh.faces)), len(queries))
+            hit_queries = np.repeat(queries, len(mesh.faces))
+        else:
+            R, P = rotations[owners[queries]], positions[owners[queries]]
+            local = np.matmul(_box_corners(lower[queries], upper[queries]) - P[:, None, :], R)
+            hits = overlapping_pairs(mesh.tree, BVH(local.min(axis=1), local.max(axis=1)))
+            triangle_ids, hit_queries = hits[:, 0], queries[hits[:, 1]]
+
+        owner = owners[hit_queries]
+        local, R, P = mesh.triangles[triangle_ids], rotations[owner][:, None], positions[owner][:, None]
+        world = np.stack([_dot(local, R[..., axis, :]) + P[..., axis] for axis in range(3)], axis=-1)
+        keep = np.all((world.min(axis=1) <= upper[hit_queries]) & (world.max(axis=1) >= lower[hit_queries]), axis=1)
+        found_triangles.append(world[keep])
+        found_queries.append(hit_queries[keep])
+
+    return np.concatenate(found_triangles), np.concatenate(found_queries)
+
+
+def _grouped_tree(triangles: np.ndarray, groups: np.ndarray, lower: np.ndarray, upper: np.ndarray,
+                  span: float) -> BVH:
+    """여러 장비 쌍의 삼각형을 하나의 BVH로 (쌍마다 x축으로 span씩 떨어뜨려 거의 겹치지 않게 함)
+
+    잎은 (쌍 번호, 쌍의 겹침 영역 기준 모턴 코드) 순서로 묶습니다.
+    """
+    shift = np.zeros((len(triangles), 3))
+    shift[:, 0] = groups * span - lower[groups, 0]
+    tri_lower, tri_upper = triangles.min(axis=1), triangles.max(axis=1)
+    codes = morton_codes((tri_lower + tri_upper) / 2, lower[groups], upper[groups])
+    return BVH(tri_lower + shift, tri_upper + shift, order=np.lexsort((codes, groups)))
+
+
+def narrow_phase(items: List[LayoutItem], pairs: np.ndarray, clearance: float = 0.0) -> List[Clash]:
+    """후보 장비 쌍 (k, 2)의 정밀 검사
+
+    PAIR_BATCH개 쌍씩 겹침 영역의 삼각형을 모아 쌍별로 분리한 BVH 두 개를 한 번에 순회하고
+    후보 삼각형 쌍만 SAT로 검사합니다.
+    """
+    clashes = []
+    bounds = np.array([item.bounds for item in items])
+    for start in range(0, len(pairs), PAIR_BATCH):
+        batch = pairs[start:start + PAIR_BATCH]
+        count = len(batch)
+        lower = np.maximum(bounds[batch[:, 0], 0], bounds[batch[:, 1], 0]) - clearance
+        upper = np.minimum(bounds[batch[:, 0], 1], bounds[batch[:, 1], 1]) + clearance
+
+        # 질의 0..count-1은 쌍의 앞쪽 장비, count..2count-1은 뒤쪽 장비
+        triangles, queries = _triangles_in_boxes(items, batch.T.ravel(), np.vstack([lower, lower]),
+                                                 np.vstack([upper, upper]))
+        side_b = queries >= count
+        ta, ga = triangles[~side_b], queries[~side_b]
+        tb, gb = triangles[side_b], queries[side_b] - count
+
+        hits = np.zeros(count, dtype=np.int64)
+        best = np.full(count, np.inf)
+        centers = np.zeros((count, 3))
+        if len(ta) and len(tb):
+            span = float((upper - lower)[:, 0].max()) + 2 * clearance + 1.0
+            candidates = overlapping_pairs(_grouped_tree(ta, ga, lower, upper, span),
+                                           _grouped_tree(tb, gb, lower, upper, span), margin=clearance)
+            # 겹침 영역 밖으로 튀어나온 큰 삼각형은 이웃 쌍 자리와 겹칠 수 있음
+            candidates = candidates[ga[candidates[:, 0]] == gb[candidates[:, 1]]]
+            for chunk_start in range(0, len(candidates), PAIR_CHUNK):
+                chunk = candidates[chunk_start:chunk_start + PAIR_CHUNK]
+                separation = triangle_separation(ta[chunk[:, 0]], tb[chunk[:, 1]], limit=clearance + CONTACT_EPSILON)
+                close = separation <= clearance + CONTACT_EPSILON
+                group = ga[chunk[close, 0]]
+                hits += np.bincount(group, minlength=count)
+                np.minimum.at(best, group, separation[close])
+                middle = (ta[chunk[close, 0]].mean(axis=1) + tb[chunk[close, 1]].mean(axis=1)) / 2
+                for axis in range(3):
+                    centers[:, axis] += np.bincount(group, weights=middle[:, axis], minlength=count)
+
+        for k, (i, j) in enumerate(batch.tolist()):
+            overlap = [lower[k].tolist(), upper[k].tolist()]
+            if hits[k]:
+                kind = 'intersect' if best[k] <= CONTACT_EPSILON else 'clearance'
+                clashes.append(Clash(items[i].name, items[j].name, kind, int(hits[k]), float(best[k]),
+                                     (centers[k] / hits[k]).tolist(), overlap))
+                continue
+            clash = _containment(items[i], items[j], overlap)
+            if clash is not None:
+                clashes.append(clash)
+    return clashes
+
+
+def _containment(a: LayoutItem, b: LayoutItem, overlap: List) -> Optional[Clash]:
+    """표면이 만나지 않는 쌍에서 한쪽이 다른 쪽 안에 완전히 들어 있는지 (상자 포함일 때만 검사)"""
+    for inner, outer in ((a, b), (b, a)):
+        if np.all(inner.bounds[0] >= outer.bounds[0]) and np.all(inner.bounds[1] <= outer.bounds[1]):
+            point = inner.to_world(inner.mesh.vertices[inner.mesh.faces[0, 0]])
+            if point_in_mesh(point, outer.world_triangles()):
+                return Clash(a.name, b.name, 'contained', 0, -np.inf, point.tolist(), overlap)
+    return None
+
+
+def find_clashes(layout: PlantLayout, clearance: Optional[float] = None) -> Dict:
+    """배치 전체의 간섭 검사
+
+    Returns:
+        {'clashes': [Clash...], 'stats': 단계별 쌍 수와 시간}
+    """
+    clearance = layout.clearance if clearance is None else clearance
+    start = time.perf_counter()
+
+    boxes = np.array([item.bounds for item in layout.items])
+    tree = BVH(boxes[:, 0], boxes[:, 1], leaf_size=LEAF_SIZE)
+    candidates = overlapping_pairs(tree, tree, margin=clearance, self_pairs=True)
+    if layout.ignore:
+        candidates = np.array([(i, j) for i, j in candidates.tolist()
+                               if frozenset((layout.items[i].name, layout.items[j].name)) not in layout.ignore],
+                              dtype=np.int64).reshape(-1, 2)
+    broad_seconds = time.perf_counter() - start
+
+    clashes = narrow_phase(layout.items, candidates, clearance)
+
+    total = len(layout.items)
+    stats = {
+        'items': total,
+        'all_pairs': total * (total - 1) // 2,
+        'candidate_pairs': len(candidates),
+        'clashes': len(clashes),
+        'broad_phase_seconds': round(broad_seconds, 4),
+        'narrow_phase_seconds': round(time.perf_counter() - start - broad_seconds, 4),
+        'clearance': clearance,
+    }
+    logger.info(f"간섭 검사: 항목 {total}개, 후보 {len(candidates)}쌍, 간섭 {len(clashes)}건 "
+                f"({time.perf_counter() - start:.2f} s)")
+    return {'clashes': clashes, 'stats': stats}
+
+
+def write_clash_report(layout: PlantLayout, result: Dict, output_base: str) -> List[str]:
+    """간섭 리포트를 JSON(요약 + 전체)과 CSV(간섭 1건당 1행)로 저장"""
+    output_base = Path(output_base)
+    output_base.parent.mkdir(parents=True, exist_ok=True)
+    rows = [clash.to_dict() for clash in result['clashes']]
+
+    json_path = output_base.with_suffix('.json')
+    with open(json_path, 'w', encoding='utf-8') as f:
+        json.dump({'layout': layout.name, 'stats': dict(result['stats'], load_seconds=round(layout.load_seconds, 4)),
+                   'clashes': rows}, f, ensure_ascii=False, indent=2)
+
+    csv_path = output_base.with_suffix('.csv')
+    with open(csv_path, 'w', encoding='utf-8-sig', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['item_a', 'item_b', 'kind', 'triangle_pairs', 'separation', 'x', 'y', 'z'])
+        for row in rows:
+            writer.writerow([row['item_a'], row['item_b'], row['kind'], row['triangle_pairs'],
+                             row['separation'], *row['location']])
+
+    logger.info(f"간섭 리포트 저장: {json_path}, {csv_path}")
+    return [str(json_path), str(csv_path)]
+
+
+def main():
+    logging.basicConfig(level=logging.INFO)
+
+    parser = argparse.ArgumentParser(description="플랜트 배치 간섭 검사")
+    parser.add_argument('layout', help='배치 파일 (JSON)')
+    parser.add_argument('--output', default=DEFAULT_REPORT, help='리포트 경로 (확장자 제외)')
+    parser.add_argument('--clearance', type=float, help='최소 이격 거리 mm (기본: 배치 파일 값)')
+    args = parser.parse_args()
+
+    layout = load_layout(args.layout)
+    result = find_clashes(layout, args.clearance)
+    stats = result['stats']
+    print(f"항목 {stats['items']:,}개, 전체 쌍 {stats['all_pairs']:,} -> 후보 {stats['candidate_pairs']:,}쌍, "
+          f"간섭 {stats['clashes']:,}건")
+    print(f"  로드 {layout.load_seconds:.2f} s, 광역 {stats['broad_phase_seconds']:.3f} s, "
+          f"정밀 {stats['narrow_phase_seconds']:.2f} s")
+    for clash in result['clashes'][:20]:
+        print(f"  {clash.kind:9s} {clash.item_a} <-> {clash.item_b}: 삼각형 쌍 {clash.triangle_pairs}, "
+              f"위치 {np.round(clash.location, 1).tolist()}")
+    for path in write_clash_report(layout, result, args.output):
+        print(f"  저장: {path}")
+
+
+if __name__ == "__main__":
+    main()
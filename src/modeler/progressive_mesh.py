@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+점진적(progressive) 메시 스트림 (.p3s)
+경로: E:\github\plant3D\src\modeler\progressive_mesh.py
+
+느린 현장 회선의 뷰어가 전체 파일을 기다리지 않도록 모델을 청크 스트림으로 보냅니다.
+- 기본 청크: 회전 부품(바디, 노즐)은 원주 분할 8개짜리 거친 메시, 정적 부품(입구 덕트)은 전체
+- 세분화 청크: 분할 수를 두 배로 늘리면서 새 각도의 정점만 덧붙이고 그 단계의 인덱스 버퍼로 교체
+세분화 청크는 제거하는 현(chord) 편차가 큰 순서로 정렬합니다. 편차는 mm 단위 기하 오차이고,
+뷰어는 이를 거리로 나눈 화면 오차로 판단하므로 같은 시점에서 보면 화면 오차 순서와 같습니다.
+각 청크는 적용 후 남은 편차를 담고 있어 뷰어가 충분한 품질에서 수신을 멈출 수 있습니다.
+
+레이아웃: 스트림 헤더 | 메타데이터(JSON) | (청크 헤더 | 정점 블록 | 인덱스 블록)...
+정점은 float32 + zlib, 인덱스는 mesh_archive와 같은 차분/zigzag/zlib 부호화입니다.
+"""
+
+import json
+import zlib
+import struct
+import logging
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+import trimesh
+
+from src.modeler.mesh_primitives import clean_profile, profile_area, MIN_SECTIONS, MAX_SECTIONS
+from src.modeler.mesh_archive import encode_indices, decode_indices
+
+logger = logging.getLogger(__name__)
+
+STREAM_MAGIC = b'P3DS'
+STREAM_VERSION = 1
+STREAM_SUFFIX = '.p3s'
+BASE_SECTIONS = MIN_SECTIONS
+
+# magic, version, 메타데이터 길이
+STREAM_HEADER = struct.Struct('<4sHI')
+# 부품 번호, 분할 수(정적 부품은 0), 인덱스 바이트 수, 새 정점 수, 인덱스 수,
+# 정점 블록 길이, 인덱스 블록 길이, 적용 후 남은 편차(mm)
+CHUNK_HEADER = struct.Struct('<HHB3xIIIIf')
+
+
+@dataclass
+class StreamPart:
+    """스트림에 넣을 부품 (회전 프로파일 또는 정적 메시)"""
+    name: str
+    profile: Optional[np.ndarray] = None  # (r, z) 닫힌 프로파일 (회전 부품)
+    transform: Optional[np.ndarray] = None  # 4x4 로컬 -> 월드
+    mesh: Optional[trimesh.Trimesh] = None  # 월드 좌표 정적 메시
+
+
+def chord_error(radius: float, sections: int) -> float:
+    """반지름 radius 원을 sections각형으로 근사했을 때의 최대 편차 (mm)"""
+    return float(radius * (1.0 - np.cos(np.pi / sections)))
+
+
+def _pack_chunk(part: int, sections: int, vertices: np.ndarray, faces: np.ndarray, error: float) -> bytes:
+    vertex_block = zlib.compress(np.ascontiguousarray(vertices, dtype='<f4').tobytes())
+    index_block, index_bytes = encode_indices(faces)
+    header = CHUNK_HEADER.pack(part, sections, index_bytes, len(vertices), faces.size,
+                               len(vertex_block), len(index_block), error)
+    return header + vertex_block + index_block
+
+
+class _RevolvedPart:
+    """분할 수를 두 배씩 늘리는 회전 부품 (정점 행은 도착 순서로 저장)"""
+
+    def __init__(self, profile: np.ndarray, transform: Optional[np.ndarray], final_sections: int):
+        profile = clean_profile(profile)
+        if profile_area(profile) < 0:
+            profile = profile[::-1]
+        self.profile = profile
+        self.transform = transform
+        self.points = len(profile)
+        self.final_sections = final_sections
+
+        # 최종 각도 인덱스 -> 정점 행 번호 (기본 단계 각도, 이후 단계마다 홀수 배 각도 순)
+        order = [np.arange(0, final_sections, final_sections // BASE_SECTIONS)]
+        step = final_sections // BASE_SECTIONS
+        while step > 1:
+            step //= 2
+            order.append(np.arange(step, final_sections, 2 * step))
+        self.order = order
+        self.row_of = np.empty(final_sections, dtype=np.int64)
+        self.row_of[np.concatenate(order)] = np.arange(final_sections)
+
+    def rows(self, angles: np.ndarray) -> np.ndarray:
+        """최종 각도 인덱스들의 월드 좌표 정점 (각도 순, 각도마다 프로파일 점 수만큼)"""
+        theta = 2.0 * np.pi * angles / self.final_sections
+        vertices = np.empty((len(angles), self.points, 3))
+        vertices[..., 0] = np.cos(theta)[:, None] * self.profile[:, 0]
+        vertices[..., 1] = np.sin(theta)[:, None] * self.profile[:, 0]
+        vertices[..., 2] = self.profile[:, 1]
+        vertices = vertices.reshape(-1, 3)
+        if self.transform is not None:
+            vertices = trimesh.transform_points(vertices, self.transform)
+        return vertices
+
+    def faces(self, sections: int) -> np.ndarray:
+        """분할 수 sections 단계의 면 (revolve_profile과 같은 분할, 도착 순 정점 번호)"""
+        rows = self.row_of[np.arange(sections) * (self.final_sections // sections)]
+        index = rows[:, None] * self.points + np.arange(self.points)
+        a = index
+        b = np.roll(index, -1, axis=1)
+        c = np.roll(b, -1, axis=0)
+        d = np.roll(index, -1, axis=0)
+        return np.concatenate([
+            np.stack([a, c, b], axis=-1).reshape(-1, 3),
+            np.stack([a, d, c], axis=-1).reshape(-1, 3),
+        ])
+
+
+def encode_stream(parts: List[StreamPart], chord_tolerance: float,
+                  metadata: Optional[Dict] = None) -> bytes:
+    """부품 목록을 점진적 스트림으로 부호화
+
+    회전 부품은 기본 8분할부터 편차가 chord_tolerance 이하가 될 때까지 두 배씩 세분화합니다.
+    """
+    base_chunks, refinements = [], []
+    table = []
+
+    for number, part in enumerate(parts):
+        if part.profile is None:
+            mesh = part.mesh
+            table.append({'name': part.name, 'kind': 'static'})
+            base_chunks.append(_pack_chunk(number, 0, np.asarray(mesh.vertices), np.asarray(mesh.faces), 0.0))
+            continue
+
+        radius = float(np.max(np.asarray(part.profile)[:, 0]))
+        final_sections = BASE_SECTIONS
+        while final_sections < MAX_SECTIONS and chord_error(radius, final_sections) > chord_tolerance:
+            final_sections *= 2
+        revolved = _RevolvedPart(part.profile, part.transform, final_sections)
+        table.append({'name': part.name, 'kind': 'revolve', 'final_sections': final_sections,
+                      'final_error': chord_error(radius, final_sections)})
+
+        sections = BASE_SECTIONS
+        base_chunks.append(_pack_chunk(number, sections, revolved.rows(revolved.order[0]),
+                                       revolved.faces(sections), chord_error(radius, sections)))
+        for angles in revolved.order[1:]:
+            removed = chord_error(radius, sections)
+            sections *= 2
+            chunk = _pack_chunk(number, sections, revolved.rows(angles), revolved.faces(sections),
+                                chord_error(radius, sections))
+            refinements.append((-removed, len(refinements), chunk))
+
+    refinements.sort()
+    meta = dict(metadata or {}, parts=table, chord_tolerance=chord_tolerance)
+    meta_bytes = json.dumps(meta, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    header = STREAM_HEADER.pack(STREAM_MAGIC, STREAM_VERSION, len(meta_bytes))
+    return b''.join([header, meta_bytes, *base_chunks, *(chunk for _, _, chunk in refinements)])
+
+
+class ProgressiveReader:
+    """점진적 스트림 수신기 (받은 바이트를 feed하면 완성된 청크부터 적용)"""
+
+    def __init__(self):
+        self._buffer = bytearray()
+        self.metadata: Optional[Dict] = None
+        self.bytes_received = 0
+        self.chunks = 0
+        self._vertices: Dict[int, List[np.ndarray]] = {}
+        self._faces: Dict[int, np.ndarray] = {}
+        self.errors: Dict[int, float] = {}  # 부품 -> 현재 남은 편차 (mm)
+        self.sections: Dict[int, int] = {}  # 부품 -> 현재 분할 수 (정적 부품은 0)
+
+    @property
+    def error(self) -> float:
+        """현재 모델의 최대 남은 편차 (아직 기본 청크를 못 받은 부품이 있으면 inf)"""
+        if self.metadata is None or len(self.errors) < len(self.metadata['parts']):
+            return float('inf')
+        return max(self.errors.values())
+
+    @property
+    def complete(self) -> bool:
+        """모든 부품이 최종 분할 수에 도달했는지"""
+        return self.metadata is not None and all(
+            self.sections.get(number) == part.get('final_sections', 0)
+            for number, part in enumerate(self.metadata['parts']))
+
+    def feed(self, data: bytes) -> int:
+        """바이트 추가, 이번에 적용한 청크 수 반환"""
+        self._buffer.extend(data)
+        self.bytes_received += len(data)
+        applied = 0
+
+        if self.metadata is None:
+            if len(self._buffer) < STREAM_HEADER.size:
+                return 0
+            magic, version, meta_length = STREAM_HEADER.unpack_from(self._buffer)
+            if magic != STREAM_MAGIC:
+                raise ValueError(f"p3s 형식이 아닙니다: {bytes(magic)!r}")
+            if version != STREAM_VERSION:
+                raise ValueError(f"지원하지 않는 p3s 버전: {version}")
+            if len(self._buffer) < STREAM_HEADER.size + meta_length:
+                return 0
+            start = STREAM_HEADER.size
+            self.metadata = json.loads(bytes(self._buffer[start:start + meta_length]).decode('utf-8'))
+            del self._buffer[:start + meta_length]
+
+        while len(self._buffer) >= CHUNK_HEADER.size:
+            (part, sections, index_bytes, vertex_count, index_count,
+             vertex_length, index_length, error) = CHUNK_HEADER.unpack_from(self._buffer)
+            end = CHUNK_HEADER.size + vertex_length + index_length
+            if len(self._buffer) < end:
+                break
+            offset = CHUNK_HEADER.size
+            vertices = np.frombuffer(zlib.decompress(bytes(self._buffer[offset:offset + vertex_length])),
+                                     dtype='<f4').reshape(vertex_count, 3)
+            offset += vertex_length
+            faces = decode_indices(bytes(self._buffer[offset:offset + index_length]), index_bytes)
+            del self._buffer[:end]
+
+            self._vertices.setdefault(part, []).append(vertices)
+            self._faces[part] = faces.reshape(-1, 3)
+            self.errors[part] = float(error)
+            self.sections[part] = sections
+            self.chunks += 1
+            applied += 1
+
+        return applied
+
+    def mesh(self) -> Tuple[np.ndarray, np.ndarray]:
+        """지금까지 받은 부품들을 합친 (정점, 면) 배열"""
+        vertices, faces, offset = [], [], 0
+        for part in sorted(self._faces):
+            part_vertices = np.concatenate(self._vertices[part])
+            vertices.append(part_vertices)
+            faces.append(self._faces[part] + offset)
+            offset += len(part_vertices)
+        if not vertices:
+            return np.empty((0, 3), dtype=np.float32), np.empty((0, 3), dtype=np.int64)
+        return np.concatenate(vertices), np.concatenate(faces)
+
+
+def iter_blocks(data: bytes, block_size: int = 4096) -> Iterator[bytes]:
+    """바이트열을 네트워크 전송 단위 블록으로 나눔 (시뮬레이션/서버 응답용)"""
+    for start in range(0, len(data), block_size):
+        yield data[start:start + block_size]
+
+
+def read_stream(blocks: Iterable[bytes]) -> Iterator[ProgressiveReader]:
+    """블록을 차례로 받으며 새 청크가 적용될 때마다 수신기 상태를 내보냄"""
+    reader = ProgressiveReader()
+    for block in blocks:
+        if reader.feed(block):
+            yield reader
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+부품 단위 씬 그래프
+경로: E:\github\plant3D\src\modeler\scene_graph.py
+
+모델을 이름 있는 부품(로컬 메시 + 변환 행렬)의 모음으로 유지합니다.
+부품마다 자신의 파라미터 해시를 키로 캐시하므로 입구 치수만 바뀌면 입구만
+다시 생성하고, 조립 시 바뀌지 않은 부품의 월드 좌표 버퍼는 그대로 재사용합니다.
+
+노즐처럼 같은 형상이 여러 곳에 놓이는 부품은 인스턴스로 등록합니다. 프로토타입
+메시는 씬에서 한 번만 만들고 각 인스턴스는 그 메시와 자신의 변환만 가집니다.
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import trimesh
+
+from src.modeler.mesh_cache import MeshCache, geometry_key
+from src.modeler.mesh_validation import ensure_valid
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PartNode:
+    """씬 그래프 부품 노드"""
+    name: str
+    key: str  # 부품 파라미터 해시
+    mesh: trimesh.Trimesh  # 로컬 좌표 메시
+    transform: np.ndarray  # 4x4 로컬 -> 월드
+    world_vertices: np.ndarray  # 변환이 적용된 정점 (조립 시 재사용)
+    prototype: str = ""  # 인스턴스이면 공유 프로토타입 이름
+
+
+class PartScene:
+    """이름 있는 부품들의 씬 (부품별 증분 재생성)"""
+
+    def __init__(self, cache: Optional[MeshCache] = None):
+        self.cache = cache
+        self.nodes: Dict[str, PartNode] = {}
+        self.prototypes: Dict[str, trimesh.Trimesh] = {}  # 프로토타입 키 -> 공유 메시
+        self.rebuilt: List[str] = []
+        self.validation: Dict[str, Dict] = {}  # 생성한 부품/프로토타입 -> 검증 결과
+        self._assembled: Optional[trimesh.Trimesh] = None
+
+    def set_part(self, name: str, params: Dict, builder: Callable[[], trimesh.Trimesh],
+                 transform: Optional[np.ndarray] = None) -> bool:
+        """부품 등록/갱신 (파라미터가 같으면 기존 메시 재사용, 다시 생성했으면 True)
+
+        Args:
+            name: 부품 이름
+            params: 메시 모양을 결정하는 파라미터 (변환 제외)
+            builder: 로컬 좌표 메시 생성 함수
+            transform: 4x4 로컬 -> 월드 변환 (없으면 단위 행렬)
+        """
+        key = geometry_key({'part': name, 'params': params})
+        return self._set_node(name, key, transform, lambda: self._load(key, name, builder))
+
+    def set_instance(self, name: str, prototype: str, params: Dict,
+                     builder: Callable[[], trimesh.Trimesh], transform: np.ndarray) -> bool:
+        """공유 프로토타입 메시의 인스턴스 등록/갱신 (같은 프로토타입은 한 번만 생성)
+
+        Args:
+            name: 인스턴스(노드) 이름
+            prototype: 프로토타입 이름 (내보내기 시 메시 이름)
+            params: 프로토타입 모양을 결정하는 파라미터
+            builder: 프로토타입 로컬 좌표 메시 생성 함수
+            transform: 4x4 로컬 -> 월드 변환
+        """
+        key = geometry_key({'prototype': prototype, 'params': params})
+
+        def load():
+            if key not in self.prototypes:
+                self.prototypes[key] = self._load(key, prototype, builder)
+            return self.prototypes[key]
+
+        return self._set_node(name, key, transform, load, prototype)
+
+    def _load(self, key: str, label: str, builder: Callable[[], trimesh.Trimesh]) -> trimesh.Trimesh:
+        """캐시에서 메시를 읽거나 생성 (생성한 메시는 검증하고 실패할 때만 복구)"""
+        mesh = self.cache.get(key) if self.cache is not None else None
+        if mesh is None:
+            mesh, self.validation[label] = ensure_valid(builder(), label)
+            if self.cache is not None:
+                self.cache.put(key, mesh)
+            self.rebuilt.append(label)
+            logger.debug(f"부품 생성: {label}")
+        return mesh
+
+    def _set_node(self, name: str, key: str, transform: Optional[np.ndarray],
+                  load: Callable[[], trimesh.Trimesh], prototype: str = "") -> bool:
+        transform = np.eye(4) if transform is None else np.asarray(transform, dtype=float)
+        node = self.nodes.get(name)
+
+        if node is not None and node.key == key:
+            if not np.array_equal(node.transform, transform):
+                node.transform = transform
+                node.world_vertices = trimesh.transform_points(node.mesh.vertices, transform)
+                self._assembled = None
+            return False
+
+        mesh = load()
+        self.nodes[name] = PartNode(
+            name=name,
+            key=key,
+            mesh=mesh,
+            transform=transform,
+            world_vertices=trimesh.transform_points(mesh.vertices, transform),
+            prototype=prototype,
+        )
+        self._assembled = None
+        if node is not None and node.prototype:
+            self._prune_prototypes()
+        return True
+
+    def remove_part(self, name: str):
+        node = self.nodes.pop(name, None)
+        if node is not None:
+            self._assembled = None
+            if node.prototype:
+                self._prune_prototypes()
+
+    def _prune_prototypes(self):
+        """더 이상 쓰이지 않는 프로토타입 정리 (인스턴스가 지워지거나 다른 키로 바뀐 뒤)"""
+        used = {node.key for node in self.nodes.values() if node.prototype}
+        self.prototypes = {key: mesh for key, mesh in self.prototypes.items() if key in used}
+
+    def world_parts(self) -> Dict[str, trimesh.Trimesh]:
+        """인스턴스가 아닌 부품 이름 -> 월드 좌표 메시 (버퍼 공유)"""
+        return {
+            name: trimesh.Trimesh(vertices=node.world_vertices, faces=node.mesh.faces, process=False)
+            for name, node in self.nodes.items() if not node.prototype
+        }
+
+    def instances(self) -> Dict[str, Dict]:
+        """프로토타입 이름 -> {'mesh': 로컬 메시, 'placements': [(인스턴스 이름, 변환)]}"""
+        groups: Dict[str, Dict] = {}
+        for node in self.nodes.values():
+            if node.prototype:
+                group = groups.setdefault(node.prototype, {'mesh': node.mesh, 'placements': []})
+                group['placements'].append((node.name, node.transform))
+        return groups
+
+    def assemble(self) -> trimesh.Trimesh:
+        """모든 부품을 하나의 메시로 조립 (부품이 바뀌지 않았으면 이전 결과 반환)"""
+        if self._assembled is not None:
+            return self._assembled
+        if not self.nodes:
+            raise ValueError("씬에 부품이 없습니다")
+
+        vertices, faces, offset = [], [], 0
+        for node in self.nodes.values():
+            vertices.append(node.world_vertices)
+            faces.append(np.asarray(node.mesh.faces) + offset)
+            offset += len(node.world_vertices)
+
+        self._assembled = trimesh.Trimesh(vertices=np.vstack(vertices), faces=np.vstack(faces), process=False)
+        return self._assembled
+
+    def summary(self) -> List[Dict]:
+        return [{'name': node.name, 'vertices': len(node.mesh.vertices), 'faces': len(node.mesh.faces),
+                 'key': node.key[:12], 'prototype': node.prototype} for node in self.nodes.values()]
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+사이클론 내부 유체 영역의 부호 거리장(SDF)과 복셀 격자
+경로: E:\github\plant3D\src\simulator\fluid_domain.py
+
+내부 유체 영역(실린더, 콘, 고체 출구 배관, vortex finder 바깥 환형부와 가스 출구 배관)은
+축대칭이므로 3D 점을 (r = √(x² + y²), z)로 접으면 CycloneGeometry.fluid_profile()
+다각형에 대한 2D 부호 거리가 곧 3D 부호 거리입니다 (축 위의 변은 벽이 아니므로 거리에서 제외).
+- FluidDomain.signed_distance / contains: 해석적 질의 (입자-벽 충돌 등, NumPy 벡터 연산)
+- FluidDomain.voxelize: 지정한 복셀 크기의 SDF/점유 격자 (형상 해시별로 디스크 캐시)
+- VoxelGrid.sample / contains: 격자 삼선형 보간, 최근접 복셀 조회
+
+입구 덕트와 노즐 내부는 축대칭이 아니므로 포함하지 않으며, 상하 개구부는 영역 경계로 봅니다.
+부호: 유체 내부가 음수, 단위는 mm입니다.
+
+사용법 (질의 속도 측정):
+  python fluid_domain.py [추출.json] [--voxel 5] [--points 1000000]
+"""
+
+import os
+import sys
+import time
+import logging
+import argparse
+import tempfile
+from pathlib import Path
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+import numpy as np
+
+# 스크립트로 직접 실행할 때만 프로젝트 루트를 Python 경로에 추가 (import 시에는 바꾸지 않음)
+project_root = Path(__file__).resolve().parents[2]
+if __name__ == "__main__":
+    sys.path.insert(0, str(project_root))
+
+from src.modeler.mesh_cache import geometry_key
+from src.modeler.mesh_primitives import clean_profile
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = "output/temp/fluid_domain"
+DEFAULT_VOXEL_SIZE = 5.0  # mm
+BLOCK_POINTS = 1 << 18  # 격자 생성 시 한 번에 처리할 점 수 (메모리 제한)
+
+
+@dataclass
+class VoxelGrid:
+    """균일 격자 위의 SDF (복셀 중심 샘플)"""
+    origin: np.ndarray  # 첫 복셀 중심 (mm)
+    spacing: float  # 복셀 크기 (mm)
+    sdf: np.ndarray  # (nx, ny, nz) float32, 내부 음수
+
+    @property
+    def shape(self):
+        return self.sdf.shape
+
+    @property
+    def occupancy(self) -> np.ndarray:
+        """유체 내부 복셀 (bool)"""
+        return self.sdf < 0
+
+    @property
+    def fluid_volume(self) -> float:
+        """점유 복셀 부피 합 (mm³)"""
+        return float(np.count_nonzero(self.sdf < 0)) * self.spacing ** 3
+
+    def index(self, points: np.ndarray) -> np.ndarray:
+        """점의 최근접 복셀 인덱스 (격자 밖은 가장자리로 제한)"""
+        ijk = np.rint((np.asarray(points, dtype=float) - self.origin) / self.spacing).astype(np.int64)
+        return np.clip(ijk, 0, np.array(self.shape) - 1)
+
+    def contains(self, points: np.ndarray) -> np.ndarray:
+        """최근접 복셀 점유 여부 (격자 밖은 False)"""
+        points = np.asarray(points, dtype=float)
+        ijk = np.rint((points - self.origin) / self.spacing).astype(np.int64)
+        inside_grid = np.all((ijk >= 0) & (ijk < np.array(self.shape)), axis=1)
+        result = np.zeros(len(points), dtype=bool)
+        i, j, k = ijk[inside_grid].T
+        result[inside_grid] = self.sdf[i, j, k] < 0
+        return result
+
+    def sample(self, points: np.ndarray) -> np.ndarray:
+        """삼선형 보간 SDF (격자 밖은 가장자리 값)"""
+        local = (np.asarray(points, dtype=float) - self.origin) / self.spacing
+        upper = np.array(self.shape) - 1
+        base = np.clip(np.floor(local).astype(np.int64), 0, np.maximum(upper - 1, 0))
+        frac = np.clip(local - base, 0.0, 1.0)
+        i0, j0, k0 = base.T
+        i1, j1, k1 = np.minimum(base + 1, upper).T
+        fx, fy, fz = frac.T
+        sdf = self.sdf
+
+        c00 = sdf[i0, j0, k0] * (1 - fx) + sdf[i1, j0, k0] * fx
+        c10 = sdf[i0, j1, k0] * (1 - fx) + sdf[i1, j1, k0] * fx
+        c01 = sdf[i0, j0, k1] * (1 - fx) + sdf[i1, j0, k1] * fx
+        c11 = sdf[i0, j1, k1] * (1 - fx) + sdf[i1, j1, k1] * fx
+        return (c00 * (1 - fy) + c10 * fy) * (1 - fz) + (c01 * (1 - fy) + c11 * fy) * fz
+
+
+class FluidDomain:
+    """축대칭 내부 유체 영역"""
+
+    def __init__(self, geometry):
+        """
+        Args:
+            geometry: CycloneGeometry (fluid_profile()을 제공하는 형상)
+        """
+        self.geometry = geometry
+        profile = clean_profile(geometry.fluid_profile())
+        self.profile = profile
+        self.starts = profile
+        self.ends = np.roll(profile, -1, axis=0)
+        # 축 위의 변 (r = 0 -> r = 0)은 벽이 아님
+        self.walls = ~((self.starts[:, 0] == 0) & (self.ends[:, 0] == 0))
+        self.radius = float(profile[:, 0].max())
+        self.z_range = (float(profile[:, 1].min()), float(profile[:, 1].max()))
+
+    def signed_distance_rz(self, r: np.ndarray, z: np.ndarray) -> np.ndarray:
+        """(r, z) 반평면에서의 부호 거리 (내부 음수, mm)"""
+        r = np.asarray(r, dtype=float)
+        z = np.asarray(z, dtype=float)
+        distance2 = np.full(r.shape, np.inf)
+        inside = np.zeros(r.shape, dtype=bool)
+
+        for (r0, z0), (r1, z1), wall in zip(self.starts, self.ends, self.walls):
+            dr, dz = r1 - r0, z1 - z0
+            # 짝홀 규칙: +r 방향 반직선이 변을 가로지르는지
+            if dz != 0:
+                crosses = (z0 > z) != (z1 > z)
+                inside ^= crosses & (r < r0 + (z - z0) * (dr / dz))
+            if wall:
+                t = np.clip(((r - r0) * dr + (z - z0) * dz) / (dr * dr + dz * dz), 0.0, 1.0)
+                ex, ez = r - r0 - t * dr, z - z0 - t * dz
+                np.minimum(distance2, ex * ex + ez * ez, out=distance2)
+
+        distance = np.sqrt(distance2)
+        return np.where(inside, -distance, distance)
+
+    def signed_distance(self, points: np.ndarray) -> np.ndarray:
+        """3D 점 (N, 3)의 부호 거리 (mm)"""
+        points = np.asarray(points, dtype=float)
+        return self.signed_distance_rz(np.hypot(points[:, 0], points[:, 1]), points[:, 2])
+
+    def contains(self, points: np.ndarray) -> np.ndarray:
+        """유체 내부 여부"""
+        return self.signed_distance(points) < 0
+
+    def cache_key(self, voxel_size: float) -> str:
+        return geometry_key(self.geometry, kind='fluid_domain', voxel_size=float(voxel_size))
+
+    def voxelize(self, voxel_size: float = DEFAULT_VOXEL_SIZE,
+                 cache_dir: Optional[str] = DEFAULT_CACHE_DIR) -> VoxelGrid:
+        """복셀 크기 voxel_size(mm)의 SDF 격자 (경계 밖 한 칸 여유 포함)
+
+        cache_dir이 있으면 형상 해시 + 복셀 크기로 .npz 캐시를 읽고 씁니다.
+        """
+        if voxel_size <= 0:
+            raise ValueError(f"복셀 크기는 0보다 커야 합니다: {voxel_size}")
+
+        cache_path = Path(cache_dir) / f"{self.cache_key(voxel_size)}.npz" if cache_dir else None
+        if cache_path is not None and cache_path.exists():
+            try:
+                with np.load(cache_path) as data:
+                    grid = VoxelGrid(origin=data['origin'], spacing=float(data['spacing']), sdf=data['sdf'])
+                logger.info(f"유체 영역 격자 캐시 사용: {grid.shape}")
+                return grid
+            except (OSError, KeyError, ValueError) as e:
+                logger.warning(f"유체 영역 캐시 읽기 실패, 다시 생성: {e}")
+
+        start = time.perf_counter()
+        lower = np.array([-self.radius, -self.radius, self.z_range[0]]) - voxel_size
+        upper = np.array([self.radius, self.radius, self.z_range[1]]) + voxel_size
+        counts = np.ceil((upper - lower) / voxel_size).astype(int) + 1
+        axes = [lower[axis] + voxel_size * np.arange(counts[axis]) for axis in range(3)]
+
+        # SDF는 (r, z)에만 의존하므로 xy 평면의 r을 한 번 계산하고 z 층별로 블록 처리
+        r_plane = np.hypot(*np.meshgrid(axes[0], axes[1], indexing='ij')).ravel()
+        sdf = np.empty((counts[0] * counts[1], counts[2]), dtype=np.float32)
+        layers = max(1, BLOCK_POINTS // len(r_plane))
+        for k in range(0, counts[2], layers):
+            z = axes[2][k:k + layers]
+            r = np.broadcast_to(r_plane[:, None], (len(r_plane), len(z)))
+            sdf[:, k:k + layers] = self.signed_distance_rz(r, np.broadcast_to(z, r.shape))
+
+        grid = VoxelGrid(origin=lower, spacing=float(voxel_size), sdf=sdf.reshape(counts[0], counts[1], counts[2]))
+        logger.info(f"유체 영역 격자 생성: {grid.shape} ({grid.sdf.size:,} 복셀, "
+                    f"{(time.perf_counter() - start) * 1000:.1f} ms)")
+
+        if cache_path is not None:
+            self._save_cache(cache_path, grid)
+        return grid
+
+    @staticmethod
+    def _save_cache(path: Path, grid: VoxelGrid):
+        """임시 파일에 쓴 뒤 교체 (동시에 같은 형상을 만들어도 안전)"""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.savez(f, origin=grid.origin, spacing=grid.spacing, sdf=grid.sdf)
+            os.replace(tmp_name, path)
+        except OSError as e:
+            Path(tmp_name).unlink(missing_ok=True)
+            logger.warning(f"유체 영역 캐시 저장 실패: {e}")
+
+
+def benchmark(domain: FluidDomain, grid: VoxelGrid, count: int = 1_000_000, seed: int = 0) -> Dict:
+    """격자 범위 안 무작위 점에 대한 질의 처리량 (초당 질의 수)"""
+    rng = np.random.default_rng(seed)
+    lower = grid.origin
+    upper = grid.origin + grid.spacing * (np.array(grid.shape) - 1)
+    points = rng.uniform(lower, upper, size=(count, 3))
+
+    results = {}
+    for name, query in (('signed_distance', domain.signed_distance), ('grid_sample', grid.sample),
+                        ('grid_contains', grid.contains)):
+        start = time.perf_counter()
+        query(points)
+        results[name] = round(count / (time.perf_counter() - start))
+
+    exact = domain.signed_distance(points)
+    results['grid_max_error_mm'] = float(np.abs(grid.sample(points) - exact).max())
+    return results
+
+
+def main():
+    logging.basicConfig(level=logging.INFO)
+
+    parser = argparse.ArgumentParser(description="사이클론 내부 유체 영역 SDF/복셀 격자")
+    parser.add_argument('json', nargs='?', help='추출 JSON (없으면 기본 형상)')
+    parser.add_argument('--voxel', type=float, default=DEFAULT_VOXEL_SIZE, help='복셀 크기 (mm)')
+    parser.add_argument('--points', type=int, default=1_000_000, help='질의 속도 측정 점 수')
+    parser.add_argument('--no-cache', action='store_true', help='격자 캐시 사용 안 함')
+    args = parser.parse_args()
+
+    from src.modeler.cyclone_modeler import CycloneModeler
+    geometry = CycloneModeler(args.json).geometry
+    domain = FluidDomain(geometry)
+    grid = domain.voxelize(args.voxel, cache_dir=None if args.no_cache else DEFAULT_CACHE_DIR)
+
+    print(f"격자 {grid.shape}, 복셀 {grid.spacing} mm")
+    print(f"유체 부피: 복셀 {grid.fluid_volume * 1e-6:,.2f} L / 해석값 {geometry.fluid_volume * 1e-6:,.2f} L")
+    for name, value in benchmark(domain, grid, args.points).items():
+        print(f"  {name}: {value:,}" if isinstance(value, int) else f"  {name}: {value:.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,507 @@
+#!/usr/bin/env python3
+"""
+사이클론 유체 영역의 블록 구조 O-grid 육면체 체적 메시
+경로: E:\github\plant3D\src\simulator\ogrid_mesh.py
+
+CycloneModeler의 표면 메시는 표시용이므로 유동 계산용 체적 메시를 따로 만듭니다.
+단면은 하나의 O-grid 위상을 z 방향으로 쌓습니다.
+- 코어: 가운데의 볼록한 정사각형 블록 (n x n)
+- 링 1: 코어 -> vortex finder 안쪽 반지름 (Rg - t)
+- 링 2: vortex finder 벽 두께 구간 (Rg - t -> Rg), finder 아래에서만 유체
+- 링 3: vortex finder 바깥 -> 바디 안쪽 벽, 지붕 아래에서만 유체
+콘과 고체 출구 배관 구간은 같은 단면을 벽 반지름 비율로 축소하므로 정점 계산이
+(단면 정점 x 단면 배율) 한 번의 브로드캐스트로 끝납니다. 유체가 아닌 블록/구간 조합은
+셀을 만들지 않고 쓰지 않는 정점은 제거합니다.
+
+입구 덕트는 별도의 직육면체 블록으로, 바디 쪽 면을 실린더 안쪽 벽 곡면에 맞춥니다.
+바디 격자와 정점을 공유하지 않는 비정합 경계이므로 양쪽 면을 'duct_interface' 패치로
+내보냅니다 (솔버의 인터페이스 조건으로 연결).
+고체 출구 직경이 콘 출구 직경과 다르면 콘 끝의 단차는 배관 첫 셀 층에서 경사로 처리됩니다.
+
+격자 조밀도: cell_size(목표 셀 크기), wall_grading(링 3과 덕트의 벽 쪽 셀 축소 비율),
+axial_grading(각 높이 구간 양 끝의 셀 축소 비율).
+품질 지표: 셀 부피, scaled Jacobian(모서리별 최소값, 1이 직각), 종횡비(최대/최소 모서리).
+내보내기: VTK legacy 바이너리 비정형 격자 (육면체 셀 + 블록/품질 셀 데이터, 경계 패치는 별도 파일).
+
+사용법:
+  python ogrid_mesh.py [추출.json] [--cell-size 10] [--wall-grading 4] [--output output/simulation]
+"""
+
+import sys
+import time
+import logging
+import argparse
+from pathlib import Path
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+# 스크립트로 직접 실행할 때만 프로젝트 루트를 Python 경로에 추가 (import 시에는 바꾸지 않음)
+project_root = Path(__file__).resolve().parents[2]
+if __name__ == "__main__":
+    sys.path.insert(0, str(project_root))
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_OUTPUT_DIR = "output/simulation"
+BLOCK_CELLS = 1 << 15  # 품질 계산 시 한 번에 처리할 셀 수 (CPU 캐시 크기)
+
+BLOCK_NAMES = ['core', 'finder_inner', 'finder_wall', 'annulus', 'inlet_duct']
+PATCH_NAMES = ['wall', 'inlet', 'gas_outlet', 'solids_outlet', 'duct_interface']
+
+# 높이 구간(고체 배관, 콘, finder 아래 실린더, finder 구간, 지붕 위 가스 배관) x 링 블록 유체 여부
+ACTIVE_BLOCKS = np.array([
+    [True, True, True, True],
+    [True, True, True, True],
+    [True, True, True, True],
+    [True, True, False, True],
+    [True, True, False, False],
+])
+
+# VTK 육면체 모서리별 이웃 정점 (오른손 순서) 과 모서리 목록
+CORNER_EDGES = np.array([[1, 3, 4], [2, 0, 5], [3, 1, 6], [0, 2, 7],
+                         [7, 5, 0], [4, 6, 1], [5, 7, 2], [6, 4, 3]])
+HEX_EDGES = np.array([[0, 1], [1, 2], [2, 3], [3, 0], [4, 5], [5, 6],
+                      [6, 7], [7, 4], [0, 4], [1, 5], [2, 6], [3, 7]])
+# 꼭짓점별 세 모서리의 HEX_EDGES 번호와 방향 부호의 곱 (모서리 벡터 재사용)
+_EDGE_NUMBER = {**{(a, b): (n, 1) for n, (a, b) in enumerate(HEX_EDGES.tolist())},
+                **{(b, a): (n, -1) for n, (a, b) in enumerate(HEX_EDGES.tolist())}}
+CORNER_EDGE_INDEX = np.array([[_EDGE_NUMBER[corner, other][0] for other in neighbors]
+                              for corner, neighbors in enumerate(CORNER_EDGES.tolist())])
+CORNER_EDGE_SIGN = np.array([np.prod([_EDGE_NUMBER[corner, other][1] for other in neighbors])
+                             for corner, neighbors in enumerate(CORNER_EDGES.tolist())])
+# 0-6 대각선을 공유하는 사면체 분할 (부피)
+HEX_TETS = np.array([[0, 1, 2, 6], [0, 2, 3, 6], [0, 3, 7, 6],
+                     [0, 7, 4, 6], [0, 4, 5, 6], [0, 5, 1, 6]])
+# 바깥을 향하는 면: -z, +z, -y, +x, +y, -x (구조 격자 i, j, k = x, y, z 기준)
+HEX_FACES = {
+    'k0': [0, 3, 2, 1], 'k1': [4, 5, 6, 7],
+    'j0': [0, 1, 5, 4], 'i1': [1, 2, 6, 5],
+    'j1': [2, 3, 7, 6], 'i0': [3, 0, 4, 7],
+}
+
+VTK_HEXAHEDRON = 12
+VTK_QUAD = 9
+
+
+@dataclass
+class OGridSettings:
+    """O-grid 격자 설정"""
+    cell_size: float = 10.0  # 목표 셀 크기 (mm, 실린더 벽 기준)
+    core_ratio: float = 0.45  # 코어 정사각형 반폭 / vortex finder 안쪽 반지름
+    core_bulge: float = 0.3  # 코어 변을 원 쪽으로 부풀리는 정도 (0 = 직선)
+    wall_grading: float = 4.0  # 벽 사이 가운데 셀 크기 / 벽 쪽 셀 크기 (1 = 균일)
+    axial_grading: float = 2.0  # 높이 구간 가운데 셀 크기 / 끝 셀 크기
+    include_inlet: bool = True  # 입구 덕트 블록 포함
+
+    def __post_init__(self):
+        if self.cell_size <= 0:
+            raise ValueError(f"셀 크기는 0보다 커야 합니다: {self.cell_size}")
+        if not 0 < self.core_ratio < 0.6:
+            raise ValueError(f"코어 비율은 0~0.6 사이여야 합니다: {self.core_ratio}")
+        if min(self.wall_grading, self.axial_grading) < 1:
+            raise ValueError("grading 비율은 1 이상이어야 합니다")
+
+
+@dataclass
+class HexMesh:
+    """육면체 체적 메시 (VTK 정점 순서)"""
+    nodes: np.ndarray  # (N, 3) float64, mm
+    cells: np.ndarray  # (M, 8) int64
+    blocks: np.ndarray  # (M,) int8, BLOCK_NAMES 번호
+    patches: Dict[str, np.ndarray] = field(default_factory=dict)  # 이름 -> (K, 4) 바깥 방향 사각형
+    build_ms: float = 0.0
+
+    def quality(self) -> Dict[str, np.ndarray]:
+        """셀별 부피(mm³), scaled Jacobian, 종횡비"""
+        return hex_quality(self.nodes, self.cells)
+
+    def summary(self, quality: Dict[str, np.ndarray] = None) -> Dict:
+        """셀/정점 수, 블록별 셀 수와 부피, 품질 통계"""
+        quality = quality or self.quality()
+        jacobian, aspect, volume = quality['scaled_jacobian'], quality['aspect_ratio'], quality['volume']
+        return {
+            'cells': len(self.cells),
+            'nodes': len(self.nodes),
+            'build_ms': round(self.build_ms, 1),
+            'blocks': {name: {'cells': int(np.count_nonzero(self.blocks == number)),
+                              'volume_L': float(volume[self.blocks == number].sum()) * 1e-6}
+                       for number, name in enumerate(BLOCK_NAMES) if np.any(self.blocks == number)},
+            'patches': {name: len(faces) for name, faces in self.patches.items()},
+            'volume_L': float(volume.sum()) * 1e-6,
+            'min_scaled_jacobian': float(jacobian.min()),
+            'mean_scaled_jacobian': float(jacobian.mean()),
+            'poor_cells': int(np.count_nonzero(jacobian < 0.3)),
+            'inverted_cells': int(np.count_nonzero(volume <= 0)),
+            'max_aspect_ratio': float(aspect.max()),
+        }
+
+
+def graded(n: int, ratio: float = 1.0, both: bool = False) -> np.ndarray:
+    """0~1 구간을 n칸으로 나눈 n + 1개 점
+
+    ratio는 가장 큰 셀 / 가장 작은 셀 크기입니다. both이면 양 끝이 작고 가운데가 크며,
+    아니면 0 쪽이 크고 1 쪽(벽)으로 갈수록 작아집니다.
+    """
+    if n < 1:
+        raise ValueError(f"분할 수는 1 이상이어야 합니다: {n}")
+    if n == 1 or ratio == 1.0:
+        return np.linspace(0.0, 1.0, n + 1)
+    i = np.arange(n)
+    if both:
+        half = (n - 1) / 2
+        sizes = ratio ** (-np.abs(i - half) / half)
+    else:
+        sizes = ratio ** (-i / (n - 1))
+    points = np.concatenate([[0.0], np.cumsum(sizes)])
+    return points / points[-1]
+
+
+def _divisions(length: float, cell_size: float) -> int:
+    return max(1, int(np.ceil(length / cell_size - 1e-9)))
+
+
+def _cross_section(geometry, settings: OGridSettings):
+    """실린더 구간의 O-grid 단면
+
+    Returns:
+        (정점 (P, 2), 사각형 (Q, 4) 반시계, 사각형의 블록 번호 (Q,),
+         변별 이웃 사각형 (Q, 4), 없으면 -1)
+    """
+    t = geometry.wall_thickness
+    wall = geometry.cylinder_diameter / 2 - t
+    b1 = geometry.gas_outlet_diameter / 2 - t
+    b2 = geometry.gas_outlet_diameter / 2
+    cs = settings.cell_size
+
+    n = max(2, _divisions(np.pi * wall / 2, cs))  # 코어 한 변 = 원주 1/4의 분할 수
+    c = settings.core_ratio * b1
+    beta = settings.core_bulge
+    n1 = _divisions(b1 - c, cs)
+    n2 = _divisions(b2 - b1, cs)
+    n3 = _divisions(wall - b2, cs)
+
+    # 코어: 정사각형과 타원 사상(정사각형 -> 원)을 섞어 변을 부풀림
+    u = np.linspace(-1.0, 1.0, n + 1)
+    U, V = np.meshgrid(u, u, indexing='ij')
+    core = c * np.stack([
+        (1 - beta) * U + beta * np.sqrt(2) * U * np.sqrt(1 - V * V / 2),
+        (1 - beta) * V + beta * np.sqrt(2) * V * np.sqrt(1 - U * U / 2),
+    ], axis=-1).reshape(-1, 2)
+    core_id = np.arange((n + 1) ** 2).reshape(n + 1, n + 1)
+    core_quads = np.stack([core_id[:-1, :-1], core_id[1:, :-1], core_id[1:, 1:], core_id[:-1, 1:]],
+                          axis=-1).reshape(-1, 4)
+
+    # 코어 경계 (모서리 (1, -1)부터 반시계) 와 같은 각도 간격의 원주 점
+    loop = np.concatenate([core_id[n, :-1], core_id[:0:-1, n], core_id[0, :0:-1], core_id[:-1, 0]])
+    m = 4 * n
+    theta = -np.pi / 4 + np.arange(m) * (2 * np.pi / m)
+    circle = np.stack([np.cos(theta), np.sin(theta)], axis=-1)
+
+    inner = core[loop]
+    rows = [inner + (circle * b1 - inner) * s for s in graded(n1, settings.wall_grading)[1:]]
+    rows += [circle * (b1 + (b2 - b1) * s) for s in graded(n2)[1:]]
+    rows += [circle * (b2 + (wall - b2) * s) for s in graded(n3, settings.wall_grading, both=True)[1:]]
+    ring_blocks = np.repeat([1, 2, 3], [n1, n2, n3])
+
+    ring_id = np.vstack([loop, len(core) + np.arange(len(rows) * m).reshape(len(rows), m)])
+    nxt = np.roll(np.arange(m), -1)
+    ring_quads = np.stack([ring_id[:-1], ring_id[1:], ring_id[1:, nxt], ring_id[:-1, nxt]],
+                          axis=-1).reshape(-1, 4)
+
+    points = np.vstack([core, *rows])
+    quads = np.vstack([core_quads, ring_quads])
+    blocks = np.concatenate([np.zeros(len(core_quads), dtype=np.int8), np.repeat(ring_blocks, m).astype(np.int8)])
+
+    # 변 (a -> b) 을 공유하는 반대 방향 변 (b -> a) 의 사각형이 이웃
+    a = quads.ravel()
+    b = np.roll(quads, -1, axis=1).ravel()
+    keys = a * len(points) + b
+    order = np.argsort(keys)
+    position = np.searchsorted(keys[order], b * len(points) + a)
+    position = np.minimum(position, len(keys) - 1)
+    found = keys[order][position] == b * len(points) + a
+    neighbors = np.where(found, order[position] // 4, -1).reshape(-1, 4)
+
+    return points, quads, blocks, neighbors
+
+
+def _axial_stations(geometry, settings: OGridSettings) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """z 정점 높이, 각 셀 층의 높이 구간 번호, 각 높이의 단면 배율"""
+    t = geometry.wall_thickness
+    H, Hc = geometry.cylinder_height, geometry.cone_height
+    breaks = [-Hc - geometry.solids_outlet_length, -Hc, 0.0,
+              H - geometry.gas_outlet_height, H - t, H + geometry.gas_outlet_extension]
+
+    z, segments = [breaks[0]], []
+    for number, (z0, z1) in enumerate(zip(breaks[:-1], breaks[1:])):
+        count = _divisions(z1 - z0, settings.cell_size)
+        z.extend(z0 + (z1 - z0) * graded(count, settings.axial_grading, both=True)[1:])
+        segments.extend([number] * count)
+    z = np.array(z)
+
+    wall = geometry.cylinder_diameter / 2 - t
+    cone_end = (geometry.cone_outlet_diameter / 2 - t) / wall
+    pipe = (geometry.solids_outlet_diameter / 2 - t) / wall
+    scale = np.where(z < -Hc, pipe, np.interp(z, [-Hc, 0.0], [cone_end, 1.0]))
+    return z, np.array(segments), scale
+
+
+def _duct_block(geometry, settings: OGridSettings):
+    """입구 덕트 정점 (nx+1, ny+1, nz+1, 3), 바디 쪽 면은 실린더 안쪽 벽"""
+    t = geometry.wall_thickness
+    R = geometry.cylinder_diameter / 2
+    W, h, L = geometry.inlet_width, geometry.inlet_height, geometry.inlet_length
+    if W / 2 >= R - t:
+        raise ValueError(f"입구 폭이 실린더 내경보다 큽니다: {W}")
+    # 표시 모델(CycloneModeler)과 같은 입구 배치
+    center = geometry.inlet_center()
+    x_end = center[0] + L / 2
+    z_center = center[2]
+
+    cs = settings.cell_size
+    y = W * (graded(_divisions(W, cs), settings.wall_grading, both=True) - 0.5)
+    z = z_center + h * (graded(_divisions(h, cs), settings.wall_grading, both=True) - 0.5)
+    x_wall = np.sqrt((R - t) ** 2 - y * y)
+    tx = np.linspace(0.0, 1.0, _divisions(x_end - x_wall.min(), cs) + 1)
+
+    X = x_wall[None, :] + (x_end - x_wall[None, :]) * tx[:, None]
+    nodes = np.empty((len(tx), len(y), len(z), 3))
+    nodes[..., 0] = X[:, :, None]
+    nodes[..., 1] = y[None, :, None]
+    nodes[..., 2] = z[None, None, :]
+    return nodes, (-W / 2, W / 2, z[0], z[-1])
+
+
+def _structured_cells(shape: Tuple[int, int, int], offset: int = 0) -> np.ndarray:
+    """(ni, nj, nk) 정점 격자의 육면체 (ni-1, nj-1, nk-1, 8)"""
+    ids = offset + np.arange(np.prod(shape)).reshape(shape)
+    corners = [ids[:-1, :-1, :-1], ids[1:, :-1, :-1], ids[1:, 1:, :-1], ids[:-1, 1:, :-1],
+               ids[:-1, :-1, 1:], ids[1:, :-1, 1:], ids[1:, 1:, 1:], ids[:-1, 1:, 1:]]
+    return np.stack(corners, axis=-1)
+
+
+def build_ogrid(geometry, settings: OGridSettings = None) -> HexMesh:
+    """CycloneGeometry의 내부 유체 영역 O-grid 육면체 메시 생성"""
+    settings = settings or OGridSettings()
+    start = time.perf_counter()
+
+    points, quads, quad_blocks, neighbors = _cross_section(geometry, settings)
+    z, segments, scale = _axial_stations(geometry, settings)
+    P, K = len(points), len(segments)
+
+    # 정점: 단면 x 배율, 높이별 브로드캐스트
+    nodes = np.empty((len(z), P, 3))
+    nodes[..., :2] = points[None] * scale[:, None, None]
+    nodes[..., 2] = z[:, None]
+    nodes = nodes.reshape(-1, 3)
+
+    # 셀: 유체 (층, 사각형) 조합만
+    active = ACTIVE_BLOCKS[segments][:, quad_blocks]
+    layer, quad = np.nonzero(active)
+    base = quads[quad] + (layer * P)[:, None]
+    cells = np.hstack([base, base + P])
+    blocks = quad_blocks[quad]
+
+    # 경계면: 옆 (이웃 사각형이 없거나 유체가 아님) 과 위아래 (다음 층이 유체가 아님)
+    faces = {name: [] for name in PATCH_NAMES}
+    outer_faces = []  # 바깥 벽 (링 3 바깥 변)
+    padded = np.hstack([active, np.zeros((K, 1), dtype=bool)])  # 이웃 -1 -> 마지막 열 (False)
+    for edge in range(4):
+        open_side = active & ~padded[:, neighbors[:, edge]]
+        layer_e, quad_e = np.nonzero(open_side)
+        a = quads[quad_e, edge] + layer_e * P
+        b = quads[quad_e, (edge + 1) % 4] + layer_e * P
+        lateral = np.stack([a, b, b + P, a + P], axis=-1)
+        outer = neighbors[quad_e, edge] < 0
+        faces['wall'].append(lateral[~outer])
+        outer_faces.append(lateral[outer])
+
+    below = np.vstack([np.zeros((1, len(quads)), dtype=bool), active[:-1]])
+    above = np.vstack([active[1:], np.zeros((1, len(quads)), dtype=bool)])
+    layer_b, quad_b = np.nonzero(active & ~below)
+    bottom = quads[quad_b][:, [0, 3, 2, 1]] + (layer_b * P)[:, None]
+    layer_t, quad_t = np.nonzero(active & ~above)
+    top = quads[quad_t] + ((layer_t + 1) * P)[:, None]
+    faces['solids_outlet'].append(bottom[layer_b == 0])
+    faces['wall'].append(bottom[layer_b > 0])
+    faces['gas_outlet'].append(top[layer_t == K - 1])
+    faces['wall'].append(top[layer_t < K - 1])
+
+    if settings.include_inlet:
+        duct_nodes, (y0, y1, z0, z1) = _duct_block(geometry, settings)
+        duct_cells = _structured_cells(duct_nodes.shape[:3], offset=len(nodes))
+
+        # 바디 바깥 벽 중 덕트 입구 면과 겹치는 면은 인터페이스
+        outer_faces = np.vstack(outer_faces)
+        center = nodes[outer_faces].mean(axis=1)
+        opening = (center[:, 0] > 0) & (center[:, 1] > y0) & (center[:, 1] < y1) & \
+            (center[:, 2] > z0) & (center[:, 2] < z1)
+        faces['duct_interface'].append(outer_faces[opening])
+        outer_faces = [outer_faces[~opening]]
+
+        faces['duct_interface'].append(duct_cells[0, :, :][..., HEX_FACES['i0']].reshape(-1, 4))
+        faces['inlet'].append(duct_cells[-1, :, :][..., HEX_FACES['i1']].reshape(-1, 4))
+        for side, selector in (('j0', np.s_[:, 0, :]), ('j1', np.s_[:, -1, :]),
+                               ('k0', np.s_[:, :, 0]), ('k1', np.s_[:, :, -1])):
+            faces['wall'].append(duct_cells[selector][..., HEX_FACES[side]].reshape(-1, 4))
+
+        nodes = np.vstack([nodes, duct_nodes.reshape(-1, 3)])
+        cells = np.vstack([cells, duct_cells.reshape(-1, 8)])
+        blocks = np.concatenate([blocks, np.full(len(duct_cells.reshape(-1, 8)), 4, dtype=np.int8)])
+
+    faces['wall'].extend(outer_faces)
+
+    # 셀이 쓰지 않는 정점 (유체가 아닌 블록) 제거
+    used = np.zeros(len(nodes), dtype=bool)
+    used[cells.ravel()] = True
+    remap = np.cumsum(used) - 1
+    patches = {name: remap[np.vstack(parts)] for name, parts in faces.items() if parts and sum(map(len, parts))}
+
+    mesh = HexMesh(nodes=nodes[used], cells=remap[cells], blocks=blocks, patches=patches,
+                   build_ms=(time.perf_counter() - start) * 1000)
+    logger.info(f"O-grid 메시 생성: 셀 {len(mesh.cells):,}개, 정점 {len(mesh.nodes):,}개 ({mesh.build_ms:.1f} ms)")
+    return mesh
+
+
+def _triple(a, b, c) -> np.ndarray:
+    """성분별 배열 (x, y, z) 벡터의 삼중곱 (a x b) . c"""
+    return (a[0] * (b[1] * c[2] - b[2] * c[1]) +
+            a[1] * (b[2] * c[0] - b[0] * c[2]) +
+            a[2] * (b[0] * c[1] - b[1] * c[0]))
+
+
+def hex_quality(nodes: np.ndarray, cells: np.ndarray) -> Dict[str, np.ndarray]:
+    """육면체 셀 품질 (블록 단위, 성분별 1차원 벡터 연산)
+
+    Returns:
+        'volume' (mm³), 'scaled_jacobian' (모서리 삼중곱 / 세 모서리 길이 곱의 최소값),
+        'aspect_ratio' (최대 / 최소 모서리 길이)
+    """
+    volume = np.empty(len(cells))
+    jacobian = np.empty(len(cells))
+    aspect = np.empty(len(cells))
+    axes = [np.ascontiguousarray(nodes[:, axis]) for axis in range(3)]
+    for start in range(0, len(cells), BLOCK_CELLS):
+        block = cells[start:start + BLOCK_CELLS].T
+        part = slice(start, start + block.shape[1])
+        corners = [axis[block] for axis in axes]  # 성분별 (8, B)
+
+        # 12개 모서리 벡터와 길이를 한 번만 계산하고 모서리(꼭짓점)별로 부호를 붙여 재사용
+        vectors = [[coordinate[b] - coordinate[a] for coordinate in corners] for a, b in HEX_EDGES]
+        lengths = np.array([np.sqrt(v[0] * v[0] + v[1] * v[1] + v[2] * v[2]) for v in vectors])
+        worst = np.full(block.shape[1], np.inf)
+        for (i, j, k), sign in zip(CORNER_EDGE_INDEX, CORNER_EDGE_SIGN):
+            scaled = _triple(vectors[i], vectors[j], vectors[k]) / np.maximum(lengths[i] * lengths[j] * lengths[k], 1e-300)
+            np.minimum(worst, scaled if sign > 0 else -scaled, out=worst)
+        jacobian[part] = worst
+        aspect[part] = lengths.max(axis=0) / np.maximum(lengths.min(axis=0), 1e-300)
+
+        # 0번 정점에서 나머지 정점으로의 벡터로 사면체 부피 합
+        spokes = [None] + [[coordinate[other] - coordinate[0] for coordinate in corners] for other in range(1, 8)]
+        volume[part] = sum(_triple(spokes[b], spokes[c], spokes[d]) for _, b, c, d in HEX_TETS) / 6
+
+    return {'volume': volume, 'scaled_jacobian': jacobian, 'aspect_ratio': aspect}
+
+
+def _vtk_header(title: str, nodes: np.ndarray) -> bytes:
+    return (f"# vtk DataFile Version 3.0\n{title}\nBINARY\nDATASET UNSTRUCTURED_GRID\n"
+            f"POINTS {len(nodes)} float\n").encode('ascii') + nodes.astype('>f4').tobytes() + b"\n"
+
+
+def _vtk_cells(connectivity: np.ndarray, cell_type: int) -> bytes:
+    count, size = connectivity.shape
+    table = np.hstack([np.full((count, 1), size), connectivity]).astype('>i4')
+    return (f"CELLS {count} {table.size}\n".encode('ascii') + table.tobytes() +
+            f"\nCELL_TYPES {count}\n".encode('ascii') + np.full(count, cell_type, dtype='>i4').tobytes() + b"\n")
+
+
+def _vtk_scalars(name: str, values: np.ndarray) -> bytes:
+    dtype, vtk_type = ('>i4', 'int') if np.issubdtype(values.dtype, np.integer) else ('>f4', 'float')
+    return (f"SCALARS {name} {vtk_type} 1\nLOOKUP_TABLE default\n".encode('ascii') +
+            values.astype(dtype).tobytes() + b"\n")
+
+
+def write_vtk(path, mesh: HexMesh, quality: Dict[str, np.ndarray] = None):
+    """육면체 메시를 VTK legacy 바이너리로 저장 (셀 데이터: 블록 번호, 품질 지표)"""
+    from src.modeler.mesh_export import atomic_write
+
+    quality = quality or mesh.quality()
+    blocks = " ".join(f"{number}={name}" for number, name in enumerate(BLOCK_NAMES))
+    data = [_vtk_header(f"plant3D O-grid hex mesh, blocks: {blocks}", mesh.nodes),
+            _vtk_cells(mesh.cells, VTK_HEXAHEDRON),
+            f"CELL_DATA {len(mesh.cells)}\n".encode('ascii'),
+            _vtk_scalars('block', mesh.blocks)]
+    data += [_vtk_scalars(name, values) for name, values in quality.items()]
+    atomic_write(Path(path), lambda tmp: tmp.write_bytes(b"".join(data)))
+
+
+def write_boundary_vtk(path, mesh: HexMesh):
+    """경계 패치를 사각형 셀 VTK로 저장 (셀 데이터 patch = PATCH_NAMES 번호)"""
+    from src.modeler.mesh_export import atomic_write
+
+    names = [name for name in PATCH_NAMES if name in mesh.patches]
+    quads = np.vstack([mesh.patches[name] for name in names])
+    numbers = np.repeat([PATCH_NAMES.index(name) for name in names], [len(mesh.patches[name]) for name in names])
+    labels = " ".join(f"{PATCH_NAMES.index(name)}={name}" for name in names)
+    data = [_vtk_header(f"plant3D O-grid boundary, patches: {labels}", mesh.nodes),
+            _vtk_cells(quads, VTK_QUAD),
+            f"CELL_DATA {len(quads)}\n".encode('ascii'),
+            _vtk_scalars('patch', numbers)]
+    atomic_write(Path(path), lambda tmp: tmp.write_bytes(b"".join(data)))
+
+
+def export_ogrid(mesh: HexMesh, output_dir: str, base_name: str) -> List[Path]:
+    """체적 메시와 경계 패치 VTK 파일 저장"""
+    output = Path(output_dir)
+    output.mkdir(parents=True, exist_ok=True)
+    paths = [output / f"{base_name}_ogrid.vtk", output / f"{base_name}_ogrid_boundary.vtk"]
+    write_vtk(paths[0], mesh)
+    write_boundary_vtk(paths[1], mesh)
+    return paths
+
+
+def main():
+    logging.basicConfig(level=logging.INFO)
+
+    parser = argparse.ArgumentParser(description="사이클론 유체 영역 O-grid 육면체 메시")
+    parser.add_argument('json', nargs='?', help='추출 JSON (없으면 기본 형상)')
+    parser.add_argument('--cell-size', type=float, default=OGridSettings.cell_size, help='목표 셀 크기 (mm)')
+    parser.add_argument('--wall-grading', type=float, default=OGridSettings.wall_grading, help='벽 쪽 셀 축소 비율')
+    parser.add_argument('--axial-grading', type=float, default=OGridSettings.axial_grading, help='높이 방향 셀 축소 비율')
+    parser.add_argument('--no-inlet', action='store_true', help='입구 덕트 블록 제외')
+    parser.add_argument('--output', default=DEFAULT_OUTPUT_DIR, help='VTK 출력 폴더')
+    parser.add_argument('--no-export', action='store_true', help='파일 저장 없이 통계만 출력')
+    args = parser.parse_args()
+
+    from src.modeler.cyclone_modeler import CycloneModeler
+    modeler = CycloneModeler(args.json)
+    settings = OGridSettings(cell_size=args.cell_size, wall_grading=args.wall_grading,
+                             axial_grading=args.axial_grading, include_inlet=not args.no_inlet)
+    mesh = build_ogrid(modeler.geometry, settings)
+
+    start = time.perf_counter()
+    quality = mesh.quality()
+    quality_ms = (time.perf_counter() - start) * 1000
+    summary = mesh.summary(quality)
+
+    body = sum(info['volume_L'] for name, info in summary['blocks'].items() if name != 'inlet_duct')
+    print(f"셀 {summary['cells']:,}개, 정점 {summary['nodes']:,}개 (생성 {summary['build_ms']:.1f} ms, "
+          f"품질 {quality_ms:.1f} ms)")
+    for name, info in summary['blocks'].items():
+        print(f"  {name:13s} 셀 {info['cells']:>10,}  부피 {info['volume_L']:8.2f} L")
+    print(f"  바디 부피 {body:.2f} L / 해석값 {modeler.geometry.fluid_volume * 1e-6:.2f} L")
+    print(f"  패치: {summary['patches']}")
+    print(f"  scaled Jacobian 최소 {summary['min_scaled_jacobian']:.3f}, 평균 {summary['mean_scaled_jacobian']:.3f}, "
+          f"0.3 미만 {summary['poor_cells']:,}개, 뒤집힌 셀 {summary['inverted_cells']:,}개")
+    print(f"  최대 종횡비 {summary['max_aspect_ratio']:.1f}")
+
+    if not args.no_export:
+        tag = str(modeler.data.get('tag_number', 'cyclone')).replace('/', '_')
+        for path in export_ogrid(mesh, args.output, tag):
+            print(f"  저장: {path}")
+
+
+if __name__ == "__main__":
+    main()